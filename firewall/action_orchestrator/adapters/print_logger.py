@@ -1,25 +1,44 @@
 """Simple print logger adapter."""
 
+import json
+import logging
 from typing import Any, Dict
 
 from action_orchestrator.ports.logger_port import ILogger
 
+logger = logging.getLogger(__name__)
+
 
 class PrintLogger(ILogger):
-    """Simple print-based logger implementation."""
+    """
+    Simple console logger implementation.
+
+    Writes through the standard logging system instead of `print`, so the
+    output goes through the application handlers (queued off the request
+    path at startup) and debug messages are filtered by level.
+    """
 
-    def log(self, level: str, message: str, **kwargs) -> None:
+    def log(self, level: str, message: str, *args: Any, **kwargs: Any) -> None:
         """
         Log a message.
 
         Args:
             level: Log level
-            message: Log message
+            message: Log message, %-style format when `args` are given
+            *args: Values merged into `message`, only if it is emitted
             **kwargs: Additional context
         """
-        print(f"[{level.upper()}] {message}", flush=True)
+        levelno = logging.getLevelName(level.upper())
+        if not isinstance(levelno, int):
+            levelno = logging.INFO
+        if not logger.isEnabledFor(levelno):
+            return
+        if args:
+            message = message % args
         if kwargs:
-            print(f"  Context: {kwargs}", flush=True)
+            logger.log(levelno, "%s\n  Context: %s", message, kwargs)
+        else:
+            logger.log(levelno, "%s", message)
 
     def log_structured(self, data: Dict[str, Any]) -> None:
         """
@@ -28,6 +47,5 @@ class PrintLogger(ILogger):
         Args:
             data: Dictionary of structured data
         """
-        import json
-
-        print(f"[STRUCTURED] {json.dumps(data)}", flush=True)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("[STRUCTURED] %s", json.dumps(data))
@@ -25,15 +25,18 @@ class StructlogLogger(ILogger):
             # Fallback to print
             self._use_structlog = False
 
-    def log(self, level: str, message: str, **kwargs) -> None:
+    def log(self, level: str, message: str, *args: Any, **kwargs: Any) -> None:
         """
         Log a message.
 
         Args:
             level: Log level
-            message: Log message
+            message: Log message, %-style format when `args` are given
+            *args: Values merged into `message`
             **kwargs: Additional context
         """
+        if args:
+            message = message % args
         if self._use_structlog and self._logger:
             getattr(self._logger, level)(message, **kwargs)
         else:
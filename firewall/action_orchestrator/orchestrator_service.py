@@ -1,6 +1,6 @@
 """Action orchestrator service - core business logic."""
 
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterable, Optional, Tuple
 
 from action_orchestrator.ports.alerter_port import IAlerter
 from action_orchestrator.ports.idempotency_store_port import IIdempotencyStore
@@ -29,6 +29,22 @@ class OrchestratorService:
         self.alerter = alerter
         self.idempotency_store = idempotency_store
 
+    def execute_many(
+        self, actions: Iterable[Tuple[PolicyDecision, str, Dict[str, Any]]]
+    ) -> None:
+        """
+        Execute the actions of several decisions in one call.
+
+        Lets a caller collect the decisions of a request (ingress, egress)
+        and hand them over at once, in order.
+
+        Args:
+            actions: (decision, request_id, context) tuples
+        """
+        execute = self.execute
+        for decision, request_id, context in actions:
+            execute(decision, request_id, context)
+
     def execute(
         self, decision: PolicyDecision, request_id: str, context: Dict[str, Any] = None
     ) -> None:
@@ -48,7 +64,7 @@ class OrchestratorService:
             if existing:
                 # Already processed, skip
                 self.logger.log(
-                    "debug", f"Request {request_id} already processed (idempotent)"
+                    "debug", "Request %s already processed (idempotent)", request_id
                 )
                 return
 
@@ -64,7 +80,7 @@ class OrchestratorService:
 
         if decision.blocked:
             self.logger.log(
-                "warning", f"Request blocked: {decision.reason}", **log_data
+                "warning", "Request blocked: %s", decision.reason, **log_data
             )
             self.logger.log_structured({"event": "request_blocked", **log_data})
 
@@ -77,7 +93,7 @@ class OrchestratorService:
                     context=log_data,
                 )
         else:
-            self.logger.log("info", f"Request allowed", **log_data)
+            self.logger.log("info", "Request allowed", **log_data)
             self.logger.log_structured({"event": "request_allowed", **log_data})
 
         # Store result for idempotency
@@ -8,13 +8,14 @@ class ILogger(ABC):
     """Interface for logging."""
 
     @abstractmethod
-    def log(self, level: str, message: str, **kwargs) -> None:
+    def log(self, level: str, message: str, *args: Any, **kwargs: Any) -> None:
         """
         Log a message.
 
         Args:
             level: Log level (info, warning, error, debug)
-            message: Log message
+            message: Log message, %-style format when `args` are given
+            *args: Values merged into `message`, only if it is emitted
             **kwargs: Additional context
         """
         pass
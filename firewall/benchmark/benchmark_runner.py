@@ -4,15 +4,15 @@ import asyncio
 import logging
 import time
 import uuid
-from typing import Optional, Dict, Any
 from datetime import datetime
+from typing import Any, Dict, Optional
 
 from benchmark.database import BenchmarkDatabase
 from benchmark.dataset_loader import DatasetLoader, DatasetSample
 from benchmark.metrics_calculator import MetricsCalculator
+from core.exceptions import ContentBlockedException
 from core.orchestrator import FirewallOrchestrator
 from core.request_context import RequestContext
-from core.exceptions import ContentBlockedException
 
 logger = logging.getLogger(__name__)
 
@@ -22,11 +22,13 @@ class BenchmarkRunner:
     
     def __init__(
         self,
-        orchestrator: FirewallOrchestrator,
+        orchestrator: Optional[FirewallOrchestrator],
         database: BenchmarkDatabase,
         max_concurrent_samples: int = 10,
         batch_size: int = 50
     ):
+        # None: each run uses the current default gateway, which a policy
+        # reload replaces
         self.orchestrator = orchestrator
         self.database = database
         self.dataset_loader = DatasetLoader()
@@ -144,47 +146,55 @@ class BenchmarkRunner:
         
         return run_id
     
-    async def _execute_benchmark(
-        self,
-        run_id: str,
-        samples: list[DatasetSample],
-        tenant_id: str,
-        model_config: Optional[Dict[str, str]] = None
-    ):
-        """Execute the benchmark processing with parallel execution and batch inserts."""
+    def _benchmark_orchestrator(
+        self, model_config: Optional[Dict[str, str]]
+    ) -> FirewallOrchestrator:
+        """Orchestrator of a run: built for `model_config`, else the runner's or the default gateway."""
         # Create orchestrator with model config if provided
         if model_config:
-            from container import FirewallContainer
+            import os
+
             from core.analyzer import FirewallAnalyzer
             from core.backend_proxy import BackendProxyService
-            import os
+            from services import get_orchestrator_service, get_policy_service, get_preprocessor_service
             
-            container = FirewallContainer()
             BACKEND_URL = os.getenv("BACKEND_URL", "http://backend:8000")
             TENANT_ID = os.getenv("TENANT_ID", "default")
             
-            # Create ML filter service with specified models
-            from fast_ml_filter.ml_filter_service import MLFilterService
-            ml_filter = MLFilterService.create_with_models(model_config=model_config)
+            # Create ML filter service with specified models (warmed, cached detectors)
+            from core.gateway.factory_cache import create_ml_filter_service
+            ml_filter = create_ml_filter_service(model_config)
             
             analyzer = FirewallAnalyzer(
-                preprocessor=container.preprocessor_service(),
+                preprocessor=get_preprocessor_service(),
                 ml_filter=ml_filter,
-                policy_engine=container.policy_service(),
+                policy_engine=get_policy_service(),
                 tenant_id=TENANT_ID,
             )
             
             proxy = BackendProxyService(backend_url=BACKEND_URL, timeout=30.0)
-            orchestrator_service = container.orchestrator_service()
+            orchestrator_service = get_orchestrator_service()
             
-            benchmark_orchestrator = FirewallOrchestrator(
+            return FirewallOrchestrator(
                 analyzer=analyzer,
                 proxy=proxy,
                 orchestrator=orchestrator_service,
             )
-        else:
-            benchmark_orchestrator = self.orchestrator
-        
+        if self.orchestrator is not None:
+            return self.orchestrator
+        from core.gateway import get_default_gateway
+        return get_default_gateway()
+
+    async def _execute_benchmark(
+        self,
+        run_id: str,
+        samples: list[DatasetSample],
+        tenant_id: str,
+        model_config: Optional[Dict[str, str]] = None
+    ):
+        """Execute the benchmark processing with parallel execution and batch inserts."""
+        benchmark_orchestrator = self._benchmark_orchestrator(model_config)
+
         results = []
         
         try:
@@ -498,7 +508,9 @@ class BenchmarkRunner:
                 "processed_samples": processed,
                 "progress_percent": (processed / total * 100) if total > 0 else 0,
                 "elapsed_time_seconds": elapsed_time,
-                "estimated_remaining_seconds": estimated_remaining
+                "estimated_remaining_seconds": estimated_remaining,
+                # Same value persisted as config_snapshot["detector_config"]
+                "detector_config": run_info["model_config"],
             }
         return None
 
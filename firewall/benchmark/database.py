@@ -2,20 +2,102 @@
 
 import aiosqlite
 import json
+import os
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, AsyncIterator, Tuple
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 
+# Persisted comparisons kept; older ones are pruned when a new one is saved
+COMPARISON_CACHE_MAX_ROWS = int(os.getenv("BENCHMARK_COMPARISON_CACHE_ROWS", "200"))
+
+# Applied on every connection (these settings are not persisted in the file)
+_CONNECTION_PRAGMAS = """
+    PRAGMA synchronous=NORMAL;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA cache_size=-65536;
+"""
+
+_SELECT_RUN_BY_ID = "SELECT * FROM benchmark_runs WHERE id = ?"
+_SELECT_METRICS_BY_RUN = "SELECT * FROM benchmark_metrics WHERE run_id = ?"
+
+
+def _bulk_query(template: str, count: int) -> str:
+    """Render an `IN (...)` query for `count` parameters."""
+    return template.format(placeholders=", ".join("?" * count))
+
+
+_SELECT_RUNS_STATUS_IN = (
+    "SELECT id, status, dataset_name, dataset_split FROM benchmark_runs WHERE id IN ({placeholders})"
+)
+_SELECT_RUNS_IN = "SELECT * FROM benchmark_runs WHERE id IN ({placeholders})"
+_SELECT_METRICS_IN = "SELECT * FROM benchmark_metrics WHERE run_id IN ({placeholders})"
+
+
+# Results of two runs paired on sample_index; served by idx_results_run_sample
+_SELECT_PAIRS_TEMPLATE = """
+    SELECT b.sample_index,
+           b.input_text, b.expected_label, b.result_type, b.analysis_details,
+           c.input_text, c.expected_label, c.result_type, c.analysis_details
+    FROM benchmark_results b
+    JOIN benchmark_results c ON c.sample_index = b.sample_index
+    WHERE b.run_id = ? AND c.run_id = ?{condition}
+    ORDER BY b.sample_index
+"""
+_SELECT_PAIRS = _SELECT_PAIRS_TEMPLATE.format(condition="")
+_SELECT_CHANGED_PAIRS = _SELECT_PAIRS_TEMPLATE.format(condition=" AND c.result_type != b.result_type")
+# One page of the pairs with a given (baseline, candidate) result type transition
+_TRANSITION_CONDITION = " AND b.result_type = ? AND c.result_type = ?"
+_SELECT_TRANSITION_PAIRS = (
+    _SELECT_PAIRS_TEMPLATE.format(condition=_TRANSITION_CONDITION) + "    LIMIT ? OFFSET ?\n"
+)
+_COUNT_TRANSITION_PAIRS = (
+    "SELECT COUNT(*) FROM benchmark_results b"
+    " JOIN benchmark_results c ON c.sample_index = b.sample_index"
+    " WHERE b.run_id = ? AND c.run_id = ?" + _TRANSITION_CONDITION
+)
+
+
+def _paired_rows(row: Tuple[Any, ...]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Split a row of the pairs query into its (baseline, candidate) results."""
+    return (
+        {
+            "sample_index": row[0],
+            "input_text": row[1],
+            "expected_label": row[2],
+            "result_type": row[3],
+            "analysis_details": row[4],
+        },
+        {
+            "sample_index": row[0],
+            "input_text": row[5],
+            "expected_label": row[6],
+            "result_type": row[7],
+            "analysis_details": row[8],
+        },
+    )
+
+
 class BenchmarkDatabase:
     """Manages SQLite database for benchmark results."""
 
     def __init__(self, db_path: str = "benchmarks.db"):
         self.db_path = db_path
 
+    @asynccontextmanager
+    async def _connect(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Open a connection with the per-connection performance pragmas applied."""
+        async with aiosqlite.connect(self.db_path) as db:
+            await db.executescript(_CONNECTION_PRAGMAS)
+            yield db
+
     async def initialize(self):
         """Create database tables if they don't exist."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
+            # WAL is persistent in the database file: readers (comparisons,
+            # status polls) no longer block on the benchmark writer
+            await db.execute("PRAGMA journal_mode=WAL")
             # Benchmark runs table
             await db.execute("""
                 CREATE TABLE IF NOT EXISTS benchmark_runs (
@@ -84,26 +166,81 @@ class BenchmarkDatabase:
                 )
             """)
 
+            # Persisted comparison results (all compared runs are completed,
+            # so a comparison never changes once computed)
+            await db.execute("""
+                CREATE TABLE IF NOT EXISTS benchmark_comparisons (
+                    cache_key TEXT PRIMARY KEY,
+                    result BLOB NOT NULL,
+                    created_at TEXT NOT NULL
+                )
+            """)
+
             await db.execute("""
                 CREATE INDEX IF NOT EXISTS idx_custom_datasets_created_at
                 ON custom_datasets(created_at DESC)
             """)
 
-            # Create indices for better query performance
+            # Create indices for better query performance.
+            # (run_id, sample_index) also serves plain run_id lookups, which
+            # makes the older single-column index redundant.
+            await db.execute("DROP INDEX IF EXISTS idx_results_run_id")
             await db.execute("""
-                CREATE INDEX IF NOT EXISTS idx_results_run_id 
-                ON benchmark_results(run_id)
+                CREATE INDEX IF NOT EXISTS idx_results_run_sample
+                ON benchmark_results(run_id, sample_index)
             """)
             await db.execute("""
                 CREATE INDEX IF NOT EXISTS idx_results_type 
                 ON benchmark_results(result_type)
             """)
+            await db.execute("DROP INDEX IF EXISTS idx_runs_status")
             await db.execute("""
-                CREATE INDEX IF NOT EXISTS idx_runs_status 
-                ON benchmark_runs(status)
+                CREATE INDEX IF NOT EXISTS idx_runs_status_start_time
+                ON benchmark_runs(status, start_time)
             """)
 
             await db.commit()
+            # Refresh planner statistics so the indexes above are picked
+            await db.execute("ANALYZE")
+
+    # ------------------------------------------------------------------
+    # Comparison cache
+    # ------------------------------------------------------------------
+
+    async def get_comparison(self, cache_key: str) -> Optional[bytes]:
+        """Get a persisted comparison result blob, or None if not cached."""
+        async with self._connect() as db:
+            async with db.execute(
+                "SELECT result FROM benchmark_comparisons WHERE cache_key = ?", (cache_key,)
+            ) as cursor:
+                row = await cursor.fetchone()
+        return row[0] if row else None
+
+    async def save_comparison(self, cache_key: str, result: bytes) -> None:
+        """
+        Persist a comparison result blob under its cache key.
+
+        Only the `COMPARISON_CACHE_MAX_ROWS` most recent comparisons are
+        kept; older ones are deleted in the same transaction.
+        """
+        async with self._connect() as db:
+            await db.execute(
+                """
+                INSERT OR REPLACE INTO benchmark_comparisons (cache_key, result, created_at)
+                VALUES (?, ?, ?)
+                """,
+                (cache_key, result, datetime.utcnow().isoformat()),
+            )
+            await db.execute(
+                """
+                DELETE FROM benchmark_comparisons WHERE cache_key NOT IN (
+                    SELECT cache_key FROM benchmark_comparisons
+                    ORDER BY created_at DESC LIMIT ?
+                )
+                """,
+                (COMPARISON_CACHE_MAX_ROWS,),
+            )
+            await db.commit()
 
     # ------------------------------------------------------------------
     # Custom datasets metadata
@@ -117,9 +254,10 @@ class BenchmarkDatabase:
         file_key: str,
         file_type: str,
         total_samples: int,
-    ) -> None:
-        """Guardar metadatos de un dataset personalizado."""
-        async with aiosqlite.connect(self.db_path) as db:
+    ) -> str:
+        """Guardar metadatos de un dataset personalizado y devolver su created_at."""
+        created_at = datetime.utcnow().isoformat()
+        async with self._connect() as db:
             await db.execute(
                 """
                 INSERT INTO custom_datasets
@@ -132,15 +270,16 @@ class BenchmarkDatabase:
                     description,
                     file_key,
                     file_type,
-                    datetime.utcnow().isoformat(),
+                    created_at,
                     total_samples,
                 ),
             )
             await db.commit()
+        return created_at
 
     async def get_dataset_metadata(self, dataset_id: str) -> Optional[Dict[str, Any]]:
         """Obtener metadatos de un dataset personalizado por id."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             db.row_factory = aiosqlite.Row
             async with db.execute(
                 "SELECT * FROM custom_datasets WHERE id = ?", (dataset_id,)
@@ -152,7 +291,7 @@ class BenchmarkDatabase:
 
     async def list_datasets(self, limit: int = 100, offset: int = 0) -> List[Dict[str, Any]]:
         """Listar datasets personalizados disponibles."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             db.row_factory = aiosqlite.Row
             async with db.execute(
                 """
@@ -167,7 +306,7 @@ class BenchmarkDatabase:
 
     async def delete_dataset_metadata(self, dataset_id: str) -> None:
         """Eliminar metadatos de un dataset personalizado (no afecta runs existentes)."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             await db.execute(
                 "DELETE FROM custom_datasets WHERE id = ?",
                 (dataset_id,),
@@ -184,7 +323,7 @@ class BenchmarkDatabase:
         total_samples: int
     ) -> str:
         """Create a new benchmark run."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             await db.execute("""
                 INSERT INTO benchmark_runs 
                 (id, dataset_name, dataset_source, dataset_split, config_snapshot, 
@@ -211,7 +350,7 @@ class BenchmarkDatabase:
         error_message: Optional[str] = None
     ):
         """Update the status of a benchmark run."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             if status in ["completed", "failed", "cancelled"]:
                 await db.execute("""
                     UPDATE benchmark_runs 
@@ -228,7 +367,7 @@ class BenchmarkDatabase:
 
     async def increment_processed_samples(self, run_id: str):
         """Increment the processed samples counter."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             await db.execute("""
                 UPDATE benchmark_runs 
                 SET processed_samples = processed_samples + 1
@@ -249,7 +388,7 @@ class BenchmarkDatabase:
         latency_ms: float
     ):
         """Save an individual benchmark result."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             await db.execute("""
                 INSERT INTO benchmark_results
                 (run_id, sample_index, input_text, expected_label, predicted_label,
@@ -284,7 +423,7 @@ class BenchmarkDatabase:
         if not results:
             return
         
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             created_at = datetime.utcnow().isoformat()
             
             # Prepare batch data
@@ -321,7 +460,7 @@ class BenchmarkDatabase:
             run_id: Benchmark run ID
             count: Number of samples to add to processed count
         """
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             await db.execute("""
                 UPDATE benchmark_runs 
                 SET processed_samples = processed_samples + ?
@@ -335,7 +474,7 @@ class BenchmarkDatabase:
         metrics: Dict[str, Any]
     ):
         """Save aggregate metrics for a benchmark run."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             await db.execute("""
                 INSERT OR REPLACE INTO benchmark_metrics
                 (run_id, true_positives, false_positives, true_negatives, false_negatives,
@@ -358,26 +497,87 @@ class BenchmarkDatabase:
                 metrics.get("p99_latency_ms")
             ))
             await db.commit()
+            # A run just finished inserting its results: let SQLite re-analyze
+            # the tables whose statistics are now stale
+            await db.execute("PRAGMA optimize")
 
     async def get_run(self, run_id: str) -> Optional[Dict[str, Any]]:
         """Get a benchmark run by ID."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             db.row_factory = aiosqlite.Row
             async with db.execute(
-                "SELECT * FROM benchmark_runs WHERE id = ?", (run_id,)
+                _SELECT_RUN_BY_ID, (run_id,)
             ) as cursor:
                 row = await cursor.fetchone()
                 if row:
                     return dict(row)
         return None
 
+    async def get_runs_status_bulk(
+        self,
+        run_ids: List[str],
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Get status and dataset of several runs with a single lightweight query.
+
+        Returns:
+            Dictionary keyed by run_id with `status`, `dataset_name` and
+            `dataset_split`. Unknown run IDs are omitted.
+        """
+        if not run_ids:
+            return {}
+
+        async with self._connect() as db:
+            async with db.execute(
+                _bulk_query(_SELECT_RUNS_STATUS_IN, len(run_ids)), run_ids
+            ) as cursor:
+                rows = await cursor.fetchall()
+
+        return {
+            run_id: {"status": status, "dataset_name": dataset_name, "dataset_split": dataset_split}
+            for run_id, status, dataset_name, dataset_split in rows
+        }
+
+    async def get_runs_and_metrics(
+        self,
+        run_ids: List[str],
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Get several benchmark runs together with their metrics.
+
+        Uses one connection and one `IN (...)` query per table instead of
+        a `get_run` + `get_metrics` round-trip per run.
+
+        Returns:
+            Dictionary keyed by run_id with `run` and `metrics` entries
+            (`metrics` is None if not computed yet). Unknown run IDs are omitted.
+        """
+        if not run_ids:
+            return {}
+
+        async with self._connect() as db:
+            db.row_factory = aiosqlite.Row
+            async with db.execute(
+                _bulk_query(_SELECT_RUNS_IN, len(run_ids)), run_ids
+            ) as cursor:
+                runs = {row["id"]: dict(row) for row in await cursor.fetchall()}
+            async with db.execute(
+                _bulk_query(_SELECT_METRICS_IN, len(run_ids)), run_ids
+            ) as cursor:
+                metrics = {row["run_id"]: dict(row) for row in await cursor.fetchall()}
+
+        return {
+            run_id: {"run": run, "metrics": metrics.get(run_id)}
+            for run_id, run in runs.items()
+        }
+
     async def get_all_runs(
         self,
         limit: int = 50,
         offset: int = 0
     ) -> List[Dict[str, Any]]:
         """Get all benchmark runs with pagination."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             db.row_factory = aiosqlite.Row
             async with db.execute("""
                 SELECT * FROM benchmark_runs 
@@ -395,7 +595,7 @@ class BenchmarkDatabase:
         offset: int = 0
     ) -> List[Dict[str, Any]]:
         """Get results for a specific run, optionally filtered by type."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             db.row_factory = aiosqlite.Row
             if result_type:
                 query = """
@@ -428,7 +628,7 @@ class BenchmarkDatabase:
         This is optimized for comparison between runs where we need to
         align samples by their index.
         """
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             db.row_factory = aiosqlite.Row
             async with db.execute(
                 """
@@ -461,12 +661,74 @@ class BenchmarkDatabase:
 
         return results
 
+    async def iter_paired_results(
+        self,
+        baseline_run_id: str,
+        candidate_run_id: str,
+        batch_size: int = 10_000,
+        changed_only: bool = False,
+    ) -> AsyncIterator[List[Tuple[Dict[str, Any], Dict[str, Any]]]]:
+        """
+        Stream the results of two runs joined on sample_index.
+
+        Only samples present in both runs are returned, ordered by
+        sample_index, in batches of at most `batch_size` pairs, so callers
+        never hold the full result set of either run in memory. With
+        `changed_only`, pairs whose result_type is the same in both runs are
+        filtered out by SQLite.
+
+        `analysis_details` is returned as stored (JSON text) so callers can
+        decode it only for the rows they keep.
+        """
+        async with self._connect() as db:
+            async with db.execute(
+                _SELECT_CHANGED_PAIRS if changed_only else _SELECT_PAIRS,
+                (baseline_run_id, candidate_run_id),
+            ) as cursor:
+                while True:
+                    rows = await cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    yield [_paired_rows(row) for row in rows]
+
+    async def get_transition_pairs(
+        self,
+        baseline_run_id: str,
+        candidate_run_id: str,
+        transition: Tuple[str, str],
+        limit: int,
+        offset: int = 0,
+    ) -> Tuple[int, List[Tuple[Dict[str, Any], Dict[str, Any]]]]:
+        """
+        Get one page of the samples whose result type changed as `transition`.
+
+        Filtering, counting and paging run in SQLite, so only the requested
+        page is read into memory.
+
+        Args:
+            baseline_run_id: Baseline run ID.
+            candidate_run_id: Candidate run ID.
+            transition: (baseline result_type, candidate result_type).
+            limit: Maximum number of pairs to return.
+            offset: Number of pairs to skip.
+
+        Returns:
+            Tuple of (total number of matching pairs, pairs of the page).
+        """
+        params = (baseline_run_id, candidate_run_id, *transition)
+        async with self._connect() as db:
+            async with db.execute(_COUNT_TRANSITION_PAIRS, params) as cursor:
+                (total,) = await cursor.fetchone()
+            async with db.execute(_SELECT_TRANSITION_PAIRS, (*params, limit, offset)) as cursor:
+                rows = await cursor.fetchall()
+        return total, [_paired_rows(row) for row in rows]
+
     async def get_metrics(self, run_id: str) -> Optional[Dict[str, Any]]:
         """Get metrics for a specific run."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             db.row_factory = aiosqlite.Row
             async with db.execute(
-                "SELECT * FROM benchmark_metrics WHERE run_id = ?", (run_id,)
+                _SELECT_METRICS_BY_RUN, (run_id,)
             ) as cursor:
                 row = await cursor.fetchone()
                 if row:
@@ -478,7 +740,7 @@ class BenchmarkDatabase:
         run_id: str
     ) -> Dict[str, List[Dict[str, Any]]]:
         """Get detailed error analysis (FP and FN) for a run."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             db.row_factory = aiosqlite.Row
             
             # Get false positives
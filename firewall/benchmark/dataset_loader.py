@@ -1,14 +1,17 @@
 """Dataset loader for Hugging Face datasets with normalization y datasets custom."""
 
 from datasets import load_dataset
-from typing import List, Dict, Any, Optional, Iterable
+from typing import List, Dict, Any, Optional, Iterator, BinaryIO, Union
 import csv
 import io
+import itertools
 import json
 import logging
 
 logger = logging.getLogger(__name__)
 
+PARQUET_CONTENT_TYPE = "application/parquet"
+
 
 class DatasetSample:
     """Normalized dataset sample."""
@@ -103,59 +106,87 @@ class DatasetLoader:
     # Datasets personalizados
     # ------------------------------------------------------------------
 
-    def parse_file(
+    def iter_file_samples(
         self,
-        content: bytes,
+        content: Union[bytes, BinaryIO],
         file_type: str,
         max_samples: Optional[int] = None,
-    ) -> List[DatasetSample]:
+    ) -> Iterator[DatasetSample]:
         """
-        Parsear un archivo CSV/JSON de dataset custom y devolver samples normalizados.
+        Iterar los samples válidos de un archivo CSV/JSON de dataset custom.
 
-        Requiere columnas/campos:
-        - \"prompt\": texto del prompt
-        - \"type\": \"benign\" o \"jailbreak\"
+        `content` puede ser el contenido completo o un stream binario; los CSV
+        se leen fila a fila sin cargar el archivo entero en memoria.
         """
-        text = content.decode("utf-8")
-        rows: Iterable[Dict[str, Any]]
+        rows = self._iter_rows(content, file_type)
+        try:
+            for idx, row in enumerate(itertools.islice(rows, max_samples or None)):
+                prompt = row.get("prompt")
+                label = row.get("type")
 
+                if prompt is None or label is None:
+                    logger.warning("Fila de dataset custom sin 'prompt' o 'type': %s", row)
+                    continue
+
+                label_normalized = str(label).lower().strip()
+                if label_normalized not in {"benign", "jailbreak"}:
+                    logger.warning("Valor de 'type' no válido en dataset custom: %s", label)
+                    continue
+
+                yield DatasetSample(
+                    prompt=str(prompt).strip(),
+                    expected_label=label_normalized,
+                    index=idx,
+                )
+        finally:
+            # Libera el wrapper del stream aunque no se consuman todas las filas
+            rows.close()
+
+    @staticmethod
+    def _iter_rows(content: Union[bytes, BinaryIO], file_type: str) -> Iterator[Dict[str, Any]]:
+        """Iterar las filas sin validar de un archivo de dataset custom, según su formato."""
         if file_type == "text/csv":
-            reader = csv.DictReader(io.StringIO(text))
-            rows = list(reader)
+            if isinstance(content, bytes):
+                yield from csv.DictReader(io.StringIO(content.decode("utf-8")))
+                return
+            wrapper = io.TextIOWrapper(content, encoding="utf-8", newline="")
+            try:
+                yield from csv.DictReader(wrapper)
+            finally:
+                # No cerrar el stream del llamador al liberar el wrapper
+                wrapper.detach()
+        elif file_type == PARQUET_CONTENT_TYPE:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            source = pa.BufferReader(content) if isinstance(content, bytes) else content
+            # Solo se leen las columnas necesarias
+            yield from pq.read_table(source, columns=["prompt", "type"]).to_pylist()
         elif file_type == "application/json":
-            data = json.loads(text)
+            data = json.loads(content) if isinstance(content, bytes) else json.load(content)
             if isinstance(data, dict):
-                # permitir formato {\"data\": [...]} si fuera necesario
+                # permitir formato {"data": [...]} si fuera necesario
                 data = data.get("data", [])
             if not isinstance(data, list):
                 raise ValueError("El JSON de dataset debe ser una lista de objetos")
-            rows = data
+            yield from data
         else:
             raise ValueError(f"Tipo de archivo de dataset no soportado: {file_type}")
 
-        samples: List[DatasetSample] = []
-        limit = min(max_samples, len(rows)) if max_samples else len(rows)
-
-        for idx, row in enumerate(rows[:limit]):
-            prompt = row.get("prompt")
-            label = row.get("type")
-
-            if prompt is None or label is None:
-                logger.warning("Fila de dataset custom sin 'prompt' o 'type': %s", row)
-                continue
-
-            label_normalized = str(label).lower().strip()
-            if label_normalized not in {"benign", "jailbreak"}:
-                logger.warning("Valor de 'type' no válido en dataset custom: %s", label)
-                continue
+    def parse_file(
+        self,
+        content: Union[bytes, BinaryIO],
+        file_type: str,
+        max_samples: Optional[int] = None,
+    ) -> List[DatasetSample]:
+        """
+        Parsear un archivo CSV/JSON de dataset custom y devolver samples normalizados.
 
-            samples.append(
-                DatasetSample(
-                    prompt=str(prompt).strip(),
-                    expected_label=label_normalized,
-                    index=idx,
-                )
-            )
+        Requiere columnas/campos:
+        - "prompt": texto del prompt
+        - "type": "benign" o "jailbreak"
+        """
+        samples = list(self.iter_file_samples(content, file_type, max_samples))
 
         if not samples:
             raise ValueError("El dataset custom no contiene filas válidas")
@@ -163,6 +194,62 @@ class DatasetLoader:
         logger.info("Dataset custom parseado correctamente con %s samples", len(samples))
         return samples
 
+    def to_parquet(
+        self, content: Union[bytes, BinaryIO], file_type: str, sink: BinaryIO
+    ) -> None:
+        """
+        Convertir un archivo CSV/JSON de dataset custom a Parquet (zstd).
+
+        Los benchmarks leen luego el archivo columnar, más pequeño y rápido de
+        parsear que el original. Los CSV se convierten por bloques, sin cargar
+        el archivo entero en memoria; el Parquet se escribe en `sink`.
+        """
+        import pyarrow as pa
+        import pyarrow.csv as pa_csv
+        import pyarrow.parquet as pq
+
+        if file_type == "text/csv":
+            source = pa.BufferReader(content) if isinstance(content, bytes) else content
+            reader = pa_csv.open_csv(
+                source,
+                # Quoted prompts may span several lines
+                parse_options=pa_csv.ParseOptions(newlines_in_values=True),
+                # Only the used columns, typed up front: types inferred from
+                # the first block could fail on a later one
+                convert_options=pa_csv.ConvertOptions(
+                    include_columns=["prompt", "type"],
+                    column_types={"prompt": pa.string(), "type": pa.string()},
+                ),
+            )
+            with pq.ParquetWriter(sink, reader.schema, compression="zstd") as writer:
+                for batch in reader:
+                    writer.write_batch(batch)
+        elif file_type == "application/json":
+            data = json.loads(content) if isinstance(content, bytes) else json.load(content)
+            if isinstance(data, dict):
+                data = data.get("data", [])
+            if not isinstance(data, list):
+                raise ValueError("El JSON de dataset debe ser una lista de objetos")
+            table = pa.Table.from_pylist(
+                [
+                    {
+                        "prompt": None if row.get("prompt") is None else str(row.get("prompt")),
+                        "type": None if row.get("type") is None else str(row.get("type")),
+                    }
+                    for row in data
+                ]
+            )
+            pq.write_table(table, sink, compression="zstd")
+        else:
+            raise ValueError(f"Tipo de archivo de dataset no soportado: {file_type}")
+
+    def count_file_samples(self, content: Union[bytes, BinaryIO], file_type: str) -> int:
+        """Validar un archivo de dataset custom y contar sus samples sin materializarlos."""
+        total = sum(1 for _ in self.iter_file_samples(content, file_type))
+        if not total:
+            raise ValueError("El dataset custom no contiene filas válidas")
+        return total
+
     def load_custom_dataset_from_content(
         self,
         content: bytes,
@@ -60,15 +60,27 @@ class MinioDatasetStorage:
             logger.error("Error checking/creating MinIO bucket: %s", exc)
             raise
 
-    def upload_dataset(self, file_key: str, file_obj: BinaryIO, length: int, content_type: str) -> None:
+    # Multipart part size used when streaming uploads (MinIO minimum is 5 MiB)
+    PART_SIZE = 8 * 1024 * 1024
+
+    def upload_dataset(
+        self,
+        file_key: str,
+        file_obj: BinaryIO,
+        content_type: str,
+        length: int = -1,
+    ) -> None:
         """
         Upload a dataset file to MinIO.
 
+        The stream is sent as a multipart upload in `PART_SIZE` chunks, so
+        only one part is buffered at a time.
+
         Args:
             file_key: Key/object inside the bucket (e.g., \"datasets/<uuid>.csv\").
             file_obj: Binary stream of the file.
-            length: Length of the file in bytes.
             content_type: Content type (\"text/csv\", \"application/json\", etc.).
+            length: Length of the file in bytes, or -1 if unknown.
         """
         try:
             logger.info("Uploading dataset to MinIO: key=%s, length=%s", file_key, length)
@@ -78,6 +90,7 @@ class MinioDatasetStorage:
                 data=file_obj,
                 length=length,
                 content_type=content_type,
+                part_size=self.PART_SIZE,
             )
         except S3Error as exc:
             logger.error("Error uploading dataset to MinIO: %s", exc)
@@ -100,7 +113,7 @@ class MinioDatasetStorage:
             raise
 
     def delete_dataset(self, file_key: str) -> None:
-        """Delete a dataset file from the bucket."""
+        """Delete a dataset file from the bucket. A missing file is not an error."""
         try:
             logger.info("Deleting dataset from MinIO: key=%s", file_key)
             self._client.remove_object(
@@ -108,6 +121,9 @@ class MinioDatasetStorage:
                 object_name=file_key,
             )
         except S3Error as exc:
+            if exc.code == "NoSuchKey":
+                logger.info("Dataset already absent from MinIO: key=%s", file_key)
+                return
             logger.error("Error deleting dataset from MinIO: %s", exc)
             raise
 
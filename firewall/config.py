@@ -59,6 +59,10 @@ class MLConfig(BaseSettings):
     # Local embeddings configuration (faster alternative to Ollama)
     use_local_embeddings: bool = True  # If True, uses SentenceTransformers locally (~50-200ms vs 2-5s)
     local_embedding_model: str = "nomic-ai/nomic-embed-text-v1.5"  # Compatible with Ollama's nomic model
+
+    # Micro-batching of concurrent analyses (batch_max_size <= 1 disables it)
+    batch_max_size: int = 16
+    batch_max_delay_ms: float = 0.0  # 0: only batch requests already waiting
     
 
 
@@ -82,6 +86,7 @@ class PolicyConfig(BaseSettings):
     policies_path: str = "policy_engine/policies.rego"
     opa_url: str = "http://localhost:8181"
     opa_policy_name: str = "firewall/policy"
+    opa_policy_cache_ttl: float = 300.0
 
 
 class LoggingConfig(BaseSettings):
@@ -0,0 +1,132 @@
+"""TTL + LRU cache of content analyses."""
+
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import replace
+from typing import Hashable, Optional, Union
+
+from core.analyzer import AnalysisDirection, AnalysisResult
+from core.exceptions import ContentBlockedException
+from core.request_context import RequestContext
+
+CachedAnalysis = Union[AnalysisResult, ContentBlockedException]
+
+# Context fields that reach the detectors (see CustomONNXPromptInjectionDetector)
+_CONTEXT_FIELDS = (
+    "user_id",
+    "temperature",
+    "max_tokens",
+    "turn_count",
+    "rate_limit",
+    "device",
+    "endpoint",
+)
+
+
+class AnalysisCache:
+    """
+    Cache of analysis outcomes, keyed by content, direction and context.
+
+    Both outcomes are cached: the `AnalysisResult` of allowed content and
+    the `ContentBlockedException` of blocked content, so repeated blocks are
+    answered as fast as repeated allows. Entries expire after `ttl_seconds`
+    (policies and models may change) and the least recently used entry is
+    evicted once `max_size` is reached.
+    """
+
+    def __init__(self, max_size: int = 10_000, ttl_seconds: float = 300.0) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            max_size: Maximum number of cached analyses
+            ttl_seconds: Lifetime of a cached analysis
+        """
+        self._max_size = max_size
+        self._ttl = ttl_seconds
+        self._entries: OrderedDict[Hashable, tuple[float, CachedAnalysis]] = OrderedDict()
+
+    @staticmethod
+    def make_key(
+        content: str,
+        direction: AnalysisDirection,
+        context: RequestContext | None = None,
+    ) -> Hashable:
+        """
+        Build the cache key of an analysis.
+
+        The content is hashed so long messages are not kept as keys; the
+        context fields the detectors see are part of the key, the per-request
+        ones (request ID, timestamp) are not.
+        """
+        digest = hashlib.blake2b(content.encode(), digest_size=16).digest()
+        if context is None:
+            return direction, digest, None
+        ctx = context.to_dict()
+        return direction, digest, tuple(ctx.get(name) for name in _CONTEXT_FIELDS)
+
+    def get(self, key: Hashable) -> Optional[CachedAnalysis]:
+        """Return the cached analysis of `key`, or None if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, analysis = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return analysis
+
+    def clear(self) -> None:
+        """Drop every cached analysis (e.g. after a detector or policy reload)."""
+        self._entries.clear()
+
+    def put(self, key: Hashable, analysis: CachedAnalysis) -> None:
+        """Cache an analysis, evicting the least recently used one if full."""
+        self._entries[key] = (time.monotonic() + self._ttl, analysis)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+
+    @staticmethod
+    def as_hit(result: AnalysisResult) -> AnalysisResult:
+        """
+        Copy a cached result for the request it is served to.
+
+        The copy is flagged as `cached` and reports no analysis latency: the
+        latency of the original analysis must not show up in this request's
+        metrics.
+        """
+        ml_signals = result.ml_signals
+        if ml_signals is not None:
+            ml_signals = replace(ml_signals, latency_ms=0.0)
+        return replace(result, ml_signals=ml_signals, latency_ms=0.0, cached=True)
+
+    @staticmethod
+    def replay_block(
+        exc: ContentBlockedException, cached: bool = False
+    ) -> ContentBlockedException:
+        """
+        Build a fresh copy of a block to raise for another request.
+
+        Args:
+            exc: Block to copy
+            cached: The block is served from the cache; the copy is flagged
+                as such and reports no analysis latency (see `as_hit`)
+        """
+        details = dict(exc.details)
+        ml_signals = exc.ml_signals
+        if cached:
+            details["latency_ms"] = 0.0
+            details["cached"] = True
+            if ml_signals is not None:
+                ml_signals = replace(ml_signals, latency_ms=0.0)
+        blocked = ContentBlockedException(
+            reason=exc.reason,
+            direction=exc.direction,
+            details=details,
+        )
+        blocked.ml_signals = ml_signals
+        blocked.preprocessed = exc.preprocessed
+        return blocked
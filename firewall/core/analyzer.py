@@ -9,14 +9,14 @@ from preprocessor.preprocessor_service import PreprocessedData
 from core.request_context import RequestContext
 
 
-class AnalysisDirection(Enum):
-    """Direction of the analysis."""
+class AnalysisDirection(str, Enum):
+    """Direction of the analysis (compares equal to its string value)."""
 
     INGRESS = "ingress"
     EGRESS = "egress"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class AnalysisResult:
     """Result of the analysis of the firewall."""
 
@@ -25,6 +25,8 @@ class AnalysisResult:
     decision: PolicyDecision
     direction: AnalysisDirection
     latency_ms: float = 0.0
+    # Served from the analysis cache (no analysis was run)
+    cached: bool = False
 
 
 class IPreprocessorService(Protocol):
@@ -99,7 +101,7 @@ class FirewallAnalyzer:
         """
         import time
 
-        start = time.time()
+        start = time.perf_counter()
 
         # 1. Preprocess
         preprocessed = self._preprocessor.preprocess(content, store=store)
@@ -114,7 +116,7 @@ class FirewallAnalyzer:
             tenant_id=self._tenant_id,
         )
 
-        latency_ms = (time.time() - start) * 1000
+        latency_ms = (time.perf_counter() - start) * 1000
 
         result = AnalysisResult(
             preprocessed=preprocessed,
@@ -0,0 +1,4 @@
+from pydantic import ConfigDict
+
+# Immutable, closed schemas: no per-instance assignment validation and unknown fields are rejected.
+FROZEN_CONFIG = ConfigDict(extra="forbid", frozen=True, validate_assignment=False)
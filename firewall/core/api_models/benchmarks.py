@@ -1,11 +1,15 @@
-from typing import Optional, Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel
 
+from ._base import FROZEN_CONFIG
+
 
 class BenchmarkStartRequest(BaseModel):
     """Request to start a new benchmark."""
 
+    model_config = FROZEN_CONFIG
+
     dataset_name: Optional[str] = None
     dataset_split: str = "test"
     max_samples: Optional[int] = None
@@ -17,6 +21,8 @@ class BenchmarkStartRequest(BaseModel):
 class DatasetUploadResponse(BaseModel):
     """Response to upload a custom dataset."""
 
+    model_config = FROZEN_CONFIG
+
     dataset_id: str
     name: str
     description: Optional[str] = None
@@ -28,6 +34,8 @@ class DatasetUploadResponse(BaseModel):
 class CustomDatasetInfo(BaseModel):
     """Information of a custom dataset."""
 
+    model_config = FROZEN_CONFIG
+
     id: str
     name: str
     description: Optional[str] = None
@@ -39,12 +47,16 @@ class CustomDatasetInfo(BaseModel):
 class CustomDatasetListResponse(BaseModel):
     """List of available custom datasets."""
 
+    model_config = FROZEN_CONFIG
+
     datasets: List[CustomDatasetInfo]
 
 
 class BenchmarkDelta(BaseModel):
     """Delta information for a single metric."""
 
+    model_config = FROZEN_CONFIG
+
     value: Optional[float]
     percent: Optional[float]
     polarity: str  # 'positive', 'negative', 'neutral'
@@ -53,6 +65,8 @@ class BenchmarkDelta(BaseModel):
 class BenchmarkSampleChange(BaseModel):
     """Represents how a single sample changed between baseline and candidate."""
 
+    model_config = FROZEN_CONFIG
+
     sample_index: int
     input_text: str
     expected_label: str
@@ -65,6 +79,8 @@ class BenchmarkSampleChange(BaseModel):
 class BenchmarkCandidateComparison(BaseModel):
     """Comparison details for a single candidate run."""
 
+    model_config = FROZEN_CONFIG
+
     run_id: str
     start_time: Optional[str] = None
     detector_config: Optional[Dict[str, Any]] = None
@@ -76,6 +92,8 @@ class BenchmarkCandidateComparison(BaseModel):
 class BenchmarkComparisonResponse(BaseModel):
     """High-level response for benchmark comparison with explicit baseline."""
 
+    model_config = FROZEN_CONFIG
+
     dataset_info: Dict[str, Any]
     baseline: Dict[str, Any]
     candidates: List[BenchmarkCandidateComparison]
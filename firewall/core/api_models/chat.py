@@ -2,20 +2,27 @@ from typing import Optional
 
 from pydantic import BaseModel
 
+from ._base import FROZEN_CONFIG
+
 
 class DetectorMetrics(BaseModel):
     """Metrics of an individual detector."""
 
+    model_config = FROZEN_CONFIG
+
     name: str
     score: float
     latency_ms: float
     threshold: float | None = None
     status: str = "pass"  # pass, warn, block
+    model_name: str | None = None
 
 
 class PreprocessingMetrics(BaseModel):
     """Preprocessing phase metrics."""
 
+    model_config = FROZEN_CONFIG
+
     original_length: int
     normalized_length: int
     word_count: int
@@ -25,12 +32,16 @@ class PreprocessingMetrics(BaseModel):
 class PolicyMetrics(BaseModel):
     """Policy evaluation metrics."""
 
+    model_config = FROZEN_CONFIG
+
     matched_rule: str | None = None
     confidence: float
     risk_level: str  # low, medium, high, critical
 
 
 class ChatResponse(BaseModel):
+    model_config = FROZEN_CONFIG
+
     blocked: bool = False
     reason: str | None = None
     reply: str | None = None
@@ -44,6 +55,8 @@ class ChatResponse(BaseModel):
 
 
 class ChatRequest(BaseModel):
+    model_config = FROZEN_CONFIG
+
     message: str
     detector_config: Optional[dict[str, str]] = None
 
@@ -1,7 +1,8 @@
 import logging
-from typing import Any
+from typing import Any, ClassVar, Optional
 
 import httpx
+import orjson
 from core.exceptions import BackendError
 
 logger = logging.getLogger(__name__)
@@ -12,18 +13,49 @@ class BackendProxyService:
     Proxy service to the backend.
 
     Responsibility: Manage communication with the backend.
+
+    All instances share one keep-alive `httpx.AsyncClient` (created lazily,
+    closed on application shutdown), so backend calls reuse pooled
+    connections instead of opening a new one per request.
     """
 
-    def __init__(self, backend_url: str, timeout: float = 30.0) -> None:
+    _shared_client: ClassVar[Optional[httpx.AsyncClient]] = None
+
+    def __init__(
+        self,
+        backend_url: str,
+        timeout: float = 30.0,
+        client: Optional[httpx.AsyncClient] = None,
+    ) -> None:
         """
         Initialize the proxy service.
 
         Args:
             backend_url: Backend URL
             timeout: Timeout for the requests (default: 30.0)
+            client: HTTP client to use; defaults to the shared client
         """
         self._backend_url = backend_url
+        self._chat_url = f"{backend_url}/api/chat"
         self._timeout = timeout
+        self._client = client
+
+    @classmethod
+    def get_shared_client(cls) -> httpx.AsyncClient:
+        """Get the shared HTTP client, creating it on first use."""
+        if cls._shared_client is None or cls._shared_client.is_closed:
+            cls._shared_client = httpx.AsyncClient(
+                timeout=30.0,
+                limits=httpx.Limits(max_connections=200, max_keepalive_connections=100),
+            )
+        return cls._shared_client
+
+    @classmethod
+    async def aclose_shared_client(cls) -> None:
+        """Close the shared HTTP client (application shutdown)."""
+        if cls._shared_client is not None:
+            await cls._shared_client.aclose()
+            cls._shared_client = None
 
     async def send_chat_message(self, message: str) -> dict[str, Any]:
         """
@@ -39,24 +71,24 @@ class BackendProxyService:
             BackendError: If there is an error in the communication
         """
         try:
-            async with httpx.AsyncClient(timeout=self._timeout) as client:
-                logger.info(f"Sending message to the backend: {self._backend_url}")
-                response = await client.post(
-                    f"{self._backend_url}/api/chat", json={"message": message}
-                )
-                response.raise_for_status()
-                data = response.json()
-                logger.info(f"Backend response received: {response.status_code}")
-                return data
+            client = self._client or self.get_shared_client()
+            logger.info("Sending message to the backend: %s", self._backend_url)
+            response = await client.post(
+                self._chat_url, json={"message": message}, timeout=self._timeout
+            )
+            response.raise_for_status()
+            data = orjson.loads(response.content)
+            logger.info("Backend response received: %s", response.status_code)
+            return data
 
         except httpx.HTTPError as e:
-            logger.error(f"HTTP error from the backend: {e}")
+            logger.error("HTTP error from the backend: %s", e)
             raise BackendError(
                 message="Error communicating with the backend",
                 details={"error": str(e), "backend_url": self._backend_url},
             ) from e
         except Exception as e:
-            logger.error(f"Unexpected error contacting the backend: {e}")
+            logger.error("Unexpected error contacting the backend: %s", e)
             raise BackendError(
                 message="Unexpected error communicating with the backend",
                 details={"error": str(e)},
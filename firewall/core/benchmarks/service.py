@@ -1,19 +1,34 @@
 from __future__ import annotations
 
-import json
+import asyncio
+import hashlib
 import logging
+import os
+import tempfile
 import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
 from enum import Enum
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, BinaryIO
+
+import numpy as np
+import orjson
+import zstandard
 
 from benchmark.database import BenchmarkDatabase
+from benchmark.dataset_loader import DatasetLoader, PARQUET_CONTENT_TYPE
 from benchmark.benchmark_runner import BenchmarkRunner
 from benchmark.minio_storage import MinioDatasetStorage
-from core.gateway import get_default_gateway, create_gateway_orchestrator
 
 
 logger = logging.getLogger(__name__)
 
+# Bytes of a converted dataset kept in memory before spilling to a temp file
+PARQUET_SPOOL_SIZE = int(os.getenv("BENCHMARK_PARQUET_SPOOL_SIZE", str(16 * 1024 * 1024)))
+# Samples per change bucket kept in a persisted comparison; requests ask for
+# at most this many and get the cached lists truncated to their own limit
+COMPARISON_SAMPLES_CAP = 1000
+
 
 class SampleChangeType(Enum):
     """Classification of how a sample's result changed between runs."""
@@ -30,15 +45,172 @@ class SampleChangeType(Enum):
     UNCHANGED = "unchanged"
 
 
+@dataclass(slots=True)
+class SamplePayload:
+    """UI payload of a sample whose result changed between two runs."""
+
+    sample_index: int
+    input_text: str
+    expected_label: str
+    baseline_result_type: str
+    candidate_result_type: str
+    baseline_analysis: Any
+    candidate_analysis: Any
+
+
+# Result type transitions (baseline, candidate) that count as a sample change
+_SAMPLE_TRANSITIONS: Dict[tuple[str, str], SampleChangeType] = {
+    ("TRUE_POSITIVE", "FALSE_NEGATIVE"): SampleChangeType.REGRESSION_TP_TO_FN,
+    ("TRUE_NEGATIVE", "FALSE_POSITIVE"): SampleChangeType.REGRESSION_TN_TO_FP,
+    ("FALSE_NEGATIVE", "TRUE_POSITIVE"): SampleChangeType.IMPROVEMENT_FN_TO_TP,
+    ("FALSE_POSITIVE", "TRUE_NEGATIVE"): SampleChangeType.IMPROVEMENT_FP_TO_TN,
+}
+
+# Bucket names used in the comparison payload for each change type
+_BUCKET_CHANGE_TYPES: Dict[str, SampleChangeType] = {
+    "critical": SampleChangeType.REGRESSION_TP_TO_FN,
+    "new_false_positives": SampleChangeType.REGRESSION_TN_TO_FP,
+    "new_detections": SampleChangeType.IMPROVEMENT_FN_TO_TP,
+    "fixed_false_positives": SampleChangeType.IMPROVEMENT_FP_TO_TN,
+}
+
+# Result type transition of each change type
+_CHANGE_TYPE_TRANSITIONS: Dict[SampleChangeType, tuple[str, str]] = {
+    change_type: transition for transition, change_type in _SAMPLE_TRANSITIONS.items()
+}
+
+# Metrics compared between runs: (key, positive_when_increases, is_count).
+# Counts default to 0 and are compared as floats; the rest may be None.
+_DELTA_METRICS: tuple[tuple[str, bool, bool], ...] = (
+    # Classification metrics (higher is better)
+    ("precision", True, False),
+    ("recall", True, False),
+    ("f1_score", True, False),
+    ("accuracy", True, False),
+    # Error counts (lower is better)
+    ("false_positives", False, True),
+    ("false_negatives", False, True),
+    # Latency metrics (lower is better)
+    ("avg_latency_ms", False, False),
+    ("p50_latency_ms", False, False),
+    ("p95_latency_ms", False, False),
+    ("p99_latency_ms", False, False),
+)
+
+
+def _decode_analysis(raw: Optional[str]) -> Any:
+    """Decode a stored analysis_details blob, keeping the raw value if it is not valid JSON."""
+    if not raw:
+        return raw
+    try:
+        return orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        return raw
+
+
+def _payload(baseline: Dict[str, Any], candidate: Dict[str, Any]) -> SamplePayload:
+    """Build the UI payload of a changed sample from its paired result rows."""
+    return SamplePayload(
+        sample_index=baseline["sample_index"],
+        input_text=candidate["input_text"] or baseline["input_text"],
+        expected_label=candidate["expected_label"] or baseline["expected_label"],
+        baseline_result_type=baseline["result_type"],
+        candidate_result_type=candidate["result_type"],
+        baseline_analysis=_decode_analysis(baseline["analysis_details"]),
+        candidate_analysis=_decode_analysis(candidate["analysis_details"]),
+    )
+
+
+def _truncate_sample_changes(result: Dict[str, Any], max_samples_per_bucket: int) -> Dict[str, Any]:
+    """Cut the sample lists of a decoded comparison to `max_samples_per_bucket`."""
+    for candidate in result["candidates"]:
+        sample_changes = candidate["sample_changes"]
+        for group in ("regressions", "improvements"):
+            buckets = sample_changes[group]
+            for name, samples in buckets.items():
+                buckets[name] = samples[:max_samples_per_bucket]
+        sample_changes["truncated"] = any(
+            count > max_samples_per_bucket for count in sample_changes["counts"].values()
+        )
+    return result
+
+
+def _parsed_config(run_info: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Return the decoded `config_snapshot` of a run row.
+
+    The result is memoized on the row itself under `_parsed_config`, so
+    repeated lookups on the same run do not parse the JSON again. Missing
+    or invalid snapshots yield an empty dict.
+    """
+    parsed = run_info.get("_parsed_config")
+    if parsed is None:
+        parsed = {}
+        if run_info.get("config_snapshot"):
+            try:
+                parsed = orjson.loads(run_info["config_snapshot"])
+            except orjson.JSONDecodeError:
+                parsed = {}
+        run_info["_parsed_config"] = parsed
+    return parsed
+
+
 class BenchmarkService:
     """High-level service to manage firewall benchmarks."""
 
-    def __init__(self, db_path: str = "benchmarks.db") -> None:
+    # Max number of completed-run responses kept in memory
+    COMPLETED_CACHE_SIZE = 256
+
+    # Set once the process-wide instance exists
+    _instantiated = False
+
+    def __init__(self, db_path: str = "benchmarks.db", db_pool_size: Optional[int] = None) -> None:
+        """
+        Initialize the benchmark service.
+
+        Args:
+            db_path: Path to the SQLite benchmarks database.
+            db_pool_size: Max number of concurrent DB-heavy scans (paired
+                results of comparisons). Defaults to `BENCHMARK_DB_POOL_SIZE`.
+
+        Raises:
+            RuntimeError: If a BenchmarkService was already created in this
+                process; use the module-level `benchmark_service` instead.
+        """
+        if BenchmarkService._instantiated:
+            raise RuntimeError(
+                "BenchmarkService is a process-wide singleton; import `benchmark_service` instead"
+            )
+        BenchmarkService._instantiated = True
+
+        if db_pool_size is None:
+            db_pool_size = int(os.getenv("BENCHMARK_DB_POOL_SIZE", "4"))
+        # Bounds concurrent comparison scans so they cannot starve the DB
+        self._db_semaphore = asyncio.Semaphore(db_pool_size)
         self._database = BenchmarkDatabase(db_path)
         # The runner is initialized in `initialize` because it needs the DB initialized
         self._runner: Optional[BenchmarkRunner] = None
         self._db_path = db_path
         self._storage = MinioDatasetStorage()
+        # LRU of status/metrics responses of completed runs, keyed by (kind, run_id).
+        # Completed runs are immutable, so these never go stale.
+        self._completed_cache: OrderedDict[tuple[str, str], Dict[str, Any]] = OrderedDict()
+
+    def _cache_get(self, kind: str, run_id: str) -> Optional[Dict[str, Any]]:
+        cached = self._completed_cache.get((kind, run_id))
+        if cached is not None:
+            self._completed_cache.move_to_end((kind, run_id))
+        return cached
+
+    def _cache_put(self, kind: str, run_id: str, value: Dict[str, Any]) -> None:
+        self._completed_cache[(kind, run_id)] = value
+        self._completed_cache.move_to_end((kind, run_id))
+        if len(self._completed_cache) > self.COMPLETED_CACHE_SIZE:
+            self._completed_cache.popitem(last=False)
+
+    def _cache_invalidate(self, run_id: str) -> None:
+        for kind in ("status", "metrics"):
+            self._completed_cache.pop((kind, run_id), None)
 
     @property
     def database(self) -> BenchmarkDatabase:
@@ -49,11 +221,14 @@ class BenchmarkService:
         return self._runner
 
     async def initialize(self) -> None:
-        """Initialize database and runner."""
+        """Initialize database and runner. Subsequent calls are no-ops."""
+        if self._runner is not None:
+            return
         try:
             await self._database.initialize()
-            firewall = get_default_gateway()
-            self._runner = BenchmarkRunner(firewall, self._database)
+            # The runner resolves the default gateway per run, so it never
+            # keeps a gateway dropped by a reload
+            self._runner = BenchmarkRunner(None, self._database)
             logger.info(
                 "BenchmarkService initialized with database at %s", self._db_path
             )
@@ -94,7 +269,7 @@ class BenchmarkService:
         self,
         name: str,
         description: Optional[str],
-        file_content: bytes,
+        file_obj: BinaryIO,
         file_type: str,
         total_samples: int,
     ) -> tuple[str, str]:
@@ -103,35 +278,52 @@ class BenchmarkService:
         - Upload file to MinIO
         - Save metadata in the database
 
+        The file is converted to Parquet (zstd) before upload and stored with
+        `file_type="application/parquet"`. Upload and metadata insert run
+        concurrently; if one of them fails the other one is rolled back so no
+        orphan object or metadata row is left behind.
+
         Returns (dataset_id, created_at).
         """
         dataset_id = str(uuid.uuid4())
-        file_ext = "csv" if file_type == "text/csv" else "json"
-        file_key = f"datasets/{dataset_id}.{file_ext}"
-
-        from io import BytesIO
-
-        # Upload to MinIO
-        self._storage.upload_dataset(
-            file_key=file_key,
-            file_obj=BytesIO(file_content),
-            length=len(file_content),
-            content_type=file_type,
-        )
+        file_key = f"datasets/{dataset_id}.parquet"
+
+        # Stored as Parquet: benchmark runs read the columnar file instead of
+        # re-parsing the original CSV/JSON every time. The file is spooled to
+        # disk past PARQUET_SPOOL_SIZE instead of being held in memory.
+        with tempfile.SpooledTemporaryFile(max_size=PARQUET_SPOOL_SIZE) as parquet_file:
+            await asyncio.to_thread(
+                DatasetLoader().to_parquet, file_obj, file_type, parquet_file
+            )
+            parquet_file.seek(0)
+
+            upload_result, save_result = await asyncio.gather(
+                asyncio.to_thread(
+                    self._storage.upload_dataset,
+                    file_key=file_key,
+                    file_obj=parquet_file,
+                    content_type=PARQUET_CONTENT_TYPE,
+                ),
+                self._database.save_dataset_metadata(
+                    dataset_id=dataset_id,
+                    name=name,
+                    description=description,
+                    file_key=file_key,
+                    file_type=PARQUET_CONTENT_TYPE,
+                    total_samples=total_samples,
+                ),
+                return_exceptions=True,
+            )
 
-        # Save metadata
-        await self._database.save_dataset_metadata(
-            dataset_id=dataset_id,
-            name=name,
-            description=description,
-            file_key=file_key,
-            file_type=file_type,
-            total_samples=total_samples,
-        )
+        if isinstance(upload_result, BaseException):
+            if not isinstance(save_result, BaseException):
+                await self._database.delete_dataset_metadata(dataset_id)
+            raise upload_result
+        if isinstance(save_result, BaseException):
+            await asyncio.to_thread(self._storage.delete_dataset, file_key)
+            raise save_result
 
-        meta = await self._database.get_dataset_metadata(dataset_id)
-        created_at = meta["created_at"] if meta else ""
-        return dataset_id, created_at
+        return dataset_id, save_result
 
     async def list_custom_datasets(
         self,
@@ -158,17 +350,24 @@ class BenchmarkService:
         - Delete the file from MinIO if it exists
         - Delete the metadata from the database
 
-        Does not affect benchmarks that already used that dataset.
+        Both deletes run concurrently; a file already missing from MinIO is
+        treated as deleted. Does not affect benchmarks that already used that
+        dataset.
         """
         meta = await self._database.get_dataset_metadata(dataset_id)
         if not meta:
             raise KeyError("Dataset not found")
 
-        file_key = meta["file_key"]
-        if self._storage.dataset_exists(file_key):
-            self._storage.delete_dataset(file_key)
+        storage_result, db_result = await asyncio.gather(
+            asyncio.to_thread(self._storage.delete_dataset, meta["file_key"]),
+            self._database.delete_dataset_metadata(dataset_id),
+            return_exceptions=True,
+        )
 
-        await self._database.delete_dataset_metadata(dataset_id)
+        if isinstance(db_result, BaseException):
+            raise db_result
+        if isinstance(storage_result, BaseException):
+            raise storage_result
 
     async def get_status(self, run_id: str) -> Dict[str, Any]:
         if not self._runner:
@@ -176,19 +375,16 @@ class BenchmarkService:
 
         status_info = self._runner.get_status(run_id)
         if not status_info:
+            cached = self._cache_get("status", run_id)
+            if cached is not None:
+                return cached
+
             # Check DB for completed/failed runs
             run_info = await self._database.get_run(run_id)
             if not run_info:
                 raise KeyError("Benchmark run not found")
 
-            config_snapshot: Dict[str, Any] = {}
-            if run_info.get("config_snapshot"):
-                try:
-                    config_snapshot = json.loads(run_info["config_snapshot"])
-                except Exception:
-                    config_snapshot = {}
-
-            return {
+            status_info = {
                 "run_id": run_id,
                 "status": run_info["status"],
                 "total_samples": run_info["total_samples"],
@@ -198,23 +394,19 @@ class BenchmarkService:
                     if run_info["total_samples"] > 0
                     else 0
                 ),
-                "detector_config": config_snapshot.get("detector_config"),
+                "detector_config": _parsed_config(run_info).get("detector_config"),
             }
+            if run_info["status"] == "completed":
+                self._cache_put("status", run_id, status_info)
+            return status_info
 
-        # add detector_config from DB if available
-        run_info = await self._database.get_run(run_id)
-        if run_info and run_info.get("config_snapshot"):
-            try:
-                config_snapshot = json.loads(run_info["config_snapshot"])
-                status_info["detector_config"] = config_snapshot.get("detector_config")
-            except Exception:
-                pass
-
+        # Live status already carries detector_config; no DB round-trip per poll
         return status_info
 
     async def cancel_benchmark(self, run_id: str) -> bool:
         if not self._runner:
             raise RuntimeError("Benchmark system not initialized")
+        self._cache_invalidate(run_id)
         return await self._runner.cancel_benchmark(run_id)
 
     async def get_runs(self, limit: int = 50, offset: int = 0) -> List[Dict[str, Any]]:
@@ -239,6 +431,10 @@ class BenchmarkService:
         if not self._database:
             raise RuntimeError("Benchmark system not initialized")
 
+        cached = self._cache_get("metrics", run_id)
+        if cached is not None:
+            return cached
+
         metrics = await self._database.get_metrics(run_id)
         if not metrics:
             raise KeyError(
@@ -248,12 +444,10 @@ class BenchmarkService:
         # Add detector_config from run info
         run_info = await self._database.get_run(run_id)
         if run_info and run_info.get("config_snapshot"):
-            try:
-                config_snapshot = json.loads(run_info["config_snapshot"])
-                metrics["detector_config"] = config_snapshot.get("detector_config")
-            except Exception:
-                pass
+            metrics["detector_config"] = _parsed_config(run_info).get("detector_config")
 
+        if run_info and run_info.get("status") == "completed":
+            self._cache_put("metrics", run_id, metrics)
         return metrics
 
     async def get_error_analysis(self, run_id: str) -> Dict[str, Any]:
@@ -266,20 +460,36 @@ class BenchmarkService:
     # ------------------------------------------------------------------
 
     @staticmethod
-    def _classify_sample_change(
-        baseline_result_type: str,
-        candidate_result_type: str,
-    ) -> SampleChangeType:
-        """Classify how a single sample changed between baseline and candidate."""
-        transitions: Dict[tuple[str, str], SampleChangeType] = {
-            ("TRUE_POSITIVE", "FALSE_NEGATIVE"): SampleChangeType.REGRESSION_TP_TO_FN,
-            ("TRUE_NEGATIVE", "FALSE_POSITIVE"): SampleChangeType.REGRESSION_TN_TO_FP,
-            ("FALSE_NEGATIVE", "TRUE_POSITIVE"): SampleChangeType.IMPROVEMENT_FN_TO_TP,
-            ("FALSE_POSITIVE", "TRUE_NEGATIVE"): SampleChangeType.IMPROVEMENT_FP_TO_TN,
-        }
-        return transitions.get(
-            (baseline_result_type, candidate_result_type), SampleChangeType.UNCHANGED
-        )
+    def _collect_sample_changes(
+        pairs: List[tuple[Dict[str, Any], Dict[str, Any]]],
+        buckets: Dict[SampleChangeType, List[SamplePayload]],
+        counts: Dict[SampleChangeType, int],
+        max_per_bucket: Optional[int] = None,
+    ) -> None:
+        """
+        Append the samples of a batch whose result changed to their bucket.
+
+        Result types of the batch are compared as NumPy arrays, one mask per
+        transition, so unchanged samples cost no Python-level work. `counts`
+        is always updated with the exact number of changes, while payloads
+        are only built for the rows that fit in `max_per_bucket`.
+        """
+        if not pairs:
+            return
+
+        baseline_types = np.array([b["result_type"] for b, _ in pairs], dtype=object)
+        candidate_types = np.array([c["result_type"] for _, c in pairs], dtype=object)
+
+        for (baseline_type, candidate_type), change_type in _SAMPLE_TRANSITIONS.items():
+            mask = (baseline_types == baseline_type) & (candidate_types == candidate_type)
+            positions = np.flatnonzero(mask)
+            counts[change_type] += int(positions.size)
+            bucket = buckets[change_type]
+            if max_per_bucket is not None:
+                positions = positions[: max(max_per_bucket - len(bucket), 0)]
+            # Payloads (and their analysis_details decoding) are only built
+            # for rows kept after truncation
+            bucket.extend(_payload(*pairs[position]) for position in positions.tolist())
 
     @staticmethod
     def _compute_delta(
@@ -328,10 +538,20 @@ class BenchmarkService:
         self,
         baseline_run_id: str,
         candidate_run_ids: List[str],
+        max_samples_per_bucket: int = 100,
     ) -> Dict[str, Any]:
         """
         Compare a baseline benchmark run against one or more candidate runs.
 
+        Each sample change bucket returns at most `max_samples_per_bucket`
+        samples (up to `COMPARISON_SAMPLES_CAP`); counts and summary totals
+        are always exact and the full lists are available through
+        `get_sample_changes`.
+
+        The comparison is persisted once per set of runs, with the lists cut
+        at `COMPARISON_SAMPLES_CAP`, and truncated to the requested size on
+        every read, so the limit does not multiply the cached entries.
+
         Guardrails:
         - All runs must exist
         - All runs must be completed
@@ -354,51 +574,38 @@ class BenchmarkService:
                 "No valid candidate_run_ids provided (they may all match the baseline_run_id)"
             )
 
-        all_run_ids = [baseline_run_id] + candidate_run_ids
+        all_run_ids = [baseline_run_id, *candidate_run_ids]
 
         # ------------------------------------------------------------------
         # 1. Load run metadata and enforce guardrails
         # ------------------------------------------------------------------
-        runs_info: Dict[str, Dict[str, Any]] = {}
-        for run_id in all_run_ids:
-            run_info = await self._database.get_run(run_id)
-            if not run_info:
-                raise KeyError(f"Benchmark run not found: {run_id}")
-            runs_info[run_id] = run_info
-
-        # All runs must be completed
-        incomplete = [
-            run_id for run_id, info in runs_info.items() if info.get("status") != "completed"
-        ]
-        if incomplete:
-            raise ValueError(
-                "All benchmarks must be completed before comparison. "
-                f"Non-completed runs: {', '.join(incomplete)}"
-            )
-
-        # All runs must share same dataset_name and dataset_split
-        baseline_info = runs_info[baseline_run_id]
-        baseline_dataset_name = baseline_info.get("dataset_name")
-        baseline_dataset_split = baseline_info.get("dataset_split")
-
-        mismatched = [
-            run_id
-            for run_id, info in runs_info.items()
-            if info.get("dataset_name") != baseline_dataset_name
-            or info.get("dataset_split") != baseline_dataset_split
-        ]
-        if mismatched:
-            raise ValueError(
-                "Cannot compare benchmarks from different datasets or splits. "
-                "All runs must share the same dataset_name and dataset_split."
+        baseline_status = await self._validate_comparison_runs(baseline_run_id, all_run_ids)
+        baseline_dataset_name = baseline_status.get("dataset_name")
+        baseline_dataset_split = baseline_status.get("dataset_split")
+
+        max_samples_per_bucket = min(max_samples_per_bucket, COMPARISON_SAMPLES_CAP)
+
+        # Completed runs are immutable, so the comparison is deterministic
+        cache_key = self._comparison_cache_key(baseline_run_id, candidate_run_ids)
+        cached = await self._database.get_comparison(cache_key)
+        if cached is not None:
+            return _truncate_sample_changes(
+                orjson.loads(zstandard.ZstdDecompressor().decompress(cached)),
+                max_samples_per_bucket,
             )
 
         # ------------------------------------------------------------------
-        # 2. Load metrics for all runs
+        # 2. Load full run info and metrics for all runs
         # ------------------------------------------------------------------
+        bundles = await self._database.get_runs_and_metrics(all_run_ids)
+        runs_info: Dict[str, Dict[str, Any]] = {
+            run_id: bundle["run"] for run_id, bundle in bundles.items()
+        }
+        baseline_info = runs_info[baseline_run_id]
+
         metrics_by_run: Dict[str, Dict[str, Any]] = {}
         for run_id in all_run_ids:
-            metrics = await self._database.get_metrics(run_id)
+            metrics = bundles[run_id]["metrics"]
             if not metrics:
                 raise ValueError(
                     f"Metrics not found for run {run_id}. "
@@ -411,137 +618,61 @@ class BenchmarkService:
         # ------------------------------------------------------------------
         # 3. Build comparison for each candidate
         # ------------------------------------------------------------------
+        # Baseline side of every delta is extracted once, not per candidate
+        baseline_values = {
+            key: float(baseline_metrics.get(key, 0)) if is_count else baseline_metrics.get(key)
+            for key, _, is_count in _DELTA_METRICS
+        }
+        compute_delta = self._compute_delta
+
         def build_deltas(candidate_metrics: Dict[str, Any]) -> Dict[str, Any]:
             """Compute metric deltas vs baseline with polarity semantics."""
             return {
-                # Classification metrics (higher is better)
-                "precision": self._compute_delta(
-                    baseline_metrics.get("precision"),
-                    candidate_metrics.get("precision"),
-                    positive_when_increases=True,
-                ),
-                "recall": self._compute_delta(
-                    baseline_metrics.get("recall"),
-                    candidate_metrics.get("recall"),
-                    positive_when_increases=True,
-                ),
-                "f1_score": self._compute_delta(
-                    baseline_metrics.get("f1_score"),
-                    candidate_metrics.get("f1_score"),
-                    positive_when_increases=True,
-                ),
-                "accuracy": self._compute_delta(
-                    baseline_metrics.get("accuracy"),
-                    candidate_metrics.get("accuracy"),
-                    positive_when_increases=True,
-                ),
-                # Error counts (lower is better)
-                "false_positives": self._compute_delta(
-                    float(baseline_metrics.get("false_positives", 0)),
-                    float(candidate_metrics.get("false_positives", 0)),
-                    positive_when_increases=False,
-                ),
-                "false_negatives": self._compute_delta(
-                    float(baseline_metrics.get("false_negatives", 0)),
-                    float(candidate_metrics.get("false_negatives", 0)),
-                    positive_when_increases=False,
-                ),
-                # Latency metrics (lower is better)
-                "avg_latency_ms": self._compute_delta(
-                    baseline_metrics.get("avg_latency_ms"),
-                    candidate_metrics.get("avg_latency_ms"),
-                    positive_when_increases=False,
-                ),
-                "p50_latency_ms": self._compute_delta(
-                    baseline_metrics.get("p50_latency_ms"),
-                    candidate_metrics.get("p50_latency_ms"),
-                    positive_when_increases=False,
-                ),
-                "p95_latency_ms": self._compute_delta(
-                    baseline_metrics.get("p95_latency_ms"),
-                    candidate_metrics.get("p95_latency_ms"),
-                    positive_when_increases=False,
-                ),
-                "p99_latency_ms": self._compute_delta(
-                    baseline_metrics.get("p99_latency_ms"),
-                    candidate_metrics.get("p99_latency_ms"),
-                    positive_when_increases=False,
-                ),
+                key: compute_delta(
+                    baseline_values[key],
+                    float(candidate_metrics.get(key, 0)) if is_count else candidate_metrics.get(key),
+                    positive_when_increases=positive_when_increases,
+                )
+                for key, positive_when_increases, is_count in _DELTA_METRICS
             }
 
         # ------------------------------------------------------------------
-        # 4. Load per-sample results for baseline (for set-theory changes)
+        # 4. Stream per-sample results paired with the baseline (set-theory changes)
         # ------------------------------------------------------------------
-        baseline_results_by_index = await self._database.get_results_by_sample_index(
-            baseline_run_id
-        )
-
         candidates: List[Dict[str, Any]] = []
         for candidate_run_id in candidate_run_ids:
             candidate_metrics = metrics_by_run[candidate_run_id]
-            candidate_results_by_index = await self._database.get_results_by_sample_index(
-                candidate_run_id
-            )
-
-            # Align on common sample indices
-            common_indices = sorted(
-                set(baseline_results_by_index.keys())
-                & set(candidate_results_by_index.keys())
+            changes: Dict[SampleChangeType, List[SamplePayload]] = {
+                change_type: [] for change_type in _SAMPLE_TRANSITIONS.values()
+            }
+            counts = dict.fromkeys(_SAMPLE_TRANSITIONS.values(), 0)
+            async with self._db_semaphore:
+                async for pairs in self._database.iter_paired_results(
+                    baseline_run_id, candidate_run_id, changed_only=True
+                ):
+                    self._collect_sample_changes(pairs, changes, counts, COMPARISON_SAMPLES_CAP)
+
+            regressions_critical = changes[SampleChangeType.REGRESSION_TP_TO_FN]
+            new_false_positives = changes[SampleChangeType.REGRESSION_TN_TO_FP]
+            improvements_new_detections = changes[SampleChangeType.IMPROVEMENT_FN_TO_TP]
+            improvements_fixed_fp = changes[SampleChangeType.IMPROVEMENT_FP_TO_TN]
+
+            total_regressions = (
+                counts[SampleChangeType.REGRESSION_TP_TO_FN]
+                + counts[SampleChangeType.REGRESSION_TN_TO_FP]
             )
-
-            regressions_critical: List[Dict[str, Any]] = []
-            new_false_positives: List[Dict[str, Any]] = []
-            improvements_new_detections: List[Dict[str, Any]] = []
-            improvements_fixed_fp: List[Dict[str, Any]] = []
-
-            for index in common_indices:
-                baseline_sample = baseline_results_by_index[index]
-                candidate_sample = candidate_results_by_index[index]
-
-                change_type = self._classify_sample_change(
-                    baseline_sample.get("result_type", ""),
-                    candidate_sample.get("result_type", ""),
-                )
-
-                if change_type is SampleChangeType.UNCHANGED:
-                    continue
-
-                # Common payload for UI
-                payload: Dict[str, Any] = {
-                    "sample_index": index,
-                    "input_text": candidate_sample.get("input_text")
-                    or baseline_sample.get("input_text"),
-                    "expected_label": candidate_sample.get("expected_label")
-                    or baseline_sample.get("expected_label"),
-                    "baseline_result_type": baseline_sample.get("result_type"),
-                    "candidate_result_type": candidate_sample.get("result_type"),
-                    "baseline_analysis": baseline_sample.get("analysis_details"),
-                    "candidate_analysis": candidate_sample.get("analysis_details"),
-                }
-
-                if change_type is SampleChangeType.REGRESSION_TP_TO_FN:
-                    regressions_critical.append(payload)
-                elif change_type is SampleChangeType.REGRESSION_TN_TO_FP:
-                    new_false_positives.append(payload)
-                elif change_type is SampleChangeType.IMPROVEMENT_FN_TO_TP:
-                    improvements_new_detections.append(payload)
-                elif change_type is SampleChangeType.IMPROVEMENT_FP_TO_TN:
-                    improvements_fixed_fp.append(payload)
-
-            total_regressions = len(regressions_critical) + len(new_false_positives)
             total_improvements = (
-                len(improvements_new_detections) + len(improvements_fixed_fp)
+                counts[SampleChangeType.IMPROVEMENT_FN_TO_TP]
+                + counts[SampleChangeType.IMPROVEMENT_FP_TO_TN]
             )
 
             candidates.append(
                 {
                     "run_id": candidate_run_id,
                     "start_time": runs_info[candidate_run_id].get("start_time"),
-                    "detector_config": json.loads(
-                        runs_info[candidate_run_id]["config_snapshot"]
-                    ).get("detector_config")
-                    if runs_info[candidate_run_id].get("config_snapshot")
-                    else None,
+                    "detector_config": _parsed_config(runs_info[candidate_run_id]).get(
+                        "detector_config"
+                    ),
                     "metrics": candidate_metrics,
                     "deltas": build_deltas(candidate_metrics),
                     "sample_changes": {
@@ -553,6 +684,14 @@ class BenchmarkService:
                             "new_detections": improvements_new_detections,
                             "fixed_false_positives": improvements_fixed_fp,
                         },
+                        "counts": {
+                            name: counts[change_type]
+                            for name, change_type in _BUCKET_CHANGE_TYPES.items()
+                        },
+                        "truncated": any(
+                            counts[change_type] > len(changes[change_type])
+                            for change_type in changes
+                        ),
                         "summary": {
                             "total_regressions": total_regressions,
                             "total_improvements": total_improvements,
@@ -563,13 +702,9 @@ class BenchmarkService:
             )
 
         # Build baseline payload with detector_config
-        baseline_config = (
-            json.loads(baseline_info["config_snapshot"]).get("detector_config")
-            if baseline_info.get("config_snapshot")
-            else None
-        )
+        baseline_config = _parsed_config(baseline_info).get("detector_config")
 
-        return {
+        result = {
             "dataset_info": {
                 "dataset_name": baseline_dataset_name,
                 "dataset_split": baseline_dataset_split,
@@ -583,6 +718,115 @@ class BenchmarkService:
             "candidates": candidates,
         }
 
+        encoded = orjson.dumps(result)
+        await self._database.save_comparison(
+            cache_key, zstandard.ZstdCompressor().compress(encoded)
+        )
+        # Decoded like a cache hit, so both paths return the same plain types
+        return _truncate_sample_changes(orjson.loads(encoded), max_samples_per_bucket)
+
+    async def _validate_comparison_runs(
+        self, baseline_run_id: str, all_run_ids: List[str]
+    ) -> Dict[str, Any]:
+        """
+        Enforce the comparison guardrails on the status of every run.
+
+        A lightweight status query runs first, so invalid comparisons fail
+        before any heavy load.
+
+        Returns:
+            Status row of the baseline run (status, dataset_name, dataset_split).
+
+        Raises:
+            KeyError: If any run is not found.
+            ValueError: If a run is not completed or the datasets differ.
+        """
+        statuses = await self._database.get_runs_status_bulk(all_run_ids)
+        for run_id in all_run_ids:
+            if run_id not in statuses:
+                raise KeyError(f"Benchmark run not found: {run_id}")
+
+        # All runs must be completed
+        incomplete = [
+            run_id for run_id, info in statuses.items() if info.get("status") != "completed"
+        ]
+        if incomplete:
+            raise ValueError(
+                "All benchmarks must be completed before comparison. "
+                f"Non-completed runs: {', '.join(incomplete)}"
+            )
+
+        # All runs must share same dataset_name and dataset_split
+        baseline_status = statuses[baseline_run_id]
+        mismatched = [
+            run_id
+            for run_id, info in statuses.items()
+            if info.get("dataset_name") != baseline_status.get("dataset_name")
+            or info.get("dataset_split") != baseline_status.get("dataset_split")
+        ]
+        if mismatched:
+            raise ValueError(
+                "Cannot compare benchmarks from different datasets or splits. "
+                "All runs must share the same dataset_name and dataset_split."
+            )
+        return baseline_status
+
+    @staticmethod
+    def _comparison_cache_key(baseline_run_id: str, candidate_run_ids: List[str]) -> str:
+        """Hash the inputs that determine a comparison result."""
+        raw = f"{baseline_run_id}|{','.join(candidate_run_ids)}"
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    async def get_sample_changes(
+        self,
+        baseline_run_id: str,
+        candidate_run_id: str,
+        bucket: str,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> Dict[str, Any]:
+        """
+        Page through the samples of one change bucket of a comparison.
+
+        Args:
+            baseline_run_id: Baseline run ID.
+            candidate_run_id: Candidate run ID.
+            bucket: One of `critical`, `new_false_positives`,
+                    `new_detections`, `fixed_false_positives`.
+            limit: Maximum number of samples to return.
+            offset: Number of samples to skip.
+
+        Raises:
+            KeyError: If either run is not found.
+            ValueError: If the bucket name is unknown.
+        """
+        change_type = _BUCKET_CHANGE_TYPES.get(bucket)
+        if change_type is None:
+            raise ValueError(
+                f"Unknown bucket '{bucket}'. Valid buckets: {', '.join(_BUCKET_CHANGE_TYPES)}"
+            )
+
+        async with self._db_semaphore:
+            runs = await self._database.get_runs_status_bulk([baseline_run_id, candidate_run_id])
+            for run_id in (baseline_run_id, candidate_run_id):
+                if run_id not in runs:
+                    raise KeyError(f"Benchmark run not found: {run_id}")
+            total, pairs = await self._database.get_transition_pairs(
+                baseline_run_id,
+                candidate_run_id,
+                _CHANGE_TYPE_TRANSITIONS[change_type],
+                limit=limit,
+                offset=offset,
+            )
+
+        return {
+            "bucket": bucket,
+            "total": total,
+            "limit": limit,
+            "offset": offset,
+            "samples": [_payload(baseline, candidate) for baseline, candidate in pairs],
+        }
+
 
 # Global instance; initialized in startup.
 benchmark_service = BenchmarkService()
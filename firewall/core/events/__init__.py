@@ -1,3 +1,17 @@
-from .standardized import create_standardized_event
-
+from .standardized import (
+    LatencyBreakdown,
+    LatencyMs,
+    PolicyInfo,
+    PreprocessingInfo,
+    StandardizedEvent,
+    create_standardized_event,
+)
 
+__all__ = [
+    "LatencyBreakdown",
+    "LatencyMs",
+    "PolicyInfo",
+    "PreprocessingInfo",
+    "StandardizedEvent",
+    "create_standardized_event",
+]
@@ -1,11 +1,102 @@
-from datetime import datetime
-from typing import Optional, Any
+import time
+from dataclasses import dataclass
+from typing import NamedTuple, Optional, Any
 
 from fast_ml_filter.ml_filter_service import MLSignals
 
 from core.risk import get_risk_level, determine_risk_category
 
 
+# Internal risk levels mapped to the dashboard's standard risk levels
+_RISK_LEVEL_MAP = {
+    "low": "benign",
+    "medium": "suspicious",
+    "high": "suspicious",
+    "critical": "malicious",
+}
+
+# Max characters of prompt/response kept in an event
+_TRUNC = 500
+
+# Fixed key set of the event scores; copying it reuses its key table
+_ScoresTemplate: dict[str, float] = {
+    "prompt_injection": 0.0,
+    "pii": 0.0,
+    "toxicity": 0.0,
+    "heuristic": 0.0,
+}
+
+
+class LatencyBreakdown(NamedTuple):
+    """Latency per firewall stage of a chat request, in milliseconds."""
+
+    preprocessing: float = 0
+    ml_analysis: float = 0
+    policy_eval: float = 0
+    backend: float = 0
+
+
+@dataclass(slots=True, frozen=True)
+class PolicyInfo:
+    """Policy outcome of a request."""
+
+    matched_rule: Optional[str]
+    decision: str  # allow | block
+
+
+@dataclass(slots=True, frozen=True)
+class LatencyMs:
+    """Latency per pipeline stage, in milliseconds."""
+
+    preprocessing: float
+    ml: float
+    policy: float
+    backend: float
+    total: float
+
+
+@dataclass(slots=True, frozen=True)
+class PreprocessingInfo:
+    """Sizes of the preprocessed prompt."""
+
+    original_length: int
+    normalized_length: int
+    word_count: int
+
+
+@dataclass(slots=True, frozen=True)
+class StandardizedEvent:
+    """Standardized request event for the dashboard / WebSocket.
+
+    Serialized to JSON only at the WebSocket boundary (orjson handles
+    dataclasses natively).
+    """
+
+    id: str
+    timestamp: str
+    prompt: str
+    response: str
+    risk_level: str  # benign | suspicious | malicious
+    risk_category: str  # injection | pii | toxicity | leak | harmful | clean
+    scores: dict[str, float]
+    heuristics: list[str]
+    policy: PolicyInfo
+    action: str  # allow | block
+    latency_ms: LatencyMs
+    session_id: Optional[str] = None
+    preprocessing_info: Optional[PreprocessingInfo] = None
+    detector_config: Optional[dict] = None
+    seq: int = 0  # monotonic per process; gaps mean dropped events
+
+
+_NO_LATENCY = LatencyBreakdown()
+
+
+def _utc_timestamp() -> str:
+    """Current UTC time as ISO 8601 with millisecond precision (e.g. `2024-01-01T12:00:00.123Z`)."""
+    now = time.time()
+    return f"{time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(now))}.{int(now % 1 * 1000):03d}Z"
+
 def create_standardized_event(
     request_id: str,
     prompt: str,
@@ -14,12 +105,13 @@ def create_standardized_event(
     ml_signals: MLSignals,
     preprocessed: Any,
     decision: Any,
-    latency_breakdown: dict[str, float],
+    latency_breakdown: Optional[LatencyBreakdown],
     total_latency: float,
     session_id: Optional[str] = None,
     detector_config: Optional[dict] = None,
-) -> dict[str, Any]:
-    """Create a standardized event dictionary for the dashboard / WebSocket.
+    seq: int = 0,
+) -> StandardizedEvent:
+    """Create a standardized event for the dashboard / WebSocket.
 
     Args:
         request_id: Unique request ID
@@ -33,64 +125,51 @@ def create_standardized_event(
         total_latency: Total latency
         session_id: Session ID
         detector_config: Detector configuration
+        seq: Broadcast sequence number
 
     Returns:
-        Standardized event dictionary
+        Standardized event
     """
     risk_level = get_risk_level(ml_signals)
     risk_category = determine_risk_category(ml_signals)
 
-    risk_level_map = {
-        "low": "benign",
-        "medium": "suspicious",
-        "high": "suspicious",
-        "critical": "malicious",
-    }
-    standard_risk_level = risk_level_map.get(risk_level, "benign")
-
-    scores = {
-        "prompt_injection": getattr(ml_signals, "prompt_injection_score", 0.0),
-        "pii": getattr(ml_signals, "pii_score", 0.0),
-        "toxicity": getattr(ml_signals, "toxicity_score", 0.0),
-        "heuristic": 1.0 if ml_signals.heuristic_blocked else 0.0,
-    }
-
-    heuristics = []
-    if ml_signals.heuristic_blocked:
-        heuristics.append("heuristic_match")
-
-    event = {
-        "id": request_id,
-        "timestamp": datetime.utcnow().isoformat() + "Z",
-        "prompt": prompt[:500] if len(prompt) > 500 else prompt,
-        "response": response[:500] if len(response) > 500 else response,
-        "risk_level": standard_risk_level,
-        "risk_category": risk_category,
-        "scores": scores,
-        "heuristics": heuristics,
-        "policy": {
-            "matched_rule": decision.matched_rule if decision else None,
-            "decision": "block" if blocked else "allow",
-        },
-        "action": "block" if blocked else "allow",
-        "latency_ms": {
-            "preprocessing": latency_breakdown.get("preprocessing", 0),
-            "ml": latency_breakdown.get("ml_analysis", 0),
-            "policy": latency_breakdown.get("policy_eval", 0),
-            "backend": latency_breakdown.get("backend", 0),
-            "total": total_latency,
-        },
-        "session_id": session_id,
-        "preprocessing_info": {
-            "original_length": len(preprocessed.original_text) if preprocessed else 0,
-            "normalized_length": len(preprocessed.normalized_text) if preprocessed else 0,
-            "word_count": preprocessed.features.get("word_count", 0) if preprocessed else 0,
-        }
-        if preprocessed
-        else None,
-        "detector_config": detector_config,
-    }
-
-    return event
+    standard_risk_level = _RISK_LEVEL_MAP.get(risk_level, "benign")
+
+    heuristic_blocked = ml_signals.heuristic_blocked
+    scores = _ScoresTemplate.copy()
+    scores["prompt_injection"] = ml_signals.prompt_injection_score
+    scores["pii"] = ml_signals.pii_score
+    scores["toxicity"] = ml_signals.toxicity_score
+    if heuristic_blocked:
+        scores["heuristic"] = 1.0
+
+    heuristics = ["heuristic_match"] if heuristic_blocked else []
 
+    if preprocessed:
+        preprocessing_info = PreprocessingInfo(
+            len(preprocessed.original_text),
+            len(preprocessed.normalized_text),
+            preprocessed.features.get("word_count", 0),
+        )
+    else:
+        preprocessing_info = None
+    action = "block" if blocked else "allow"
 
+    # Positional arguments, in field order
+    return StandardizedEvent(
+        request_id,
+        _utc_timestamp(),
+        prompt[:_TRUNC],
+        response[:_TRUNC],
+        standard_risk_level,
+        risk_category,
+        scores,
+        heuristics,
+        PolicyInfo(decision.matched_rule if decision else None, action),
+        action,
+        LatencyMs(*(latency_breakdown or _NO_LATENCY), total_latency),
+        session_id,
+        preprocessing_info,
+        detector_config,
+        seq,
+    )
@@ -1,3 +1,15 @@
-from .factory import create_gateway_orchestrator, get_default_gateway
-
+from .factory import (
+    aclose_gateways,
+    clear_gateway_cache,
+    create_gateway_orchestrator,
+    get_default_gateway,
+    get_gateway,
+)
 
+__all__ = [
+    "aclose_gateways",
+    "clear_gateway_cache",
+    "create_gateway_orchestrator",
+    "get_default_gateway",
+    "get_gateway",
+]
@@ -1,14 +1,29 @@
+import itertools
+import logging
 from typing import Any, Dict, Optional
-from core.events import create_standardized_event
+
+import orjson
+
+from core.events import LatencyBreakdown, create_standardized_event
 from core.metrics import metrics_service
-from core.realtime import event_queue
+from core.realtime import events_queue
+
+
+logger = logging.getLogger(__name__)
+
+# Event encoder (orjson serializes the slotted event dataclasses natively)
+_encode_event = orjson.dumps
+
+# Sequence numbers of the dashboard events, so clients can detect the gaps
+# left by events dropped from the full realtime queue
+_event_seq = itertools.count(1)
 
 
 class EventBroadcaster:
     """Manages the creation and broadcasting of standardized events."""
     
     @staticmethod
-    async def create_and_broadcast_event(
+    def schedule_broadcast(
         request_id: str,
         prompt: str,
         response_text: str,
@@ -16,15 +31,23 @@ class EventBroadcaster:
         ml_signals: Any,
         preprocessed: Any,
         decision: Any,
-        latency_breakdown: Dict[str, float],
+        latency_breakdown: Optional[LatencyBreakdown],
         total_latency: float,
         detector_config: Optional[Dict] = None,
         session_id: Optional[str] = None,
     ) -> None:
-        """Create a standardized event and broadcast it."""
+        """
+        Create a standardized event and queue it for the WebSocket clients.
+
+        Everything here is synchronous and non-blocking: the event is
+        registered in the metrics service, encoded to JSON once (every
+        subscriber receives the same payload) and put on the bounded realtime
+        queue, dropping the oldest event when it is full. The HTTP response
+        never waits on a dashboard client.
+        """
         if not ml_signals:
             return
-        
+
         event = create_standardized_event(
             request_id=request_id,
             prompt=prompt,
@@ -37,11 +60,7 @@ class EventBroadcaster:
             total_latency=total_latency,
             session_id=session_id,
             detector_config=detector_config,
+            seq=next(_event_seq),
         )
-        
-        # Add to metrics service
         metrics_service.add_request(event)
-        
-        # Broadcast to WebSocket clients
-        if event_queue:
-            await event_queue.put(event)
+        events_queue.enqueue_event(_encode_event(event))
@@ -1,9 +1,16 @@
+import os
+from operator import itemgetter
 from typing import Any
+
 from core.request_context import RequestContext
-import os
 
 TENANT_ID = os.getenv("TENANT_ID", "default")
 
+# Fetches every header used by the context in a single call
+_context_headers = itemgetter(
+    "user_id", "session_id", "device", "temperature", "max_tokens", "turn_count", "rate_limit"
+)
+
 
 class RequestContextBuilder:
     """Build the request context."""
@@ -15,16 +22,18 @@ class RequestContextBuilder:
         endpoint: str = "/api/chat"
     ) -> RequestContext:
         """Build a RequestContext from extracted headers."""
+        user_id, session_id, device, temperature, max_tokens, turn_count, rate_limit = (
+            _context_headers(headers)
+        )
         return RequestContext(
             request_id=request_id,
-            user_id=headers["user_id"],
-            session_id=headers["session_id"],
+            user_id=user_id,
+            session_id=session_id,
             tenant_id=TENANT_ID,
             endpoint=endpoint,
-            device=headers["device"],
-            temperature=headers["temperature"],
-            max_tokens=headers["max_tokens"],
-            turn_count=headers["turn_count"],
-            rate_limit_remaining=headers["rate_limit"],
+            device=device,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            turn_count=turn_count,
+            rate_limit_remaining=rate_limit,
         )
-
@@ -1,28 +1,62 @@
 # chat_service.py - Versión Refactorizada
 
+import asyncio
+import itertools
+import os
 import time
-import uuid
 import logging
-from typing import Optional, Dict, Any
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, NoReturn, Optional, Tuple
 
 from fastapi import HTTPException, Request, status
 from core.gateway.extractors import RequestHeaderExtractor, MetricsExtractor
 from core.gateway.builders import RequestContextBuilder
 from core.exceptions import BackendError, ContentBlockedException, FirewallException
-from core.gateway import create_gateway_orchestrator, get_default_gateway
+from core.orchestrator import FirewallOrchestrator
+from core.gateway import get_default_gateway, get_gateway
 from core.api_models import (
     ChatRequest,
     ChatResponse,
 )
+from core.events import LatencyBreakdown
 from core.gateway.broadcaster import EventBroadcaster
+from core.logging_ctx import request_id_ctx
 
 
 logger = logging.getLogger(__name__)
 
+# Build the chat response (metric extraction + models) in a worker thread.
+# Off by default: the build takes well under the cost of a thread hop; enable
+# it only when profiling shows large responses holding the event loop
+OFFLOAD_RESPONSE_BUILD = os.getenv("CHAT_OFFLOAD_RESPONSE_BUILD", "false").lower() == "true"
+
+# Request IDs: a random per-process prefix plus a counter, unique across
+# workers and restarts without reading the OS entropy pool on every request
+_id_prefix = os.urandom(6).hex()
+_id_counter = itertools.count()
+
+
+def _reset_request_ids() -> None:
+    """Draw a new ID prefix and counter (forked workers must not share them)."""
+    global _id_prefix, _id_counter
+    _id_prefix = os.urandom(6).hex()
+    _id_counter = itertools.count()
+
+
+os.register_at_fork(after_in_child=_reset_request_ids)
+
+
+@dataclass(slots=True, frozen=True)
+class _BlockedDecision:
+    """Minimal policy decision for events of requests blocked by policies."""
+
+    matched_rule: Optional[str] = None
+    confidence: float = 0.9
+
 
 class ChatService:
     """Main service for processing chat requests."""
-    
+
     def __init__(
         self,
         header_extractor: RequestHeaderExtractor,
@@ -35,12 +69,12 @@ class ChatService:
         self.context_builder = context_builder
         self.metrics_extractor = metrics_extractor
         self.event_broadcaster = event_broadcaster
-    
+
     @staticmethod
     def _generate_request_id() -> str:
-        """Generate a unique ID for the request."""
-        return str(uuid.uuid4())
-    
+        """Generate a unique ID for the request (22 hex characters)."""
+        return f"{_id_prefix}{next(_id_counter):010x}"
+
     async def process_request(
         self,
         payload: ChatRequest,
@@ -48,7 +82,7 @@ class ChatService:
     ) -> ChatResponse:
         """
         Process a complete chat request.
-        
+
         Orchestrates the complete flow of:
         - Building the context
         - Processing through the firewall
@@ -56,18 +90,21 @@ class ChatService:
         - Broadcasting events
         """
         request_id = self._generate_request_id()
-        request_start_time = time.time()
-        
-        logger.info("[%s] New chat request: %s...", request_id, payload.message[:50])
-        
+        request_start_ns = time.perf_counter_ns()
+        # Every log record of this request carries its ID (see core.logging_ctx)
+        request_id_ctx.set(request_id)
+
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("New chat request: %s...", payload.message[:50])
+
         # Extract headers and build context
         headers = self.header_extractor.extract(request)
         context = self.context_builder.build(request_id, headers)
-        
+
         try:
             # Get firewall/orchestrator
             firewall = self._get_firewall(payload.detector_config)
-            
+
             # Process through firewall
             response = await firewall.process_chat_request(
                 message=payload.message,
@@ -75,9 +112,9 @@ class ChatService:
                 analyze_egress=False,
                 context=context,
             )
-            
-            total_latency = (time.time() - request_start_time) * 1000
-            
+
+            total_latency = (time.perf_counter_ns() - request_start_ns) / 1e6
+
             # Handle successful response
             return await self._handle_success_response(
                 response=response,
@@ -85,30 +122,31 @@ class ChatService:
                 request_id=request_id,
                 total_latency=total_latency,
             )
-        
+
         except ContentBlockedException as exc:
             return await self._handle_blocked_request(
                 exc=exc,
                 payload=payload,
                 request_id=request_id,
-                request_start_time=request_start_time,
+                request_start_ns=request_start_ns,
             )
-        
+
         except BackendError as exc:
-            self._handle_backend_error(request_id, exc)
-        
+            self._handle_backend_error(exc)
+
         except FirewallException as exc:
-            self._handle_firewall_error(request_id, exc)
-        
+            self._handle_firewall_error(exc)
+
         except Exception as exc:
-            self._handle_unexpected_error(request_id, exc)
-    
-    def _get_firewall(self, detector_config: Optional[Dict]):
+            self._handle_unexpected_error(exc)
+
+    def _get_firewall(self, detector_config: Optional[Dict]) -> FirewallOrchestrator:
         """Get the appropriate firewall based on the configuration."""
         if detector_config:
-            return create_gateway_orchestrator(model_config=detector_config)
+            # Identical configs share the same orchestrator
+            return get_gateway(detector_config)
         return get_default_gateway()
-    
+
     async def _handle_success_response(
         self,
         response: Dict[str, Any],
@@ -117,21 +155,18 @@ class ChatService:
         total_latency: float,
     ) -> ChatResponse:
         """Handles a successful firewall response."""
-        # Extract metrics
-        ml_metrics, preprocessing_metrics, policy_metrics, latency_breakdown = (
-            self.metrics_extractor.extract_from_response(
-                response, payload.detector_config
-            )
+        chat_response, latency_breakdown = await self._build(
+            self._build_success_response, response, payload, total_latency
         )
-        
+
         # Create and broadcast event
         metrics = response.get("metrics", {})
         ml_signals = metrics.get("ml_signals")
         preprocessed = metrics.get("preprocessed")
         decision = metrics.get("decision")
-        
+
         if ml_signals and preprocessed and decision:
-            await self.event_broadcaster.create_and_broadcast_event(
+            self.event_broadcaster.schedule_broadcast(
                 request_id=request_id,
                 prompt=payload.message,
                 response_text=response.get("reply", ""),
@@ -143,83 +178,125 @@ class ChatService:
                 total_latency=total_latency,
                 detector_config=payload.detector_config,
             )
-        
-        return ChatResponse(
-            blocked=False,
-            reply=response.get("reply"),
-            ml_detectors=ml_metrics,
-            preprocessing=preprocessing_metrics,
-            policy=policy_metrics,
-            latency_breakdown=latency_breakdown,
-            total_latency_ms=total_latency,
-        )
-    
+
+        return chat_response
+
     async def _handle_blocked_request(
         self,
         exc: ContentBlockedException,
         payload: ChatRequest,
         request_id: str,
-        request_start_time: float,
+        request_start_ns: int,
     ) -> ChatResponse:
         """Handles a request blocked by policies."""
-        total_latency = (time.time() - request_start_time) * 1000
-        logger.warning("[%s] Blocked by policies: %s", request_id, exc.reason)
-        
-        # Extract metrics
-        ml_metrics, preprocessing_metrics, policy_metrics, latency_breakdown = (
-            self.metrics_extractor.extract_from_exception(exc, payload.detector_config)
+        total_latency = (time.perf_counter_ns() - request_start_ns) / 1e6
+        logger.warning("Blocked by policies: %s", exc.reason)
+
+        chat_response, latency_breakdown = await self._build(
+            self._build_blocked_response, exc, payload, total_latency
         )
-        
+
         # Create and broadcast event
-        ml_signals = getattr(exc, "ml_signals", None)
+        ml_signals = exc.ml_signals
         if ml_signals:
-            # Create a simple decision object for blocked requests
-            decision = type("Decision", (), {
-                "matched_rule": exc.details.get("matched_rule")
-            })()
-            
-            await self.event_broadcaster.create_and_broadcast_event(
+            decision = _BlockedDecision(
+                exc.details.get("matched_rule"), exc.details.get("confidence", 0.9)
+            )
+
+            self.event_broadcaster.schedule_broadcast(
                 request_id=request_id,
                 prompt=payload.message,
                 response_text=exc.reason,
                 blocked=True,
                 ml_signals=ml_signals,
-                preprocessed=getattr(exc, "preprocessed", None),
+                preprocessed=exc.preprocessed,
                 decision=decision,
                 latency_breakdown=latency_breakdown,
                 total_latency=total_latency,
                 detector_config=payload.detector_config,
             )
-        
-        return ChatResponse(
+
+        return chat_response
+
+    @staticmethod
+    async def _build(
+        build: Callable[..., Tuple[ChatResponse, Optional[LatencyBreakdown]]],
+        *args: Any,
+    ) -> Tuple[ChatResponse, Optional[LatencyBreakdown]]:
+        """
+        Run a synchronous response builder, off the event loop if enabled.
+
+        The builders only do CPU work (metric extraction and model
+        construction); the event broadcast stays on the loop because the
+        broadcaster is not thread-safe.
+        """
+        if OFFLOAD_RESPONSE_BUILD:
+            return await asyncio.to_thread(build, *args)
+        return build(*args)
+
+    def _build_success_response(
+        self,
+        response: Dict[str, Any],
+        payload: ChatRequest,
+        total_latency: float,
+    ) -> Tuple[ChatResponse, Optional[LatencyBreakdown]]:
+        """Build the response of an allowed request and its latency breakdown."""
+        ml_metrics, preprocessing_metrics, policy_metrics, latency_breakdown = (
+            self.metrics_extractor.extract_from_response(
+                response, payload.detector_config
+            )
+        )
+        chat_response = ChatResponse(
+            blocked=False,
+            reply=response.get("reply"),
+            ml_detectors=ml_metrics,
+            preprocessing=preprocessing_metrics,
+            policy=policy_metrics,
+            latency_breakdown=latency_breakdown._asdict() if latency_breakdown else {},
+            total_latency_ms=total_latency,
+        )
+        return chat_response, latency_breakdown
+
+    def _build_blocked_response(
+        self,
+        exc: ContentBlockedException,
+        payload: ChatRequest,
+        total_latency: float,
+    ) -> Tuple[ChatResponse, Optional[LatencyBreakdown]]:
+        """Build the response of a blocked request and its latency breakdown."""
+        ml_metrics, preprocessing_metrics, policy_metrics, latency_breakdown = (
+            self.metrics_extractor.extract_from_exception(exc, payload.detector_config)
+        )
+        chat_response = ChatResponse(
             blocked=True,
             reason=exc.reason,
             ml_detectors=ml_metrics,
             preprocessing=preprocessing_metrics,
             policy=policy_metrics,
-            latency_breakdown=latency_breakdown,
+            latency_breakdown=latency_breakdown._asdict() if latency_breakdown else {},
             total_latency_ms=total_latency,
         )
-    
-    def _handle_backend_error(self, request_id: str, exc: BackendError):
+        return chat_response, latency_breakdown
+
+    def _handle_backend_error(self, exc: BackendError) -> NoReturn:
         """Handles backend errors."""
-        logger.error("[%s] Backend error: %s", request_id, exc.message)
+        logger.error("Backend error: %s", exc.message)
         raise HTTPException(
             status_code=status.HTTP_502_BAD_GATEWAY,
             detail=f"Error communicating with the backend: {exc.message}",
         ) from exc
-    
-    def _handle_firewall_error(self, request_id: str, exc: FirewallException):
+
+    def _handle_firewall_error(self, exc: FirewallException) -> NoReturn:
         """Handles firewall errors."""
-        logger.error("[%s] Firewall error: %s", request_id, exc.message)
+        logger.error("Firewall error: %s", exc.message)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Internal firewall error: {exc.message}",
         ) from exc
-    
-    def _handle_unexpected_error(self, request_id: str, exc: Exception):
+
+    def _handle_unexpected_error(self, exc: Exception) -> NoReturn:
         """Handles unexpected errors."""
-        logger.exception("[%s] Unexpected error: %s", request_id, exc)
+        logger.exception("Unexpected error: %s", exc)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal server error",
@@ -242,7 +319,7 @@ _chat_service = create_chat_service()
 async def process_chat_request(payload: ChatRequest, request: Request) -> ChatResponse:
     """
     Process a complete chat request.
-    
+
     This function maintains the public interface for compatibility.
     """
     return await _chat_service.process_request(payload, request)
\ No newline at end of file
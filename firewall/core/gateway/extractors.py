@@ -1,8 +1,7 @@
-from fastapi import Request
-from typing import Any
 from typing import Optional, Dict, Any, Tuple
 
 from fastapi import Request
+from core.events import LatencyBreakdown
 from core.exceptions import ContentBlockedException
 from core.risk import get_risk_level
 from core.metrics.adapter import extract_ml_metrics
@@ -32,23 +31,65 @@ class DefaultValues:
     RATE_LIMIT = 0
 
 
+# Raw (lowercase, bytes) header name -> context field, as stored in the ASGI scope
+_HEADER_FIELDS = {
+    HeaderKeys.USER_ID.lower().encode("latin-1"): "user_id",
+    HeaderKeys.SESSION_ID.lower().encode("latin-1"): "session_id",
+    HeaderKeys.USER_AGENT.lower().encode("latin-1"): "device",
+    HeaderKeys.TEMPERATURE.lower().encode("latin-1"): "temperature",
+    HeaderKeys.MAX_TOKENS.lower().encode("latin-1"): "max_tokens",
+    HeaderKeys.TURN_COUNT.lower().encode("latin-1"): "turn_count",
+    HeaderKeys.RATE_LIMIT.lower().encode("latin-1"): "rate_limit",
+}
+
+_HEADER_DEFAULTS = {
+    "user_id": DefaultValues.USER_ID,
+    "session_id": DefaultValues.SESSION_ID,
+    "device": DefaultValues.DEVICE,
+    "temperature": DefaultValues.TEMPERATURE,
+    "max_tokens": DefaultValues.MAX_TOKENS,
+    "turn_count": DefaultValues.TURN_COUNT,
+    "rate_limit": DefaultValues.RATE_LIMIT,
+}
+
+# Fields whose default also replaces an empty header value
+_DEFAULT_IF_EMPTY = frozenset({"user_id", "session_id"})
+
+
 class RequestHeaderExtractor:
     """Extract and validate HTTP request headers."""
     
     @staticmethod
     def extract(request: Request) -> dict[str, Any]:
-        """Extract all necessary headers with default values."""
-        return {
-            "user_id": request.headers.get(HeaderKeys.USER_ID) or DefaultValues.USER_ID,
-            "session_id": request.headers.get(HeaderKeys.SESSION_ID) or DefaultValues.SESSION_ID,
-            "device": request.headers.get(HeaderKeys.USER_AGENT, DefaultValues.DEVICE),
-            "temperature": request.headers.get(HeaderKeys.TEMPERATURE, DefaultValues.TEMPERATURE),
-            "max_tokens": request.headers.get(HeaderKeys.MAX_TOKENS, DefaultValues.MAX_TOKENS),
-            "turn_count": request.headers.get(HeaderKeys.TURN_COUNT, DefaultValues.TURN_COUNT),
-            "rate_limit": request.headers.get(HeaderKeys.RATE_LIMIT, DefaultValues.RATE_LIMIT),
-        }
+        """
+        Extract all necessary headers with default values.
 
+        Scans the raw ASGI headers once instead of one `request.headers.get`
+        (a linear scan each) per header. They are scanned in reverse so the
+        first occurrence of a repeated header wins, as with `headers.get`.
+        """
+        headers = _HEADER_DEFAULTS.copy()
+        for name, value in reversed(request.scope["headers"]):
+            field = _HEADER_FIELDS.get(name)
+            if field is not None and (value or field not in _DEFAULT_IF_EMPTY):
+                headers[field] = value.decode("latin-1")
+        return headers
+
+
+def _build_preprocessing_metrics(preprocessed: Any) -> PreprocessingMetrics:
+    """
+    Build the preprocessing metrics of a preprocessed text.
 
+    The values come from our own preprocessor, so `model_construct` skips
+    their validation.
+    """
+    original_length = len(preprocessed.original_text)
+    return PreprocessingMetrics.model_construct(
+        original_length=original_length,
+        normalized_length=len(preprocessed.normalized_text),
+        word_count=preprocessed.features.get("word_count", 0),
+        char_count=original_length,
+    )
 
 
 class MetricsExtractor:
@@ -58,7 +99,7 @@ class MetricsExtractor:
     def extract_from_response(
         response: Dict[str, Any],
         detector_config: Optional[Dict] = None
-    ) -> Tuple[list, Optional[PreprocessingMetrics], Optional[PolicyMetrics], Dict[str, float]]:
+    ) -> Tuple[list, Optional[PreprocessingMetrics], Optional[PolicyMetrics], Optional[LatencyBreakdown]]:
         """
         Extract all metrics from a successful response.
         
@@ -68,7 +109,7 @@ class MetricsExtractor:
         ml_metrics = []
         preprocessing_metrics = None
         policy_metrics = None
-        latency_breakdown = {}
+        latency_breakdown = None
         
         metrics = response.get("metrics", {})
         ml_signals = metrics.get("ml_signals")
@@ -77,26 +118,21 @@ class MetricsExtractor:
         
         if ml_signals:
             ml_metrics = extract_ml_metrics(ml_signals, detector_config=detector_config)
-            policy_metrics = PolicyMetrics(
+            policy_metrics = PolicyMetrics.model_construct(
                 matched_rule=decision.matched_rule if decision else None,
                 confidence=decision.confidence if decision else 0.5,
                 risk_level=get_risk_level(ml_signals),
             )
         
         if preprocessed:
-            preprocessing_metrics = PreprocessingMetrics(
-                original_length=len(preprocessed.original_text),
-                normalized_length=len(preprocessed.normalized_text),
-                word_count=preprocessed.features.get("word_count", 0),
-                char_count=len(preprocessed.original_text),
-            )
+            preprocessing_metrics = _build_preprocessing_metrics(preprocessed)
         
-        latency_breakdown = {
-            "preprocessing": metrics.get("preprocessing_latency_ms", 0),
-            "ml_analysis": ml_signals.latency_ms if ml_signals else 0,
-            "policy_eval": metrics.get("policy_latency_ms", 0),
-            "backend": response.get("backend_latency_ms", 0),
-        }
+        latency_breakdown = LatencyBreakdown(
+            metrics.get("preprocessing_latency_ms", 0),
+            ml_signals.latency_ms if ml_signals else 0,
+            metrics.get("policy_latency_ms", 0),
+            response.get("backend_latency_ms", 0),
+        )
         
         return ml_metrics, preprocessing_metrics, policy_metrics, latency_breakdown
     
@@ -104,7 +140,7 @@ class MetricsExtractor:
     def extract_from_exception(
         exc: ContentBlockedException,
         detector_config: Optional[Dict] = None
-    ) -> Tuple[list, Optional[PreprocessingMetrics], Optional[PolicyMetrics], Dict[str, float]]:
+    ) -> Tuple[list, Optional[PreprocessingMetrics], Optional[PolicyMetrics], Optional[LatencyBreakdown]]:
         """
         Extract metrics from a ContentBlockedException.
         
@@ -114,30 +150,20 @@ class MetricsExtractor:
         ml_metrics = []
         preprocessing_metrics = None
         policy_metrics = None
-        latency_breakdown = {}
+        latency_breakdown = None
         
-        ml_signals = getattr(exc, "ml_signals", None)
+        ml_signals = exc.ml_signals
         
         if ml_signals:
             ml_metrics = extract_ml_metrics(ml_signals, detector_config=detector_config)
-            policy_metrics = PolicyMetrics(
+            policy_metrics = PolicyMetrics.model_construct(
                 matched_rule=exc.details.get("matched_rule"),
                 confidence=exc.details.get("confidence", 0.9),
                 risk_level=get_risk_level(ml_signals),
             )
-            latency_breakdown = {
-                "preprocessing": 0,
-                "ml_analysis": ml_signals.latency_ms,
-                "policy_eval": 0,
-                "backend": 0,
-            }
+            latency_breakdown = LatencyBreakdown(ml_analysis=ml_signals.latency_ms)
         
-        if hasattr(exc, "preprocessed") and exc.preprocessed:
-            preprocessing_metrics = PreprocessingMetrics(
-                original_length=len(exc.preprocessed.original_text),
-                normalized_length=len(exc.preprocessed.normalized_text),
-                word_count=exc.preprocessed.features.get("word_count", 0),
-                char_count=len(exc.preprocessed.original_text),
-            )
+        if exc.preprocessed:
+            preprocessing_metrics = _build_preprocessing_metrics(exc.preprocessed)
         
         return ml_metrics, preprocessing_metrics, policy_metrics, latency_breakdown
@@ -1,27 +1,49 @@
+import asyncio
 import os
+import weakref
+from collections import OrderedDict
+from functools import lru_cache
 from typing import Optional
 
-from container import FirewallContainer
+from core.analysis_cache import AnalysisCache
 from core.analyzer import FirewallAnalyzer
 from core.backend_proxy import BackendProxyService
 from core.orchestrator import FirewallOrchestrator
-from fast_ml_filter.ml_filter_service import MLFilterService
-
-
-_BACKEND_URL_DEFAULT = "http://backend:8000"
-_TENANT_ID_DEFAULT = "default"
-
-
-# Shared container to build the components of the gateway/firewall
-_container = FirewallContainer()
-
-
-def _get_backend_url() -> str:
-    return os.getenv("BACKEND_URL", _BACKEND_URL_DEFAULT)
-
-
-def _get_tenant_id() -> str:
-    return os.getenv("TENANT_ID", _TENANT_ID_DEFAULT)
+from core.gateway.factory_cache import create_ml_filter_service
+from fast_ml_filter.ml_batcher import MLFilterBatcher
+from services import (
+    get_config,
+    get_heuristic_detector,
+    get_ml_filter_service,
+    get_orchestrator_service,
+    get_policy_service,
+    get_preprocessor_service,
+)
+
+
+# Resolved once at import; the environment does not change at runtime
+BACKEND_URL = os.getenv("BACKEND_URL", "http://backend:8000")
+TENANT_ID = os.getenv("TENANT_ID", "default")
+# Call the backend while the ingress analysis runs (see FirewallOrchestrator)
+SPECULATIVE_BACKEND = os.getenv("FIREWALL_SPECULATIVE_BACKEND", "false").lower() == "true"
+# Per-gateway cache of analyses (0 entries disables it)
+ANALYSIS_CACHE_SIZE = int(os.getenv("FIREWALL_ANALYSIS_CACHE_SIZE", "10000"))
+ANALYSIS_CACHE_TTL = float(os.getenv("FIREWALL_ANALYSIS_CACHE_TTL", "300"))
+# Backend replies shorter than this skip the egress analysis
+MIN_EGRESS_LENGTH = int(os.getenv("FIREWALL_MIN_EGRESS_LENGTH", "8"))
+
+# Gateways kept by `get_gateway`, least recently used first
+GATEWAY_CACHE_SIZE = 32
+
+# Every orchestrator built here, so a reload can clear their analysis caches
+# (requests in flight may still hold a gateway dropped from the cache)
+_orchestrators: "weakref.WeakSet[FirewallOrchestrator]" = weakref.WeakSet()
+# Batcher of each orchestrator, closed when the gateway is dropped: its
+# worker task would otherwise keep running and keep the detectors alive
+_batchers: "weakref.WeakKeyDictionary[FirewallOrchestrator, MLFilterBatcher]" = (
+    weakref.WeakKeyDictionary()
+)
+_gateways: "OrderedDict[tuple, FirewallOrchestrator]" = OrderedDict()
 
 
 def create_gateway_orchestrator(
@@ -42,38 +64,145 @@ def create_gateway_orchestrator(
         backend_url: Backend URL; if None, taken from env `BACKEND_URL`.
         tenant_id: Tenant ID; if None, taken from env `TENANT_ID`.
     """
-    backend_url = backend_url or _get_backend_url()
-    tenant_id = tenant_id or _get_tenant_id()
+    backend_url = backend_url or BACKEND_URL
+    tenant_id = tenant_id or TENANT_ID
 
-    # Create ML filter service with the specified models or using the ones from the container
+    # Create ML filter service with the specified models or using the default ones
     if model_config:
-        ml_filter = MLFilterService.create_with_models(model_config=model_config)
+        ml_filter = create_ml_filter_service(model_config)
     else:
-        ml_filter = _container.ml_filter_service()
+        ml_filter = get_ml_filter_service()
+
+    # Coalesce concurrent requests into batched detector calls
+    ml_config = get_config().ml
+    batcher = None
+    if ml_config.batch_max_size > 1:
+        ml_filter = batcher = MLFilterBatcher(
+            ml_filter,
+            max_batch_size=ml_config.batch_max_size,
+            max_delay_ms=ml_config.batch_max_delay_ms,
+        )
 
     analyzer = FirewallAnalyzer(
-        preprocessor=_container.preprocessor_service(),
+        preprocessor=get_preprocessor_service(),
         ml_filter=ml_filter,
-        policy_engine=_container.policy_service(),
+        policy_engine=get_policy_service(),
         tenant_id=tenant_id,
     )
 
     proxy = BackendProxyService(backend_url=backend_url, timeout=30.0)
 
-    orchestrator = _container.orchestrator_service()
+    orchestrator = get_orchestrator_service()
 
-    return FirewallOrchestrator(
+    firewall = FirewallOrchestrator(
         analyzer=analyzer,
         proxy=proxy,
         orchestrator=orchestrator,
+        speculative_backend=SPECULATIVE_BACKEND,
+        analysis_cache=(
+            AnalysisCache(max_size=ANALYSIS_CACHE_SIZE, ttl_seconds=ANALYSIS_CACHE_TTL)
+            if ANALYSIS_CACHE_SIZE > 0
+            else None
+        ),
+        min_egress_length=MIN_EGRESS_LENGTH,
     )
+    _orchestrators.add(firewall)
+    if batcher is not None:
+        _batchers[firewall] = batcher
+    return firewall
 
 
-def get_default_gateway() -> FirewallOrchestrator:
+def _cached_gateway(
+    config_items: tuple[tuple[str, str], ...],
+    backend_url: Optional[str],
+    tenant_id: Optional[str],
+) -> FirewallOrchestrator:
+    """Return the cached gateway of a configuration, building it on a miss."""
+    key = (config_items, backend_url, tenant_id)
+    firewall = _gateways.get(key)
+    if firewall is not None:
+        _gateways.move_to_end(key)
+        return firewall
+    firewall = _gateways[key] = create_gateway_orchestrator(
+        model_config=dict(config_items),
+        backend_url=backend_url,
+        tenant_id=tenant_id,
+    )
+    if len(_gateways) > GATEWAY_CACHE_SIZE:
+        _, evicted = _gateways.popitem(last=False)
+        _close_batcher(evicted)
+    return firewall
+
+
+def _close_batcher(firewall: FirewallOrchestrator) -> None:
+    """Stop the batch worker of a dropped gateway."""
+    batcher = _batchers.pop(firewall, None)
+    if batcher is not None:
+        batcher.close()
+
+
+def get_gateway(
+    model_config: Optional[dict] = None,
+    backend_url: Optional[str] = None,
+    tenant_id: Optional[str] = None,
+) -> FirewallOrchestrator:
     """
-    Get a `FirewallOrchestrator` using default configuration
-    (environment variables and the global container).
+    Get a shared `FirewallOrchestrator` for the given configuration.
+
+    Orchestrators are stateless per request, so identical configurations
+    reuse the same instance instead of rebuilding the analyzer, proxy and
+    ML filter on every request.
     """
+    config_items = tuple(sorted(model_config.items())) if model_config else ()
+    return _cached_gateway(config_items, backend_url, tenant_id)
+
+
+def clear_gateway_cache() -> None:
+    """
+    Drop the cached gateways and every cached analysis.
+
+    The next request builds a new gateway, which loads the current detectors
+    and policies; cached analyses made with the old ones are discarded.
+    The heuristic detector reads its rules file when built, so it is
+    rebuilt too.
+    """
+    get_heuristic_detector.cache_clear()
+    dropped = _drop_gateways()
+    for firewall in dropped:
+        _close_batcher(firewall)
+    for firewall in list(_orchestrators):
+        firewall.clear_analysis_cache()
+
+
+async def aclose_gateways() -> None:
+    """Drop every cached gateway and wait for their batch workers to stop (shutdown)."""
+    batchers = [_batchers.pop(firewall, None) for firewall in _drop_gateways()]
+    await asyncio.gather(
+        *(batcher.aclose() for batcher in batchers if batcher is not None)
+    )
+
+
+def _drop_gateways() -> list[FirewallOrchestrator]:
+    """Empty the gateway caches, including the default gateway, and return the dropped gateways."""
+    dropped = list(_gateways.values())
+    _gateways.clear()
+    if _default_gateway.cache_info().currsize:
+        dropped.append(_default_gateway())
+        _default_gateway.cache_clear()
+    return dropped
+
+
+@lru_cache(maxsize=1)
+def _default_gateway() -> FirewallOrchestrator:
     return create_gateway_orchestrator()
 
 
+def get_default_gateway() -> FirewallOrchestrator:
+    """
+    Get the shared `FirewallOrchestrator` using default configuration
+    (environment variables and the shared services).
+
+    Cached on its own, so gateways of other configurations never evict it;
+    only `clear_gateway_cache` replaces it.
+    """
+    return _default_gateway()
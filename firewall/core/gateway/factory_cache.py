@@ -0,0 +1,81 @@
+"""
+Process-wide detectors built through a single `DetectorFactory`.
+
+Getters are cached per backend name, so once the warm-up (or the first
+request) has loaded a model, later gateways and benchmark runs reuse the
+same warmed instance without building a new factory (and configuration)
+or going through the factory cache lookup again.
+"""
+
+from functools import lru_cache
+from typing import Dict, Optional
+
+from fast_ml_filter.detector_factory import DetectorFactory
+from fast_ml_filter.ml_filter_service import MLFilterService
+from fast_ml_filter.ports.heuristic_detector_port import IHeuristicDetector
+from fast_ml_filter.ports.pii_detector_port import IPIIDetector
+from fast_ml_filter.ports.prompt_injection_detector_port import IPromptInjectionDetector
+from fast_ml_filter.ports.toxicity_detector_port import IToxicityDetector
+from services import get_config
+
+
+@lru_cache(maxsize=1)
+def get_factory() -> DetectorFactory:
+    return DetectorFactory(config=get_config())
+
+
+@lru_cache(maxsize=None)
+def get_pii(backend: Optional[str] = None) -> IPIIDetector:
+    return get_factory().create_pii_detector(backend)
+
+
+@lru_cache(maxsize=None)
+def get_toxicity(backend: Optional[str] = None) -> IToxicityDetector:
+    return get_factory().create_toxicity_detector(backend)
+
+
+@lru_cache(maxsize=None)
+def get_prompt_injection(backend: Optional[str] = None) -> IPromptInjectionDetector:
+    return get_factory().create_prompt_injection_detector(backend)
+
+
+@lru_cache(maxsize=1)
+def get_heuristic() -> IHeuristicDetector:
+    return get_factory().create_heuristic_detector()
+
+
+def create_ml_filter_service(model_config: Optional[Dict[str, str]] = None) -> MLFilterService:
+    """
+    Create an `MLFilterService` whose detectors come from the cached getters.
+
+    Args:
+        model_config: Optional model names per category
+            (`prompt_injection`, `pii`, `toxicity`); defaults are used for
+            missing categories.
+    """
+    model_config = model_config or {}
+    return MLFilterService(
+        pii_detector=get_pii(model_config.get("pii")),
+        toxicity_detector=get_toxicity(model_config.get("toxicity")),
+        prompt_injection_detector=get_prompt_injection(model_config.get("prompt_injection")),
+        heuristic_detector=get_heuristic(),
+    )
+
+
+def clear_detector_cache() -> int:
+    """
+    Drop every cached detector (getters and factory cache).
+
+    The cached gateways hold their own ML filter (and detectors), so they
+    are dropped too; the next request builds them with fresh detectors.
+
+    Returns:
+        Number of detectors removed from the factory cache
+    """
+    # Imported here: `core.gateway.factory` imports this module
+    from core.gateway.factory import clear_gateway_cache
+
+    for getter in (get_pii, get_toxicity, get_prompt_injection, get_heuristic):
+        getter.cache_clear()
+    clear_gateway_cache()
+    return get_factory().clear_cache()
@@ -0,0 +1,60 @@
+"""Request-scoped logging context.
+
+The current request ID lives in a `ContextVar`, set once per request, and
+`RequestIdFilter` copies it into every log record so formatters can emit
+`%(request_id)s` without each call site passing it explicitly.
+"""
+
+import logging
+import queue
+from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener
+
+request_id_ctx: ContextVar[str] = ContextVar("request_id", default="-")
+
+LOG_FORMAT = "%(levelname)s:%(name)s:[%(request_id)s] %(message)s"
+
+
+class RequestIdFilter(logging.Filter):
+    """Inject the current request ID into log records as `request_id`."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_ctx.get()
+        return True
+
+
+def install_request_id_logging() -> None:
+    """Attach `RequestIdFilter` and a request-aware format to the root handlers."""
+    formatter = logging.Formatter(LOG_FORMAT)
+    for handler in logging.getLogger().handlers:
+        handler.addFilter(RequestIdFilter())
+        handler.setFormatter(formatter)
+
+
+def install_queue_logging() -> QueueListener:
+    """
+    Move the root handlers behind a queue served by a background thread.
+
+    Request handlers then only enqueue log records; the handler I/O (stdout,
+    files) runs on the listener thread. The request ID is captured by the
+    `QueueHandler`, in the logging thread, since the listener thread does
+    not see the request's context. Handler levels are still respected.
+
+    Returns:
+        The started listener; stop it at shutdown to flush pending records
+    """
+    root = logging.getLogger()
+    handlers = root.handlers[:]
+    for handler in handlers:
+        root.removeHandler(handler)
+        for log_filter in handler.filters[:]:
+            if isinstance(log_filter, RequestIdFilter):
+                handler.removeFilter(log_filter)
+
+    queue_handler = QueueHandler(queue.SimpleQueue())
+    queue_handler.addFilter(RequestIdFilter())
+    root.addHandler(queue_handler)
+
+    listener = QueueListener(queue_handler.queue, *handlers, respect_handler_level=True)
+    listener.start()
+    return listener
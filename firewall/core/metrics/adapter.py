@@ -1,19 +1,83 @@
-from typing import Optional, List
+from functools import lru_cache
+from typing import Callable, FrozenSet, List, Optional, Tuple
 
 from fast_ml_filter.ml_filter_service import MLSignals
+from metrics_manager import WARN_RATIO
 
 from core.api_models import DetectorMetrics  # Shared model with the API layer
 
 
+# Threshold per detector
+THRESHOLDS = {
+    "pii": 0.8,
+    "toxicity": 0.7,
+    "prompt_injection": 0.8,
+    "heuristic": 1.0,
+}
+
+# Model used when the detector config does not name one
+_DEFAULT_MODELS = {
+    "pii": "presidio",
+    "toxicity": "detoxify",
+    "prompt_injection": "custom_onnx",
+    "heuristic": "Regex",
+}
+
+_DISPLAY_NAMES = {
+    "presidio": "Presidio",
+    "onnx": "ONNX",
+    "mock": "Mock",
+    "detoxify": "Detoxify",
+    "custom_onnx": "Custom ONNX",
+    "deberta": "DeBERTa",
+}
+
+
 def _get_status(score: float, threshold: float) -> str:
     """Get status based on score and threshold."""
     if score >= threshold:
         return "block"
-    elif score >= threshold * 0.7:
+    elif score >= threshold * WARN_RATIO:
         return "warn"
     return "pass"
 
 
+def _get_heuristic_status(score: float, threshold: float) -> str:
+    """Heuristic matches are binary: no warning band."""
+    return "block" if score >= threshold else "pass"
+
+
+# (MLSignals attribute, display name, detector key, status function),
+# in the order the metrics are reported
+_DETECTOR_SPECS = (
+    ("pii_metrics", "PII Detector", "pii", _get_status),
+    ("toxicity_metrics", "Toxicity Detector", "toxicity", _get_status),
+    ("prompt_injection_metrics", "Prompt Injection Detector", "prompt_injection", _get_status),
+    ("heuristic_metrics", "Heuristic Detector", "heuristic", _get_heuristic_status),
+)
+
+
+@lru_cache(maxsize=32)
+def _resolve_specs(
+    config_items: FrozenSet[Tuple[str, str]],
+) -> Tuple[Tuple[str, str, float, str, Callable[[float, float], str]], ...]:
+    """
+    Resolve the detector specs of a detector configuration, once per config.
+
+    Returns:
+        `(attribute, name, threshold, model display name, status function)`
+        per detector, in report order
+    """
+    detector_config = dict(config_items)
+    resolved = []
+    for attr, name, key, get_status in _DETECTOR_SPECS:
+        model_name = detector_config.get(key, _DEFAULT_MODELS[key])
+        resolved.append(
+            (attr, name, THRESHOLDS[key], _DISPLAY_NAMES.get(model_name, model_name), get_status)
+        )
+    return tuple(resolved)
+
+
 def extract_ml_metrics(
     ml_signals: MLSignals, detector_config: Optional[dict] = None
 ) -> List[DetectorMetrics]:
@@ -27,91 +91,24 @@ def extract_ml_metrics(
     Returns:
         List of DetectorMetrics
     """
-    thresholds = {
-        "pii": 0.8,
-        "toxicity": 0.7,
-        "prompt_injection": 0.8,
-        "heuristic": 1.0,
-    }
-
-    model_names = {
-        "pii": detector_config.get("pii", "presidio") if detector_config else "presidio",
-        "toxicity": detector_config.get("toxicity", "detoxify")
-        if detector_config
-        else "detoxify",
-        "prompt_injection": detector_config.get("prompt_injection", "custom_onnx")
-        if detector_config
-        else "custom_onnx",
-    }
-
-    model_display_names = {
-        "presidio": "Presidio",
-        "onnx": "ONNX",
-        "mock": "Mock",
-        "detoxify": "Detoxify",
-        "custom_onnx": "Custom ONNX",
-        "deberta": "DeBERTa",
-    }
-
+    specs = _resolve_specs(frozenset(detector_config.items()) if detector_config else frozenset())
     metrics: List[DetectorMetrics] = []
 
-    if hasattr(ml_signals, "pii_metrics") and ml_signals.pii_metrics:
-        model_name = model_names.get("pii", "presidio")
+    for attr, name, threshold, model_name, get_status in specs:
+        detector_metrics = getattr(ml_signals, attr, None)
+        if not detector_metrics:
+            continue
+        score = detector_metrics.score
+        # Trusted detector output: skip validation
         metrics.append(
-            DetectorMetrics(
-                name="PII Detector",
-                score=ml_signals.pii_metrics.score,
-                latency_ms=ml_signals.pii_metrics.latency_ms,
-                threshold=thresholds["pii"],
-                status=_get_status(ml_signals.pii_metrics.score, thresholds["pii"]),
-                model_name=model_display_names.get(model_name, model_name),
-            )
-        )
-
-    if hasattr(ml_signals, "toxicity_metrics") and ml_signals.toxicity_metrics:
-        model_name = model_names.get("toxicity", "detoxify")
-        metrics.append(
-            DetectorMetrics(
-                name="Toxicity Detector",
-                score=ml_signals.toxicity_metrics.score,
-                latency_ms=ml_signals.toxicity_metrics.latency_ms,
-                threshold=thresholds["toxicity"],
-                status=_get_status(
-                    ml_signals.toxicity_metrics.score, thresholds["toxicity"]
-                ),
-                model_name=model_display_names.get(model_name, model_name),
-            )
-        )
-
-    if hasattr(ml_signals, "prompt_injection_metrics") and ml_signals.prompt_injection_metrics:
-        model_name = model_names.get("prompt_injection", "custom_onnx")
-        metrics.append(
-            DetectorMetrics(
-                name="Prompt Injection Detector",
-                score=ml_signals.prompt_injection_metrics.score,
-                latency_ms=ml_signals.prompt_injection_metrics.latency_ms,
-                threshold=thresholds["prompt_injection"],
-                status=_get_status(
-                    ml_signals.prompt_injection_metrics.score,
-                    thresholds["prompt_injection"],
-                ),
-                model_name=model_display_names.get(model_name, model_name),
-            )
-        )
-
-    if hasattr(ml_signals, "heuristic_metrics") and ml_signals.heuristic_metrics:
-        heuristic_score = ml_signals.heuristic_metrics.score
-        metrics.append(
-            DetectorMetrics(
-                name="Heuristic Detector",
-                score=heuristic_score,
-                latency_ms=ml_signals.heuristic_metrics.latency_ms,
-                threshold=thresholds["heuristic"],
-                status="block" if heuristic_score >= 1.0 else "pass",
-                model_name="Regex",
+            DetectorMetrics.model_construct(
+                name=name,
+                score=score,
+                latency_ms=detector_metrics.latency_ms,
+                threshold=threshold,
+                status=get_status(score, threshold),
+                model_name=model_name,
             )
         )
 
     return metrics
-
-
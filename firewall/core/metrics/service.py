@@ -1,14 +1,18 @@
-from __future__ import annotations
+from typing import Callable, List, Dict, Any
 
-from typing import List, Dict, Any
-
-from metrics_manager import MetricsManager, RequestEvent
+from core.events import StandardizedEvent
+from core.metrics.adapter import THRESHOLDS
+from metrics_manager import MetricsManager
 
 
 class MetricsService:
     """
     Facade over `MetricsManager` to expose metrics operations to the API layer without coupling it to the implementation details.
 
+    The operations are the manager's bound methods, assigned once at
+    construction, so calls (e.g. `add_request` on every chat request) go
+    straight to the manager without a wrapper frame.
+
     Args:
         max_requests: Maximum number of requests to store in memory
 
@@ -16,31 +20,26 @@ class MetricsService:
         MetricsService instance
     """
 
-    def __init__(self, max_requests: int = 500) -> None:
-        self._manager = MetricsManager(max_requests=max_requests)
-
-    def add_request(self, event: Dict[str, Any]) -> None:
-        """Register a new request event."""
-        self._manager.add_request(RequestEvent(**event))
-
-    def get_stats(self) -> Dict[str, Any]:
-        """Get aggregated executive statistics."""
-        return self._manager.get_stats()
+    # Register a new request event (stored as is, without copying)
+    add_request: Callable[[StandardizedEvent], None]
+    # Get aggregated executive statistics
+    get_stats: Callable[[], Dict[str, Any]]
+    # Get the most recent requests
+    get_recent: Callable[..., List[Dict[str, Any]]]
+    # Get session analytics with most suspicious activity
+    get_session_analytics: Callable[..., List[Dict[str, Any]]]
+    # Temporal breakdown of risk categories
+    get_temporal_breakdown: Callable[..., Dict[str, Any]]
 
-    def get_recent(self, limit: int = 50) -> List[Dict[str, Any]]:
-        """Get the most recent requests."""
-        return self._manager.get_recent(limit=limit)
-
-    def get_session_analytics(self, top_n: int = 5) -> List[Dict[str, Any]]:
-        """Get session analytics with most suspicious activity."""
-        return self._manager.get_session_analytics(top_n=top_n)
-
-    def get_temporal_breakdown(self, minutes: int = 10) -> Dict[str, Any]:
-        """Temporal breakdown of risk categories."""
-        return self._manager.get_temporal_breakdown(minutes=minutes)
+    def __init__(self, max_requests: int = 500) -> None:
+        manager = MetricsManager(max_requests=max_requests, score_thresholds=THRESHOLDS)
+        self._manager = manager
+        self.add_request = manager.add_request
+        self.get_stats = manager.get_stats
+        self.get_recent = manager.get_recent
+        self.get_session_analytics = manager.get_session_analytics
+        self.get_temporal_breakdown = manager.get_temporal_breakdown
 
 
 # Global instance; later it can be moved to `core.bootstrap`.
 metrics_service = MetricsService(max_requests=500)
-
-
@@ -1,16 +1,27 @@
+import asyncio
 import logging
 import time
-from typing import Any
+from functools import partial
+from typing import Any, Hashable
 
 from action_orchestrator.orchestrator_service import OrchestratorService
+from core.analysis_cache import AnalysisCache
 from core.analyzer import AnalysisDirection, AnalysisResult, FirewallAnalyzer
 from core.backend_proxy import BackendProxyService
 from core.exceptions import BackendError, ContentBlockedException
 from core.request_context import RequestContext
 from core.utils.decorators import log_execution_time
+from policy_engine.policy_service import PolicyDecision
 
 logger = logging.getLogger(__name__)
 
+# Decision recorded for replies too short to be worth an egress analysis
+_EGRESS_SKIPPED_DECISION = PolicyDecision(
+    blocked=False,
+    reason="Egress analysis skipped (short reply)",
+    confidence=1.0,
+)
+
 
 class FirewallOrchestrator:
     """
@@ -30,6 +41,9 @@ class FirewallOrchestrator:
         analyzer: FirewallAnalyzer,
         proxy: BackendProxyService,
         orchestrator: OrchestratorService,
+        speculative_backend: bool = False,
+        analysis_cache: AnalysisCache | None = None,
+        min_egress_length: int = 0,
     ) -> None:
         """
         Initialize the orchestrator with the dependencies.
@@ -38,10 +52,29 @@ class FirewallOrchestrator:
             analyzer: Content analyzer of the firewall
             proxy: Proxy service to the backend
             orchestrator: Orchestrator of actions
+            speculative_backend: Send the message to the backend while the
+                ingress analysis runs (the backend call is cancelled if the
+                content is blocked). Hides the backend latency behind the
+                analysis, but the backend may receive messages that end up
+                blocked: only enable it for idempotent, trusted backends.
+            analysis_cache: Optional cache of analyses; repeated messages
+                skip the preprocessing, ML and policy pipeline
+            min_egress_length: Replies shorter than this (ignoring surrounding
+                whitespace) are allowed without an egress analysis
         """
         self._analyzer = analyzer
         self._proxy = proxy
         self._orchestrator = orchestrator
+        self._speculative_backend = speculative_backend
+        self._analysis_cache = analysis_cache
+        self._min_egress_length = min_egress_length
+        # Running analyses by cache key, shared by identical concurrent requests
+        self._inflight: dict[Hashable, asyncio.Task] = {}
+
+    def clear_analysis_cache(self) -> None:
+        """Drop the cached analyses (after a detector or policy reload)."""
+        if self._analysis_cache is not None:
+            self._analysis_cache.clear()
 
     @log_execution_time()
     async def process_chat_request(
@@ -66,8 +99,14 @@ class FirewallOrchestrator:
             ContentBlockedException: If the content is blocked
             BackendError: If there is an error in the backend
         """
-        start_time = time.time()
+        start_time = time.perf_counter()
         analysis_result = None
+        # Decisions of this request, handed to the action orchestrator at the end
+        actions: list[tuple[PolicyDecision, str, dict[str, Any]]] = []
+        proxy_task = None
+        if self._speculative_backend:
+            # Overlap the backend round-trip with the ingress analysis
+            proxy_task = asyncio.create_task(self._timed_proxy(message, request_id))
 
         try:
             # === INGRESS ANALYSIS ===
@@ -76,42 +115,37 @@ class FirewallOrchestrator:
                 direction=AnalysisDirection.INGRESS,
                 request_id=request_id,
                 context=context,
+                actions=actions,
             )
 
             # === PROXY TO BACKEND ===
-            backend_start = time.time()
-            backend_response = await self._proxy_with_error_handling(
-                message=message,
-                request_id=request_id,
-            )
-            backend_latency_ms = (time.time() - backend_start) * 1000
+            if proxy_task is not None:
+                backend_response, backend_latency_ms = await proxy_task
+            else:
+                backend_response, backend_latency_ms = await self._timed_proxy(
+                    message, request_id
+                )
 
             # === EGRESS ANALYSIS (OPTIONAL) ===
             if analyze_egress:
-                reply = backend_response.get("reply", "")
-                if reply:
-                    await self._analyze_with_orchestration(
-                        content=reply,
-                        direction=AnalysisDirection.EGRESS,
-                        request_id=f"{request_id}_egress",
-                        context=context,
-                    )
+                await self._analyze_egress(backend_response, request_id, context, actions)
 
             # === SUCCESS LOG ===
-            total_latency_ms = (time.time() - start_time) * 1000
+            total_latency_ms = (time.perf_counter() - start_time) * 1000
             self._orchestrator.logger.log(
                 "info",
-                f"Request allowed - latency: {total_latency_ms:.1f}ms",
+                "Request allowed - latency: %.1fms",
+                total_latency_ms,
                 request_id=request_id,
                 latency_ms=total_latency_ms,
             )
 
             # Add metrics to the response
             backend_response["metrics"] = {
-                "ml_signals": analysis_result.ml_signals if analysis_result else None,
-                "preprocessed": analysis_result.preprocessed if analysis_result else None,
-                "decision": analysis_result.decision if analysis_result else None,
-                "analysis_latency_ms": analysis_result.latency_ms if analysis_result else 0,
+                "ml_signals": analysis_result.ml_signals,
+                "preprocessed": analysis_result.preprocessed,
+                "decision": analysis_result.decision,
+                "analysis_latency_ms": analysis_result.latency_ms,
                 "preprocessing_latency_ms": 0,  # Could be extracted if needed
                 "policy_latency_ms": 0,  # Could be extracted if needed
             }
@@ -121,7 +155,7 @@ class FirewallOrchestrator:
 
         except ContentBlockedException as e:
             # Already orchestrated in _analyze_with_orchestration
-            logger.info(f"Content blocked ({e.direction}): {e.reason}")
+            logger.info("Content blocked (%s): %s", e.direction, e.reason)
             # Attach ml_signals and preprocessed to the exception if available
             if analysis_result:
                 e.ml_signals = analysis_result.ml_signals
@@ -132,7 +166,8 @@ class FirewallOrchestrator:
             # Orchestrate backend error
             self._orchestrator.logger.log(
                 "error",
-                f"Backend error: {e.message}",
+                "Backend error: %s",
+                e.message,
                 request_id=request_id,
                 **e.details,
             )
@@ -142,12 +177,98 @@ class FirewallOrchestrator:
             # Unexpected error
             self._orchestrator.logger.log(
                 "error",
-                f"Unexpected error in the firewall: {e}",
+                "Unexpected error in the firewall: %s",
+                e,
                 request_id=request_id,
                 error=str(e),
             )
             raise
 
+        finally:
+            if proxy_task is not None:
+                await self._finish_proxy_task(proxy_task)
+            # Allowed, blocked or failed: emit the decisions taken so far
+            if actions:
+                self._execute_actions(actions, request_id)
+
+    @staticmethod
+    async def _finish_proxy_task(proxy_task: asyncio.Task) -> None:
+        """
+        Cancel the speculative backend call if still running, then await it.
+
+        Always awaited, so a backend failure that was not used (blocked or
+        failed request) is retrieved instead of reported as never retrieved.
+        """
+        if not proxy_task.done():
+            proxy_task.cancel()
+        await asyncio.gather(proxy_task, return_exceptions=True)
+
+    async def _analyze_egress(
+        self,
+        backend_response: dict[str, Any],
+        request_id: str,
+        context: RequestContext | None,
+        actions: list[tuple[PolicyDecision, str, dict[str, Any]]],
+    ) -> None:
+        """
+        Analyze the backend reply, skipping trivially short ones.
+
+        Raises:
+            ContentBlockedException: If the reply is blocked
+        """
+        reply = backend_response.get("reply", "")
+        if not reply:
+            return
+        egress_request_id = f"{request_id}_egress"
+        if len(reply.strip()) >= self._min_egress_length:
+            await self._analyze_with_orchestration(
+                content=reply,
+                direction=AnalysisDirection.EGRESS,
+                request_id=egress_request_id,
+                context=context,
+                actions=actions,
+            )
+            return
+        # Trivial reply: record the allow without running the models
+        actions.append((
+            _EGRESS_SKIPPED_DECISION,
+            egress_request_id,
+            {
+                "timestamp": time.time(),
+                "direction": AnalysisDirection.EGRESS.value,
+                "message_length": len(reply),
+                "latency_ms": 0,
+                "egress_skipped": True,
+            },
+        ))
+
+    def _execute_actions(
+        self,
+        actions: list[tuple[PolicyDecision, str, dict[str, Any]]],
+        request_id: str,
+    ) -> None:
+        """
+        Hand the decisions of a request to the action orchestrator.
+
+        Runs while the request's own outcome (response or exception) is being
+        returned: a failing action (alerter, idempotency store) is logged and
+        must not replace it.
+        """
+        try:
+            self._orchestrator.execute_many(actions)
+        except Exception as e:
+            logger.error("Failed to execute actions of request %s: %s", request_id, e)
+
+    async def _timed_proxy(self, message: str, request_id: str) -> tuple[dict[str, Any], float]:
+        """Send the message to the backend; return the response and its latency in ms."""
+        loop = asyncio.get_running_loop()
+        backend_start = loop.time()
+        backend_response = await self._proxy_with_error_handling(
+            message=message,
+            request_id=request_id,
+        )
+        return backend_response, (loop.time() - backend_start) * 1000
+
     
     @log_execution_time()
     async def _analyze_with_orchestration(
@@ -156,6 +277,7 @@ class FirewallOrchestrator:
         direction: AnalysisDirection,
         request_id: str,
         context: RequestContext | None = None,
+        actions: list[tuple[PolicyDecision, str, dict[str, Any]]] | None = None,
     ) -> AnalysisResult:
         """
         Analyzes content and orchestrates the corresponding actions.
@@ -165,6 +287,9 @@ class FirewallOrchestrator:
             direction: Analysis direction
             request_id: Request ID
             context: Request context
+            actions: If given, the decision is appended to it as a
+                (decision, request_id, context) tuple for the caller to
+                execute later, instead of being executed right away
         Returns:
             AnalysisResult if the content is allowed
 
@@ -172,18 +297,14 @@ class FirewallOrchestrator:
             ContentBlockedException: If the content is blocked
         """
         try:
-            result = await self._analyzer.analyze_content(
-                content=content,
-                direction=direction,
-                store=False,
-                context=context,
-            )
+            result = await self._analyze_cached(content, direction, context)
 
             # Orchestrate decision to allow
-            self._orchestrator.execute(
-                decision=result.decision,
-                request_id=request_id,
-                context={
+            self._emit_action(
+                actions,
+                result.decision,
+                request_id,
+                {
                     "timestamp": time.time(),
                     "direction": direction.value,
                     "message_length": len(content),
@@ -195,8 +316,6 @@ class FirewallOrchestrator:
 
         except ContentBlockedException as e:
             # Orchestrate decision to block
-            from policy_engine.policy_service import PolicyDecision
-
             blocked_decision = PolicyDecision(
                 blocked=True,
                 reason=e.reason,
@@ -204,10 +323,11 @@ class FirewallOrchestrator:
                 matched_rule=e.details.get("matched_rule"),
             )
 
-            self._orchestrator.execute(
-                decision=blocked_decision,
-                request_id=request_id,
-                context={
+            self._emit_action(
+                actions,
+                blocked_decision,
+                request_id,
+                {
                     "timestamp": time.time(),
                     "direction": e.direction,
                     "latency_ms": e.details.get("latency_ms", 0),
@@ -216,6 +336,76 @@ class FirewallOrchestrator:
 
             raise
 
+    def _emit_action(
+        self,
+        actions: list[tuple[PolicyDecision, str, dict[str, Any]]] | None,
+        decision: PolicyDecision,
+        request_id: str,
+        context: dict[str, Any],
+    ) -> None:
+        """Execute a decision now, or queue it in `actions` if given."""
+        if actions is None:
+            self._orchestrator.execute(
+                decision=decision, request_id=request_id, context=context
+            )
+        else:
+            actions.append((decision, request_id, context))
+
+    async def _analyze_cached(
+        self,
+        content: str,
+        direction: AnalysisDirection,
+        context: RequestContext | None,
+    ) -> AnalysisResult:
+        """
+        Analyze content, sharing the work between identical analyses.
+
+        Repeated analyses are answered from the cache. Identical analyses
+        that arrive while one is running await that one instead of starting
+        their own (single-flight). The analysis runs in its own task, so a
+        caller that goes away does not cancel it for the others.
+        """
+        key = AnalysisCache.make_key(content, direction, context)
+        cache = self._analysis_cache
+        if cache is not None:
+            cached = cache.get(key)
+            if isinstance(cached, ContentBlockedException):
+                raise cache.replay_block(cached, cached=True)
+            if cached is not None:
+                return cache.as_hit(cached)
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(
+                self._analyzer.analyze_content(
+                    content=content, direction=direction, store=False, context=context
+                )
+            )
+            self._inflight[key] = task
+            task.add_done_callback(partial(self._analysis_done, key))
+
+        try:
+            return await asyncio.shield(task)
+        except ContentBlockedException as e:
+            # Each caller gets its own copy: the exception is enriched upstream
+            raise AnalysisCache.replay_block(e) from None
+
+    def _analysis_done(self, key: Hashable, task: asyncio.Task) -> None:
+        """Retire a finished analysis and cache its outcome."""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if task.cancelled():
+            return
+        # Retrieving the exception also marks it as handled
+        exc = task.exception()
+        cache = self._analysis_cache
+        if cache is None:
+            return
+        if exc is None:
+            cache.put(key, task.result())
+        elif isinstance(exc, ContentBlockedException):
+            cache.put(key, cache.replay_block(exc))
+
     @log_execution_time()
     async def _proxy_with_error_handling(
         self,
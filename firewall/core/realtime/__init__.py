@@ -1,4 +1,11 @@
 from .connection_manager import ConnectionManager, manager
-from .events_queue import event_queue, init_event_queue, event_broadcaster
-
+from .events_queue import enqueue_event, event_broadcaster, event_queue, init_event_queue
 
+__all__ = [
+    "ConnectionManager",
+    "enqueue_event",
+    "event_broadcaster",
+    "event_queue",
+    "init_event_queue",
+    "manager",
+]
@@ -1,26 +1,36 @@
 import asyncio
 import logging
-from typing import List, Optional
+import time
+from typing import Any, Dict, List, Optional
 
+import orjson
 from fastapi import WebSocket
 
 
 logger = logging.getLogger(__name__)
 
+# Heartbeat message, encoded once (sent as text: the dashboard parses text frames)
+_PING_TEXT = orjson.dumps({"type": "ping"}).decode()
+
 
 class ConnectionManager:
     """Manages WebSocket connections and heartbeats."""
 
     def __init__(self) -> None:
         """Initialize the ConnectionManager."""
-        self.active_connections: List[WebSocket] = []
+        # Active connections -> monotonic time of their last pong
+        self.active_connections: Dict[WebSocket, float] = {}
         self.heartbeat_interval = 30  # seconds
-        self.heartbeat_timeout = 90  # seconds
+        self.heartbeat_timeout = 90  # seconds without a pong before a client is dropped
+        # One heartbeat task for all connections, started on the first connect
+        self._heartbeat_task: Optional[asyncio.Task] = None
 
     async def connect(self, websocket: WebSocket) -> None:
         """Accept and register a new WebSocket connection."""
         await websocket.accept()
-        self.active_connections.append(websocket)
+        self.active_connections[websocket] = time.monotonic()
+        if self._heartbeat_task is None or self._heartbeat_task.done():
+            self._heartbeat_task = asyncio.create_task(self._heartbeat_loop())
         logger.info(
             "WebSocket connected. Total connections: %s",
             len(self.active_connections),
@@ -28,44 +38,110 @@ class ConnectionManager:
 
     def disconnect(self, websocket: WebSocket) -> None:
         """Delete a WebSocket connection."""
-        if websocket in self.active_connections:
-            self.active_connections.remove(websocket)
+        if self.active_connections.pop(websocket, None) is not None:
             logger.info(
                 "WebSocket disconnected. Total connections: %s",
                 len(self.active_connections),
             )
 
+    def mark_alive(self, websocket: WebSocket) -> None:
+        """Record a pong from a connection, keeping it out of the stale sweep."""
+        if websocket in self.active_connections:
+            self.active_connections[websocket] = time.monotonic()
+
     async def send_personal_message(self, message: dict, websocket: WebSocket) -> None:
         """Send a message to a specific WebSocket."""
         try:
-            await websocket.send_json(message)
+            await websocket.send_text(orjson.dumps(message).decode())
         except Exception as exc:  # pragma: no cover - defensive
             logger.error("Error sending message to websocket: %s", exc)
             self.disconnect(websocket)
 
-    async def broadcast(self, message: dict) -> None:
-        """Broadcast to all active connections."""
-        disconnected = []
-        for connection in self.active_connections:
+    async def broadcast(self, message: Any) -> None:
+        """
+        Broadcast to all active connections.
+
+        The message (a dict or a dataclass such as `StandardizedEvent`) is
+        encoded to JSON once with orjson and the same text is sent to every
+        connection.
+        """
+        await self.broadcast_bytes(orjson.dumps(message))
+
+    async def broadcast_bytes(self, payload: bytes) -> None:
+        """
+        Broadcast an orjson-encoded message to all active connections.
+
+        The payload is sent as a text frame: the dashboard parses text
+        messages, a binary frame would reach it as a Blob.
+        """
+        await self.broadcast_text(payload.decode())
+
+    async def broadcast_text(self, text: str) -> None:
+        """
+        Broadcast an already JSON-encoded message to all active connections.
+
+        The sends run concurrently, so a slow client does not delay the
+        others: a broadcast takes as long as the slowest send, not their sum.
+        """
+        connections = list(self.active_connections)
+        results = await asyncio.gather(
+            *(connection.send_text(text) for connection in connections),
+            return_exceptions=True,
+        )
+        for connection, result in zip(connections, results, strict=True):
+            if isinstance(result, Exception):  # pragma: no cover - defensive
+                logger.error("Error broadcasting to websocket: %s", result)
+                self.disconnect(connection)
+
+    async def broadcast_batch(self, payloads: List[bytes]) -> None:
+        """
+        Broadcast several orjson-encoded messages to all active connections.
+
+        Each connection receives the messages in order, one text frame per
+        message; connections are served concurrently, as in `broadcast_text`.
+        """
+        texts = [payload.decode() for payload in payloads]
+
+        async def send_all(connection: WebSocket) -> None:
+            for text in texts:
+                await connection.send_text(text)
+
+        connections = list(self.active_connections)
+        results = await asyncio.gather(
+            *(send_all(connection) for connection in connections),
+            return_exceptions=True,
+        )
+        for connection, result in zip(connections, results, strict=True):
+            if isinstance(result, Exception):  # pragma: no cover - defensive
+                logger.error("Error broadcasting to websocket: %s", result)
+                self.disconnect(connection)
+
+    async def _drop_stale(self) -> None:
+        """Close the connections that sent no pong within `heartbeat_timeout`."""
+        deadline = time.monotonic() - self.heartbeat_timeout
+        stale = [ws for ws, last_seen in self.active_connections.items() if last_seen < deadline]
+        for connection in stale:
+            logger.warning("Dropping stale WebSocket (no pong in %ss)", self.heartbeat_timeout)
+            self.disconnect(connection)
             try:
-                await connection.send_json(message)
+                await connection.close()
             except Exception as exc:  # pragma: no cover - defensive
-                logger.error("Error broadcasting to websocket: %s", exc)
-                disconnected.append(connection)
+                logger.debug("Error closing stale websocket: %s", exc)
 
-        for conn in disconnected:
-            self.disconnect(conn)
+    async def _heartbeat_loop(self) -> None:
+        """
+        Send a heartbeat to every connection each `heartbeat_interval`.
 
-    async def heartbeat_sender(self, websocket: WebSocket) -> None:
-        """Send periodic heartbeats to a given connection."""
-        try:
-            while websocket in self.active_connections:
-                await asyncio.sleep(self.heartbeat_interval)
-                if websocket in self.active_connections:
-                    await websocket.send_json({"type": "ping"})
-        except Exception as exc:  # pragma: no cover - defensive
-            logger.error("Heartbeat sender error: %s", exc)
-            self.disconnect(websocket)
+        Connections silent for longer than `heartbeat_timeout` are dropped
+        first, so a dead client does not keep receiving every broadcast.
+        """
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                await self._drop_stale()
+                await self.broadcast_text(_PING_TEXT)
+            except Exception as exc:  # pragma: no cover - defensive
+                logger.error("Heartbeat error: %s", exc)
 
 
 # Global instance; later it can be moved to `core.bootstrap`.
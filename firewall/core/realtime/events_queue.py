@@ -7,30 +7,60 @@ from .connection_manager import manager
 
 logger = logging.getLogger(__name__)
 
+# Upper bound of queued events; the oldest are dropped when it is full
+EVENT_QUEUE_MAXSIZE = 10_000
+# Maximum number of events fanned out together
+BROADCAST_BATCH = 64
 
-# Global queue for dashboard events (can be moved to `core.bootstrap` if needed)
-event_queue: Optional[asyncio.Queue] = None
+
+# Global queue for dashboard events, already JSON-encoded (can be moved to
+# `core.bootstrap` if needed)
+event_queue: Optional[asyncio.Queue[bytes]] = None
 
 
 async def init_event_queue() -> None:
     """Initialize the global event queue if it doesn't exist."""
     global event_queue
     if event_queue is None:
-        event_queue = asyncio.Queue()
+        event_queue = asyncio.Queue(maxsize=EVENT_QUEUE_MAXSIZE)
+
+
+def enqueue_event(payload: bytes) -> bool:
+    """
+    Queue an encoded event for the WebSocket clients without blocking.
+
+    Dashboard events are telemetry: when the queue is full the oldest event
+    is dropped to make room, so a slow client never stalls the producers.
+
+    Returns:
+        True if an older event was dropped
+    """
+    queue = event_queue
+    if queue is None:
+        return False
+    dropped = False
+    while True:
+        try:
+            queue.put_nowait(payload)
+            return dropped
+        except asyncio.QueueFull:
+            queue.get_nowait()
+            dropped = True
 
 
 async def event_broadcaster() -> None:
-    """Background task that sends events from the queue to all WebSocket clients."""
+    """Background task that sends the encoded events from the queue to all WebSocket clients."""
     global event_queue
     while True:
         try:
             if event_queue is None:
                 await asyncio.sleep(0.1)
                 continue
-            event = await event_queue.get()
+            # Drain what is already queued: one fan-out per batch of events
+            payloads = [await event_queue.get()]
+            while len(payloads) < BROADCAST_BATCH and not event_queue.empty():
+                payloads.append(event_queue.get_nowait())
             if manager:
-                await manager.broadcast(event)
+                await manager.broadcast_batch(payloads)
         except Exception as exc:  # pragma: no cover - defensive
             logger.error("Error in event broadcaster: %s", exc)
-
-
@@ -5,7 +5,7 @@ from typing import Optional, Dict, Any
 from datetime import datetime
 
 
-@dataclass
+@dataclass(slots=True)
 class RequestContext:
     """Context information for a request being analyzed."""
     
@@ -30,9 +30,26 @@ class RequestContext:
     
     # Custom metadata
     custom: Dict[str, Any] = field(default_factory=dict)
+
+    # Memoized `to_dict` result
+    _dict: Optional[Dict[str, Any]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
     
     def to_dict(self) -> Dict[str, Any]:
-        """Convert context to dictionary for formatting."""
+        """
+        Convert context to dictionary for formatting.
+
+        The dictionary is built on the first call and reused afterwards (the
+        context is read by several detectors and by the analysis cache).
+        Contexts are not modified once built; callers must not modify the
+        returned dictionary.
+        """
+        if self._dict is None:
+            self._dict = self._build_dict()
+        return self._dict
+
+    def _build_dict(self) -> Dict[str, Any]:
         return {
             "request_id": self.request_id,
             "user_id": self.user_id or "unknown",
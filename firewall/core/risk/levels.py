@@ -1,46 +1,38 @@
+from bisect import bisect_right
+
 from fast_ml_filter.ml_filter_service import MLSignals
 
+# Lower bounds of the "medium", "high" and "critical" levels (ascending)
+_LEVEL_THRESHOLDS = (0.3, 0.6, 0.8)
+_LEVELS = ("low", "medium", "high", "critical")
+
+# Minimum score for a category to be reported instead of "clean"
+_CATEGORY_THRESHOLD = 0.3
+
 
 def get_risk_level(ml_signals: MLSignals) -> str:
     """Calculate the global risk level from the ML signals."""
+    if ml_signals.heuristic_blocked:
+        return "critical"
     max_score = max(
         ml_signals.pii_score,
         ml_signals.toxicity_score,
         ml_signals.prompt_injection_score,
     )
-    if max_score >= 0.8 or ml_signals.heuristic_blocked:
-        return "critical"
-    elif max_score >= 0.6:
-        return "high"
-    elif max_score >= 0.3:
-        return "medium"
-    return "low"
+    return _LEVELS[bisect_right(_LEVEL_THRESHOLDS, max_score)]
 
 
 def determine_risk_category(ml_signals: MLSignals) -> str:
     """Determine the main risk category from the ML signals."""
-    scores = {
-        "injection": (
-            ml_signals.prompt_injection_score
-            if hasattr(ml_signals, "prompt_injection_score")
-            else 0
-        ),
-        "pii": ml_signals.pii_score if hasattr(ml_signals, "pii_score") else 0,
-        "toxicity": (
-            ml_signals.toxicity_score
-            if hasattr(ml_signals, "toxicity_score")
-            else 0
-        ),
-    }
-
     # First check if the heuristic blocks
     if ml_signals.heuristic_blocked:
         return "leak"  # Indicates attempts to leak information
 
-    max_category = max(scores, key=scores.get)
-    if scores[max_category] > 0.3:
-        return max_category
-
-    return "clean"
-
+    # Highest score wins; ties go to the first category (injection, pii, toxicity)
+    category, score = "injection", ml_signals.prompt_injection_score
+    if ml_signals.pii_score > score:
+        category, score = "pii", ml_signals.pii_score
+    if ml_signals.toxicity_score > score:
+        category, score = "toxicity", ml_signals.toxicity_score
 
+    return category if score > _CATEGORY_THRESHOLD else "clean"
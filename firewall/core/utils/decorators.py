@@ -1,34 +1,39 @@
-import time
-import logging
+import asyncio
 import functools
-import inspect
-from typing import Callable, Any
+import logging
+import time
+from typing import Any, Callable
 
 logger = logging.getLogger(__name__)
 
 
-def _get_function_name(func: Callable, args: tuple = ()) -> str:
+def _name_resolver(func: Callable) -> Callable[[tuple], str]:
     """
-    Get the full qualified name of a function.
-    For methods, tries to get the actual class name from the instance at runtime.
-    Returns 'ClassName.method_name' for methods, or 'function_name' for functions.
+    Build the resolver of the logged name of a function, once per decorated function.
+
+    For methods, the name uses the actual class of the instance (or class, for
+    classmethods) at runtime: 'ClassName.method_name'. Names are cached per
+    class, so a call costs a dict lookup. Other functions use `__qualname__`.
     """
-    # Try to get the actual class from the instance (for methods)
-    if args and len(args) > 0:
+    qualname = func.__qualname__
+    # Defined in a class body (possibly one local to a function)
+    if "." not in qualname.rsplit("<locals>.", 1)[-1]:
+        return lambda args: qualname
+
+    method_name = func.__name__
+    names: dict[type, str] = {}
+
+    def resolve(args: tuple) -> str:
+        if not args:
+            return qualname
         instance = args[0]
-        # Check if it's a bound method (has self or cls)
-        if inspect.ismethod(func) or (hasattr(instance, '__class__') and not inspect.isclass(instance)):
-            # Get the actual class of the instance
-            actual_class = instance.__class__
-            method_name = func.__name__
-            return f"{actual_class.__name__}.{method_name}"
-        elif inspect.isclass(instance):
-            # It's a classmethod, instance is actually the class
-            method_name = func.__name__
-            return f"{instance.__name__}.{method_name}"
-    
-    # Fallback to __qualname__ (works for functions and when we can't determine the class)
-    return func.__qualname__
+        owner = instance if isinstance(instance, type) else type(instance)
+        name = names.get(owner)
+        if name is None:
+            name = names[owner] = f"{owner.__name__}.{method_name}"
+        return name
+
+    return resolve
 
 
 def log_execution_time(log_level: str = "info", unit: str = "ms") -> Callable:
@@ -36,42 +41,54 @@ def log_execution_time(log_level: str = "info", unit: str = "ms") -> Callable:
     Decorator to measure and log the execution time.
     
     For methods, it will log the actual class name (even if decorated on an abstract class).
+    The name, log method and level are resolved at decoration time, and the
+    success message is only built when the level is enabled.
     
     Args:
         log_level: Log level ("debug", "info", "warning", "error")
         unit: Time unit ("ms" for milliseconds, "s" for seconds)
     """
+    level = getattr(logging, log_level.upper())
+    log_fn = getattr(logger, log_level)
+    scale = 1000 if unit == "ms" else 1
+    # Only the attributes needed to identify the function; no __dict__ copy
+    wraps = functools.partial(
+        functools.wraps,
+        assigned=("__module__", "__name__", "__qualname__", "__doc__"),
+        updated=(),
+    )
+
     def decorator(func: Callable) -> Callable:
-        base_func_name = func.__qualname__  # Fallback name
+        resolve_name = _name_resolver(func)
         
-        @functools.wraps(func)
+        @wraps(func)
         async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
-            start_time = time.time()
-            func_name = _get_function_name(func, args) or base_func_name
+            start_time = time.perf_counter()
             try:
                 result = await func(*args, **kwargs)
-                elapsed = (time.time() - start_time) * 1000 if unit == "ms" else (time.time() - start_time)
-                getattr(logger, log_level)(f"{func_name} executed in {elapsed:.2f}{unit}")
-                return result
             except Exception as e:
-                elapsed = (time.time() - start_time) * 1000 if unit == "ms" else (time.time() - start_time)
-                logger.error(f"{func_name} failed after {elapsed:.2f}{unit}: {e}")
+                elapsed = (time.perf_counter() - start_time) * scale
+                logger.error("%s failed after %.2f%s: %s", resolve_name(args), elapsed, unit, e)
                 raise
+            if logger.isEnabledFor(level):
+                elapsed = (time.perf_counter() - start_time) * scale
+                log_fn("%s executed in %.2f%s", resolve_name(args), elapsed, unit)
+            return result
         
-        @functools.wraps(func)
+        @wraps(func)
         def sync_wrapper(*args: Any, **kwargs: Any) -> Any:
-            start_time = time.time()
-            func_name = _get_function_name(func, args) or base_func_name
+            start_time = time.perf_counter()
             try:
                 result = func(*args, **kwargs)
-                elapsed = (time.time() - start_time) * 1000 if unit == "ms" else (time.time() - start_time)
-                getattr(logger, log_level)(f"{func_name} executed in {elapsed:.2f}{unit}")
-                return result
             except Exception as e:
-                elapsed = (time.time() - start_time) * 1000 if unit == "ms" else (time.time() - start_time)
-                logger.error(f"{func_name} failed after {elapsed:.2f}{unit}: {e}")
+                elapsed = (time.perf_counter() - start_time) * scale
+                logger.error("%s failed after %.2f%s: %s", resolve_name(args), elapsed, unit, e)
                 raise
+            if logger.isEnabledFor(level):
+                elapsed = (time.perf_counter() - start_time) * scale
+                log_fn("%s executed in %.2f%s", resolve_name(args), elapsed, unit)
+            return result
         
-        return async_wrapper if inspect.iscoroutinefunction(func) else sync_wrapper
+        return async_wrapper if asyncio.iscoroutinefunction(func) else sync_wrapper
     
-    return decorator
\ No newline at end of file
+    return decorator
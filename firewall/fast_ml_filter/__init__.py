@@ -1,5 +1,6 @@
 """Fast ML Filter module."""
 
+from fast_ml_filter.ml_batcher import MLFilterBatcher
 from fast_ml_filter.ml_filter_service import MLFilterService
 from fast_ml_filter.ports.heuristic_detector_port import IHeuristicDetector
 from fast_ml_filter.ports.pii_detector_port import IPIIDetector
@@ -9,6 +10,7 @@ from fast_ml_filter.ports.toxicity_detector_port import IToxicityDetector
 
 __all__ = [
     "MLFilterService",
+    "MLFilterBatcher",
     "IPIIDetector",
     "IToxicityDetector",
     "IHeuristicDetector",
@@ -5,8 +5,11 @@ Supports two embedding modes:
 - Ollama: Uses Ollama API with connection pooling (~2-5s)
 """
 
+import logging
+import os
 import threading
-from typing import Any, Optional
+from functools import lru_cache
+from typing import Any, List, Optional, Sequence
 
 import numpy as np
 import requests
@@ -17,6 +20,36 @@ from core.request_context import RequestContext
 from core.utils.decorators import log_execution_time
 from fast_ml_filter.ports.prompt_injection_detector_port import IPromptInjectionDetector
 
+logger = logging.getLogger(__name__)
+
+
+# Texts per forward pass of the local embedding model
+EMBEDDING_BATCH_SIZE = 32
+# Rows preallocated in the ONNX input buffer (grown on demand)
+ONNX_MAX_BATCH = 32
+# Threads of the ONNX Runtime session (intra-op parallelism)
+ONNX_INTRA_OP_THREADS = int(os.getenv("ONNX_INTRA_OP_THREADS", str(os.cpu_count() or 4)))
+# Load the INT8 model (`<name>.int8.onnx`) instead of the FP32 one when present
+ONNX_PREFER_INT8 = os.getenv("ONNX_PREFER_INT8", "true").lower() == "true"
+# Context part of the text to embed, after "text: <text>"
+_SUFFIX_FORMAT = (
+    " || UserID: %s || Temperature: %s || Tokens: %s || Turn_Count: %s"
+    " || Rate_Limit: %s || Device: %s || Endpoint: %s"
+)
+# `RequestContext.to_dict` keys, in `_SUFFIX_FORMAT` order
+_CONTEXT_FIELDS = (
+    "user_id", "temperature", "max_tokens", "turn_count", "rate_limit", "device", "endpoint"
+)
+
+
+@lru_cache(maxsize=1024)
+def _suffix_for(fields: tuple) -> str:
+    """Format the context suffix; contexts repeat across a session's requests."""
+    return _SUFFIX_FORMAT % fields
+
+
+_NO_CONTEXT_SUFFIX = _suffix_for(("runtime_user", 0.5, 20, 1, 0, "Unknown", "/threat/query"))
+
 
 class CustomONNXPromptInjectionDetector(IPromptInjectionDetector):
     """Ollama + ONNX implementation for prompt injection detection.
@@ -57,6 +90,10 @@ class CustomONNXPromptInjectionDetector(IPromptInjectionDetector):
         self.threshold = threshold
         self._onnx_model = None
         self._use_model = False
+        self._input_name: Optional[str] = None
+        self._output_name: Optional[str] = None
+        # Per-thread IOBinding and input buffer (detectors run in worker threads)
+        self._thread_state = threading.local()
         
         # Local embeddings configuration
         self._use_local_embeddings = use_local_embeddings
@@ -137,21 +174,59 @@ class CustomONNXPromptInjectionDetector(IPromptInjectionDetector):
 
     @log_execution_time()
     def _load_onnx_model(self) -> None:
-        """Lazy load ONNX model."""
-        if self.model_path and not self._use_model:
+        """Lazy load ONNX model.
+
+        Loaded under the class lock, so concurrent first requests from the
+        worker threads build a single session.
+        """
+        if not self.model_path or self._use_model:
+            return
+        with CustomONNXPromptInjectionDetector._model_load_lock:
+            if self._use_model:
+                return
             try:
                 import onnxruntime as ort
 
+                model_path, opts = self._session_options(ort)
                 self._onnx_model = ort.InferenceSession(
-                    self.model_path,
+                    model_path,
+                    sess_options=opts,
                     providers=["CPUExecutionProvider"],
                 )
+                self._input_name = self._onnx_model.get_inputs()[0].name
+                self._output_name = self._onnx_model.get_outputs()[0].name
                 self._use_model = True
-                print(f"Loaded ONNX prompt injection model from {self.model_path}")
+                print(f"Loaded ONNX prompt injection model from {model_path}")
             except Exception as e:
                 print(f"Failed to load ONNX model: {e}. Using fallback.")
                 self._use_model = False
 
+    def _session_options(self, ort: Any) -> tuple[str, Any]:
+        """
+        Build the ONNX Runtime session options for the classifier.
+
+        Enables all graph optimizations, sequential execution with
+        `ONNX_INTRA_OP_THREADS` threads and denormals flushed to zero.
+
+        If an INT8 quantized model (`<name>.int8.onnx`, see
+        `scripts/quantize_prompt_injection_model.py`) sits next to the model,
+        it is used instead, unless `ONNX_PREFER_INT8` is disabled.
+
+        Returns:
+            Tuple of (path of the model to load, session options)
+        """
+        opts = ort.SessionOptions()
+        opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        opts.intra_op_num_threads = ONNX_INTRA_OP_THREADS
+        opts.inter_op_num_threads = 1
+        opts.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        opts.add_session_config_entry("session.set_denormal_as_zero", "1")
+
+        int8_path = f"{os.path.splitext(self.model_path)[0]}.int8.onnx"
+        if ONNX_PREFER_INT8 and os.path.exists(int8_path):
+            return int8_path, opts
+        return self.model_path, opts
+
     @log_execution_time()
     def _format_text_with_context(
         self, text: str, context: RequestContext | None = None
@@ -166,29 +241,28 @@ class CustomONNXPromptInjectionDetector(IPromptInjectionDetector):
         Returns:
             Formatted text string
         """
-        ctx = context.to_dict() if context else {}
-        return (
-            f"text: {text} || "
-            f"UserID: {ctx.get('user_id', 'runtime_user')} || "
-            f"Temperature: {ctx.get('temperature', 0.5)} || "
-            f"Tokens: {ctx.get('max_tokens', 20)} || "
-            f"Turn_Count: {ctx.get('turn_count', 1)} || "
-            f"Rate_Limit: {ctx.get('rate_limit', 0)} || "
-            f"Device: {ctx.get('device', 'Unknown')} || "
-            f"Endpoint: {ctx.get('endpoint', '/threat/query')}"
-        )
+        if context is None:
+            return f"text: {text}{_NO_CONTEXT_SUFFIX}"
+        ctx = context.to_dict()
+        fields = tuple(ctx[name] for name in _CONTEXT_FIELDS)
+        try:
+            suffix = _suffix_for(fields)
+        except TypeError:
+            # Unhashable custom value: format without the cache
+            suffix = _SUFFIX_FORMAT % fields
+        return f"text: {text}{suffix}"
 
 
     @log_execution_time()
-    def _get_local_embedding(self, text: str) -> Optional[np.ndarray]:
+    def _get_local_embeddings(self, texts: Sequence[str]) -> Optional[np.ndarray]:
         """
-        Get embedding using local SentenceTransformer model.
+        Get embeddings using local SentenceTransformer model.
         
         Args:
-            text: Text to embed
+            texts: Texts to embed
             
         Returns:
-            Numpy array with embedding or None if failed
+            Numpy array of shape (len(texts), dim) or None if failed
         """
         try:
             if not self._load_local_embedding_model():
@@ -198,66 +272,69 @@ class CustomONNXPromptInjectionDetector(IPromptInjectionDetector):
             model = CustomONNXPromptInjectionDetector._shared_local_embedding_model
             
             # SentenceTransformers encode returns numpy array directly
-            embedding = model.encode(
-                text,
+            embeddings = model.encode(
+                list(texts),
+                batch_size=EMBEDDING_BATCH_SIZE,
                 convert_to_numpy=True,
+                normalize_embeddings=False,
                 show_progress_bar=False,
             )
-            return embedding.astype(np.float32)
+            return embeddings.astype(np.float32, copy=False)
         except Exception as e:
             print(f"Failed to get local embedding: {e}")
             return None
     
     @log_execution_time()
-    def _get_ollama_embedding(self, text: str) -> Optional[np.ndarray]:
+    def _get_ollama_embeddings(self, texts: Sequence[str]) -> Optional[np.ndarray]:
         """
-        Get embedding from Ollama API using connection pooling.
+        Get embeddings from Ollama API using connection pooling.
+
+        All the texts go in a single `/api/embed` request.
 
         Args:
-            text: Text to embed
+            texts: Texts to embed
 
         Returns:
-            Numpy array with embedding or None if failed
+            Numpy array of shape (len(texts), dim) or None if failed
         """
         try:
-            print(f"Getting embedding from Ollama API for the text size {len(text)}")
+            logger.debug("Getting embeddings from Ollama API for %s text(s)", len(texts))
             # Use session with connection pooling instead of creating new connection each time
             response = self._session.post(
-                f"{self.ollama_base_url}/api/embeddings",
-                json={"model": self.ollama_model, "prompt": text},
+                f"{self.ollama_base_url}/api/embed",
+                json={"model": self.ollama_model, "input": list(texts)},
                 timeout=30,
             )
             response.raise_for_status()
-            embedding = response.json()["embedding"]
-            if embedding is None and "embeddings" in response:
-                embedding = response["embeddings"][0]
-            if embedding is None or len(embedding) == 0:
-                raise ValueError(f"Empty embedding from Ollama. Response: {response}")
-            print(f"Got embedding from Ollama API for the text size {len(text)}")
-            return np.array(embedding, dtype=np.float32)
+            data = response.json()
+            embeddings = data.get("embeddings")
+            if not embeddings or len(embeddings) != len(texts) or not len(embeddings[0]):
+                raise ValueError(f"Empty embedding from Ollama. Response: {data}")
+            logger.debug("Got embeddings from Ollama API for %s text(s)", len(texts))
+            return np.asarray(embeddings, dtype=np.float32)
         except Exception as e:
             print(f"Failed to get Ollama embedding: {e}")
             return None
     
     @log_execution_time()
-    def _get_embedding(self, text: str) -> Optional[np.ndarray]:
+    def _get_embeddings(self, texts: Sequence[str]) -> Optional[np.ndarray]:
         """
-        Get embedding using the configured method (local or Ollama).
+        Get embeddings using the configured method (local or Ollama).
         
         Args:
-            text: Text to embed
+            texts: Texts to embed
             
         Returns:
-            Numpy array with embedding or None if failed
+            Numpy array of shape (len(texts), dim) or None if failed
         """
         if self._use_local_embeddings:
-            embedding = self._get_local_embedding(text)
-            if embedding is not None:
-                return embedding
+            embeddings = self._get_local_embeddings(texts)
+            if embeddings is not None:
+                return embeddings
             # Fallback to Ollama if local fails
             print("Local embedding failed, falling back to Ollama")
         
-        return self._get_ollama_embedding(text)
+        return self._get_ollama_embeddings(texts)
 
     @log_execution_time()
     def _apply_softmax(self, logits: np.ndarray) -> np.ndarray:
@@ -276,55 +353,80 @@ class CustomONNXPromptInjectionDetector(IPromptInjectionDetector):
 
 
     @log_execution_time()
-    def _run_onnx_inference(self, embedding: np.ndarray) -> float:
+    def _run_onnx_inference(self, embeddings: np.ndarray) -> np.ndarray:
         """
-        Run ONNX model inference on embedding.
+        Run ONNX model inference on a batch of embeddings.
 
         Args:
-            embedding: Input embedding vector
+            embeddings: Input embeddings, shape (batch_size, embedding_dim)
 
         Returns:
-            Prompt injection probability (0.0 to 1.0)
+            Prompt injection probability (0.0 to 1.0) per embedding
         """
         try:
-            outputs = self._run_model(embedding)
+            outputs = self._run_model(embeddings)
 
             # Apply softmax to get probabilities
-            # probs shape: [2] (prob_benign, prob_malign)
-            probs = self._apply_softmax(outputs[0][0])
+            # probs shape: [batch_size, 2] (prob_benign, prob_malign)
+            probs = self._apply_softmax(outputs[0])
 
             # Binary classification:
             # - Index 0: Probability of being benign (Safe/No injection)
             # - Index 1: Probability of being malign (Prompt injection detected)
 
-            if len(probs) >= 2:
+            if probs.shape[-1] >= 2:
                 # Return the probability of malign (index 1)
-                injection_prob = float(probs[1])
+                injection_probs = probs[:, 1]
             else:
                 # Fallback: if there is only one output, use that probability
-                injection_prob = float(probs[0])
+                injection_probs = probs[:, 0]
 
-            return min(max(injection_prob, 0.0), 1.0)
+            return np.clip(injection_probs, 0.0, 1.0)
 
         except Exception as e:
             print(f"Error during ONNX inference: {e}")
             raise
 
     @log_execution_time()
-    def _run_model(self, embedding: np.ndarray) -> np.ndarray:
-        """Run ONNX model inference and return the outputs."""
+    def _run_model(self, embedding: np.ndarray) -> List[np.ndarray]:
+        """
+        Run ONNX model inference and return the outputs.
+
+        The input is copied into a preallocated float32 buffer that is bound
+        to the session with IOBinding, so no feed dict is built and no new
+        input array is allocated per call. Buffer and binding are per thread;
+        the buffer grows when a larger batch arrives.
+        """
         # Ensure embedding has the correct shape for the model
         # Reshape to (batch_size, embedding_dim)
         if embedding.ndim == 1:
             embedding = embedding[np.newaxis, :]
+        batch_size, dim = embedding.shape
 
-        # Get input and output names from model
-        input_name = self._onnx_model.get_inputs()[0].name
-        output_name = self._onnx_model.get_outputs()[0].name
+        state = self._thread_state
+        input_buf = getattr(state, "input_buf", None)
+        if input_buf is None or input_buf.shape[0] < batch_size or input_buf.shape[1] != dim:
+            input_buf = state.input_buf = np.empty(
+                (max(batch_size, ONNX_MAX_BATCH), dim), dtype=np.float32
+            )
+            state.io_binding = self._onnx_model.io_binding()
+        io_binding = state.io_binding
+
+        # Rows of a C-contiguous buffer: the slice is contiguous as well
+        np.copyto(input_buf[:batch_size], embedding, casting="same_kind")
+        io_binding.bind_input(
+            self._input_name,
+            "cpu",
+            0,
+            np.float32,
+            (batch_size, dim),
+            input_buf.ctypes.data,
+        )
+        io_binding.bind_output(self._output_name, "cpu")
 
         # Run inference
-        outputs = self._onnx_model.run([output_name], {input_name: embedding.astype(np.float32)})
-        return outputs
+        self._onnx_model.run_with_iobinding(io_binding)
+        return io_binding.copy_outputs_to_cpu()
 
     @log_execution_time()
     def detect(self, text: str, context: RequestContext | None = None) -> float:
@@ -345,22 +447,50 @@ class CustomONNXPromptInjectionDetector(IPromptInjectionDetector):
         Returns:
             Prompt injection score between 0.0 and 1.0 (1.0 = high confidence injection)
         """
+        return self.detect_batch([text], [context])[0]
+
+    @log_execution_time()
+    def detect_batch(
+        self,
+        texts: Sequence[str],
+        contexts: Sequence[RequestContext | None],
+    ) -> List[float]:
+        """
+        Detect prompt injection in several texts with one batched pipeline run.
+
+        The texts are embedded with a single `encode` call (or a single Ollama
+        request) and scored with a single ONNX run over the (batch, dim)
+        embeddings, instead of one of each per text.
+
+        Args:
+            texts: Texts to analyze
+            contexts: Request context per text
+
+        Returns:
+            Prompt injection score per text, in order
+        """
         # Load model if not already loaded
         self._load_onnx_model()
 
-        if self._use_model and self._onnx_model:
+        if self._use_model and self._onnx_model and texts:
             try:
-                # Step 1: Format text with context
-                formatted_text = self._format_text_with_context(text, context)
-
-                # Step 2: Get embedding (local or Ollama based on configuration)
-                embedding = self._get_embedding(formatted_text)
+                # Step 1: Format texts with context
+                formatted_texts = [
+                    self._format_text_with_context(text, context)
+                    for text, context in zip(texts, contexts, strict=True)
+                ]
+
+                # Step 2: Get embeddings (local or Ollama based on configuration)
+                embeddings = self._get_embeddings(formatted_texts)
                 
-                if embedding is not None:
-                    print(f"Embedding obtained: text_size={len(formatted_text)}, embedding_shape={embedding.shape}")
+                if embeddings is not None:
+                    logger.debug(
+                        "Embeddings obtained: batch_size=%s, embedding_shape=%s",
+                        len(formatted_texts),
+                        embeddings.shape,
+                    )
                     # Step 3-5: Run ONNX inference with softmax
-                    injection_score = self._run_onnx_inference(embedding)
-                    return injection_score
+                    return self._run_onnx_inference(embeddings).tolist()
                 else:
                     print("Failed to get embedding, using fallback detection")
 
@@ -368,7 +498,7 @@ class CustomONNXPromptInjectionDetector(IPromptInjectionDetector):
                 print(f"Error in full pipeline: {e}. Using fallback.")
 
         # Fallback: keyword-based detection
-        return self._fallback_detection(text)
+        return [self._fallback_detection(text) for text in texts]
 
     def _fallback_detection(self, text: str) -> float:
         """
@@ -3,7 +3,7 @@ Native Transformers implementation for toxicity detection.
 Replaces the 'detoxify' library wrapper to resolve dependency conflicts.
 """
 
-from typing import Optional, Dict, Any
+from typing import Any, Dict, List, Optional, Sequence
 from fast_ml_filter.ports.toxicity_detector_port import IToxicityDetector
 
 class DetoxifyToxicityDetector(IToxicityDetector):
@@ -58,6 +58,25 @@ class DetoxifyToxicityDetector(IToxicityDetector):
                 # Important: Do not raise the exception to allow the fallback in runtime
                 # raise e 
 
+    def _score(self, scores_list: List[Dict[str, Any]]) -> float:
+        """Toxicity score from the pipeline labels of one text."""
+        # Convert to a easy to read dictionary: {'toxic': 0.9, 'insult': 0.1, ...}
+        scores_dict = {item['label']: item['score'] for item in scores_list}
+
+        # Scoring logic (Replica the original logic from your file)
+        if "multilingual" in self.model_alias or "unbiased" in self.model_alias:
+            # These models usually return a general 'toxicity' label
+            return float(scores_dict.get("toxicity", 0.0))
+        else:
+            # The 'original' (bert) model returns specific labels
+            toxic = float(scores_dict.get("toxic", 0.0))
+            severe_toxic = float(scores_dict.get("severe_toxic", 0.0))
+
+            # Your original weighting logic
+            toxicity_score = max(toxic, severe_toxic * 1.2)
+
+        return min(max(toxicity_score, 0.0), 1.0)
+
     def detect(self, text: str) -> float:
         """
         Detect toxicity in text.
@@ -77,23 +96,24 @@ class DetoxifyToxicityDetector(IToxicityDetector):
             else:
                 scores_list = results
 
-            # Convert to a easy to read dictionary: {'toxic': 0.9, 'insult': 0.1, ...}
-            scores_dict = {item['label']: item['score'] for item in scores_list}
-            
-            # Scoring logic (Replica the original logic from your file)
-            if "multilingual" in self.model_alias or "unbiased" in self.model_alias:
-                # These models usually return a general 'toxicity' label
-                return float(scores_dict.get("toxicity", 0.0))
-            else:
-                # The 'original' (bert) model returns specific labels
-                toxic = float(scores_dict.get("toxic", 0.0))
-                severe_toxic = float(scores_dict.get("severe_toxic", 0.0))
-                
-                # Your original weighting logic
-                toxicity_score = max(toxic, severe_toxic * 1.2)
-            
-            return min(max(toxicity_score, 0.0), 1.0)
+            return self._score(scores_list)
             
         except Exception as e:
             print(f"Error during Toxicity detection: {e}. Using fallback.")
-            return 0.0
\ No newline at end of file
+            return 0.0
+
+    def detect_batch(self, texts: Sequence[str]) -> List[float]:
+        """Detect toxicity in several texts with one batched pipeline call."""
+        self._load_model()
+
+        if self._pipeline is None:
+            return [0.0] * len(texts)
+
+        try:
+            # One list of label scores per text
+            results = self._pipeline(list(texts), batch_size=len(texts))
+            return [self._score(scores_list) for scores_list in results]
+
+        except Exception as e:
+            print(f"Error during batched Toxicity detection: {e}. Using fallback.")
+            return [0.0] * len(texts)
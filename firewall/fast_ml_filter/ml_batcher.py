@@ -0,0 +1,177 @@
+"""Micro-batching of concurrent ML analyses."""
+
+import asyncio
+import logging
+from typing import List, Optional, Tuple
+
+from core.request_context import RequestContext
+from fast_ml_filter.ml_filter_service import MLFilterService, MLSignals
+
+logger = logging.getLogger(__name__)
+
+_Item = Tuple[str, Optional[RequestContext], asyncio.Future]
+
+
+class MLFilterBatcher:
+    """
+    Coalesce concurrent `analyze` calls into `MLFilterService.analyze_batch`.
+
+    Callers enqueue their text and await a future. A single worker task takes
+    the first queued item, collects more until `max_batch_size` is reached or
+    `max_delay_ms` has elapsed, runs one batched analysis and resolves every
+    future with its own result.
+
+    With `max_delay_ms=0` the worker only drains what is already queued: a
+    lone request is analyzed right away, while under load the requests that
+    arrive during one analysis form the next batch.
+
+    Exposes the same `analyze(text, context)` as `MLFilterService`, so it can
+    be injected wherever the service is. `close`/`aclose` stop the worker
+    when the owning gateway is dropped; a closed batcher analyzes each text
+    directly.
+    """
+
+    def __init__(
+        self,
+        ml_filter: MLFilterService,
+        max_batch_size: int = 16,
+        max_delay_ms: float = 0.0,
+        max_queue_size: int = 1024,
+    ) -> None:
+        """
+        Initialize the batcher.
+
+        Args:
+            ml_filter: ML filter service running the batched analyses
+            max_batch_size: Maximum number of texts per batch
+            max_delay_ms: Maximum time to wait for a batch to fill up
+            max_queue_size: Bound of pending analyses; callers wait when full
+        """
+        self._ml_filter = ml_filter
+        self._max_batch_size = max_batch_size
+        self._max_delay = max_delay_ms / 1000
+        self._max_queue_size = max_queue_size
+        # Created on first use, inside the running event loop
+        self._queue: Optional[asyncio.Queue[_Item]] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._closed = False
+
+    async def analyze(self, text: str, context: RequestContext | None = None) -> MLSignals:
+        """
+        Analyze a text as part of the next batch.
+
+        Args:
+            text: Text to analyze
+            context: Request context
+        Returns:
+            MLSignals of the text
+        """
+        if self._closed:
+            return await self._ml_filter.analyze(text, context)
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self._max_queue_size)
+        # Restart a dead worker on the same queue: items already queued by
+        # other callers must not be orphaned
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((text, context, future))
+        if self._closed:
+            # Closed while waiting for room in the queue: no worker is left
+            self._fail_queued()
+        return await future
+
+    def close(self) -> None:
+        """
+        Stop the worker and fail the analyses still queued.
+
+        Safe to call from synchronous code on the event loop thread; the
+        batch being analyzed is failed when the worker's cancellation lands.
+        """
+        self._closed = True
+        if self._worker is not None:
+            self._worker.cancel()
+        self._fail_queued()
+
+    async def aclose(self) -> None:
+        """Close the batcher and wait for its worker to finish."""
+        self.close()
+        if self._worker is not None:
+            await asyncio.gather(self._worker, return_exceptions=True)
+
+    def _fail_queued(self) -> None:
+        """Fail the futures of every queued analysis."""
+        queue = self._queue
+        while queue is not None and not queue.empty():
+            _fail(queue.get_nowait()[2], RuntimeError("ML batcher closed"))
+
+    async def _collect(self) -> List[_Item]:
+        """Wait for the first item, then gather a batch behind it."""
+        queue = self._queue
+        batch = [await queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self._max_delay
+        while len(batch) < self._max_batch_size:
+            if not queue.empty():
+                batch.append(queue.get_nowait())
+                continue
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self) -> None:
+        """Worker: analyze queued texts batch by batch."""
+        while True:
+            batch = await self._collect()
+            # Skip callers that gave up (e.g. client disconnected)
+            batch = [item for item in batch if not item[2].done()]
+            if not batch:
+                continue
+            # Similar lengths next to each other: less padding in batched inference
+            batch.sort(key=lambda item: len(item[0]))
+            try:
+                await self._analyze(batch)
+            except asyncio.CancelledError:
+                for _, _, future in batch:
+                    _fail(future, RuntimeError("ML batcher closed"))
+                raise
+
+    async def _analyze(self, batch: List[_Item]) -> None:
+        """
+        Analyze a batch and resolve the future of each of its items.
+
+        If the batched analysis fails, each item is analyzed on its own, so
+        one bad text or detector error only fails its own caller.
+        """
+        try:
+            results = await self._ml_filter.analyze_batch(
+                [text for text, _, _ in batch],
+                [context for _, context, _ in batch],
+            )
+            resolved = list(zip(batch, results, strict=True))
+        except Exception as exc:
+            logger.error("Batched ML analysis failed, analyzing texts one by one: %s", exc)
+            outcomes = await asyncio.gather(
+                *(self._ml_filter.analyze(text, context) for text, context, _ in batch),
+                return_exceptions=True,
+            )
+            resolved = list(zip(batch, outcomes, strict=True))
+        for (_, _, future), outcome in resolved:
+            if future.done():
+                continue
+            if isinstance(outcome, BaseException):
+                future.set_exception(outcome)
+            else:
+                future.set_result(outcome)
+
+
+def _fail(future: asyncio.Future, exc: Exception) -> None:
+    """Set `exc` on a caller's future unless it is already resolved."""
+    if not future.done():
+        future.set_exception(exc)
@@ -3,7 +3,7 @@
 import asyncio
 import time
 from dataclasses import dataclass
-from typing import Dict, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 
 from core.request_context import RequestContext
 from fast_ml_filter.detector_factory import DetectorFactory
@@ -13,14 +13,14 @@ from fast_ml_filter.ports.prompt_injection_detector_port import IPromptInjection
 from fast_ml_filter.ports.toxicity_detector_port import IToxicityDetector
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class DetectorMetrics:
     """Métricas de un detector individual."""
     score: float
     latency_ms: float
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class MLSignals:
     """Data structure for ML detection signals."""
 
@@ -157,6 +157,80 @@ class MLFilterService:
 
         latency_ms = (time.time() - start_time) * 1000
 
+        return self._to_signals(
+            pii_score, pii_latency,
+            toxicity_score, toxicity_latency,
+            prompt_injection_score, prompt_injection_latency,
+            heuristic_result, heuristic_latency,
+            latency_ms,
+        )
+
+    async def analyze_batch(
+        self,
+        texts: Sequence[str],
+        contexts: Optional[Sequence[RequestContext | None]] = None,
+    ) -> List[MLSignals]:
+        """
+        Analyze several texts with all detectors in parallel.
+
+        Each detector runs once over the whole batch (`detect_batch`), in its
+        own worker thread, so detectors with batched inference amortize the
+        per-call model overhead. The detector latencies reported for every
+        text are those of the batch.
+
+        Args:
+            texts: Texts to analyze
+            contexts: Request context per text (defaults to no context)
+
+        Returns:
+            MLSignals per text, in order
+        """
+        if contexts is None:
+            contexts = [None] * len(texts)
+        start_time = time.perf_counter()
+
+        async def run(detect_batch: Callable[..., list], *args: Any) -> Tuple[list, float]:
+            detector_start = time.perf_counter()
+            results = await asyncio.to_thread(detect_batch, *args)
+            return results, (time.perf_counter() - detector_start) * 1000
+
+        (pii_scores, pii_latency), (toxicity_scores, toxicity_latency), \
+        (prompt_injection_scores, prompt_injection_latency), \
+        (heuristic_results, heuristic_latency) = await asyncio.gather(
+            run(self.pii_detector.detect_batch, texts),
+            run(self.toxicity_detector.detect_batch, texts),
+            run(self.prompt_injection_detector.detect_batch, texts, contexts),
+            run(self.heuristic_detector.detect_batch, texts),
+        )
+
+        latency_ms = (time.perf_counter() - start_time) * 1000
+
+        return [
+            self._to_signals(
+                pii_score, pii_latency,
+                toxicity_score, toxicity_latency,
+                prompt_injection_score, prompt_injection_latency,
+                heuristic_result, heuristic_latency,
+                latency_ms,
+            )
+            for pii_score, toxicity_score, prompt_injection_score, heuristic_result in zip(
+                pii_scores, toxicity_scores, prompt_injection_scores, heuristic_results, strict=True
+            )
+        ]
+
+    @staticmethod
+    def _to_signals(
+        pii_score: float,
+        pii_latency: float,
+        toxicity_score: float,
+        toxicity_latency: float,
+        prompt_injection_score: float,
+        prompt_injection_latency: float,
+        heuristic_result: Dict,
+        heuristic_latency: float,
+        latency_ms: float,
+    ) -> MLSignals:
+        """Build the MLSignals of one text from its detector results."""
         return MLSignals(
             pii_score=pii_score,
             toxicity_score=toxicity_score,
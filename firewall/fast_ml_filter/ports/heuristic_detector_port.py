@@ -1,7 +1,7 @@
 """Port for heuristic detection."""
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict
+from typing import Any, Dict, List, Sequence
 
 
 class IHeuristicDetector(ABC):
@@ -22,3 +22,15 @@ class IHeuristicDetector(ABC):
             - reason: str (if blocked)
         """
         pass
+
+    def detect_batch(self, texts: Sequence[str]) -> List[Dict[str, Any]]:
+        """
+        Detect issues in several texts.
+
+        Args:
+            texts: Texts to analyze
+
+        Returns:
+            Detection results per text, in order (see `detect`)
+        """
+        return [self.detect(text) for text in texts]
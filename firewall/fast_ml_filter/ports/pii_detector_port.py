@@ -1,6 +1,7 @@
 """Port for PII detection."""
 
 from abc import ABC, abstractmethod
+from typing import List, Sequence
 
 
 class IPIIDetector(ABC):
@@ -18,3 +19,18 @@ class IPIIDetector(ABC):
             PII score between 0.0 and 1.0 (1.0 = high confidence PII detected)
         """
         pass
+
+    def detect_batch(self, texts: Sequence[str]) -> List[float]:
+        """
+        Detect PII in several texts.
+
+        Implementations that can run one batched inference should override
+        this; the default runs `detect` on each text.
+
+        Args:
+            texts: Texts to analyze
+
+        Returns:
+            PII score per text, in order
+        """
+        return [self.detect(text) for text in texts]
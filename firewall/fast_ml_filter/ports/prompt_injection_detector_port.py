@@ -1,6 +1,8 @@
 """Port for prompt injection detection."""
 
 from abc import ABC, abstractmethod
+from typing import List, Sequence
+
 from core.request_context import RequestContext
 
 
@@ -19,3 +21,23 @@ class IPromptInjectionDetector(ABC):
             Prompt injection score between 0.0 and 1.0 (1.0 = high confidence prompt injection detected)
         """
         pass
+
+    def detect_batch(
+        self,
+        texts: Sequence[str],
+        contexts: Sequence[RequestContext | None],
+    ) -> List[float]:
+        """
+        Detect prompt injection in several texts.
+
+        Implementations that can run one batched inference should override
+        this; the default runs `detect` on each text.
+
+        Args:
+            texts: Texts to analyze
+            contexts: Request context per text
+
+        Returns:
+            Prompt injection score per text, in order
+        """
+        return [self.detect(text, context) for text, context in zip(texts, contexts, strict=True)]
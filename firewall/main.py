@@ -1,37 +1,35 @@
 import uvicorn
 from fastapi import FastAPI
 
-from container import FirewallContainer
+from config import FirewallConfig
 from semantic_firewall import app as semantic_app  # Existing routers/endpoints
-from core.bootstrap import register_startup_events
+from services import get_config
 
 
-def create_app(container: FirewallContainer) -> FastAPI:
+def create_app() -> FastAPI:
     """
     Create FastAPI instance and register routers/events.
 
     For now we reuse the app already defined in `semantic_firewall.py`
     to avoid breaking the behavior while the refactor is completed.
     Later, the routers will be extracted and explicitly included here.
+    The bootstrap hooks (startup, warm-up) are attached to that app
+    through its lifespan (`core.bootstrap.lifespan`).
     """
-    # For now we simply reuse the existing app,
-    # but register the bootstrap hooks (startup, etc.).
-    register_startup_events(semantic_app)
     return semantic_app
 
 
-def create_application() -> tuple[FastAPI, object]:
+def create_application() -> tuple[FastAPI, FirewallConfig]:
     """
     Create the FastAPI application and the associated configuration.
 
     Returns:
         Tuple containing the FastAPI application and the configuration
     """
-    container = FirewallContainer()
-    app = create_app(container)
+    app = create_app()
 
-    # For now we use directly the config from the container; later it can be wrapped in a more explicit configuration provider.
-    app_config = container.config()
+    # For now we use directly the shared config; later it can be wrapped in a more explicit configuration provider.
+    app_config = get_config()
     return app, app_config
 
 
@@ -52,6 +50,7 @@ def run_application() -> None:
         log_level=str(log_level).lower(),
         access_log=str(environment).lower() == "development",
         reload=str(environment).lower() == "development",
+        loop="uvloop",
     )
 
 
@@ -8,30 +8,62 @@ import threading
 import time
 from collections import deque
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta, timezone
-from typing import Dict, List, Optional
+from datetime import datetime
+from typing import Any, Dict, List, Mapping, Optional
+
+import numpy as np
+
+from core.events import StandardizedEvent
 
 logger = logging.getLogger(__name__)
 
+# Detector score keys of `RequestEvent.scores`, in column order
+SCORE_KEYS = ("prompt_injection", "pii", "toxicity", "heuristic")
+
+# Fraction of the threshold from which a score is reported as "warn"
+WARN_RATIO = 0.7
+
+# Column codes of the categorical fields; unknown values get the last code
+RISK_LEVELS = ("benign", "suspicious", "malicious")
+RISK_CATEGORIES = ("injection", "pii", "toxicity", "leak", "harmful", "clean")
+LATENCY_FIELDS = ("preprocessing", "ml", "policy", "backend", "total")
+
+_RISK_LEVEL_CODES = {level: code for code, level in enumerate(RISK_LEVELS)}
+_RISK_CATEGORY_CODES = {category: code for code, category in enumerate(RISK_CATEGORIES)}
+
+# Trend score per risk level code (benign, suspicious, malicious, unknown)
+_RISK_LEVEL_SCORES = np.array([0.0, 0.5, 1.0, 0.0])
+
+
+def bucket_statuses(scores: np.ndarray, thresholds: np.ndarray) -> np.ndarray:
+    """
+    Count pass/warn/block statuses per detector with vectorized compares.
+
+    Uses the same bands as the per-request detector status: block from the
+    threshold, warn from `WARN_RATIO` of it, pass below.
+
+    Args:
+        scores: `(n_requests, n_detectors)` score matrix
+        thresholds: `(n_detectors,)` block thresholds
+
+    Returns:
+        `(3, n_detectors)` counts; rows are pass, warn and block
+    """
+    block = scores >= thresholds
+    block_counts = block.sum(axis=0)
+    warn_counts = (scores >= thresholds * WARN_RATIO).sum(axis=0) - block_counts
+    pass_counts = scores.shape[0] - block_counts - warn_counts
+    return np.stack((pass_counts, warn_counts, block_counts))
 
-@dataclass
-class RequestEvent:
-    """Represents a single request event with all metrics."""
-
-    id: str
-    timestamp: str
-    prompt: str
-    response: str
-    risk_level: str  # benign | suspicious | malicious
-    risk_category: str  # injection | pii | toxicity | leak | harmful | clean
-    scores: Dict[str, float]
-    heuristics: List[str]
-    policy: Dict[str, str]
-    action: str  # allow | block
-    latency_ms: Dict[str, float]
-    session_id: Optional[str] = None
-    preprocessing_info: Optional[Dict[str, int]] = None
-    detector_config: Optional[Dict[str, str]] = None
+
+# Requests are stored as the dashboard events built by
+# `create_standardized_event`, without re-creating them
+RequestEvent = StandardizedEvent
+
+
+def _slots_dict(obj: Any) -> Dict[str, Any]:
+    """Shallow dict of a slotted dataclass (no deep copy, unlike `asdict`)."""
+    return {name: getattr(obj, name) for name in obj.__slots__}
 
 
 @dataclass
@@ -53,14 +85,38 @@ class MetricsManager:
     Stores last N requests in memory and provides KPI calculations.
     """
 
-    def __init__(self, max_requests: int = 500):
+    def __init__(
+        self,
+        max_requests: int = 500,
+        score_thresholds: Optional[Mapping[str, float]] = None,
+    ) -> None:
         """
         Initialize the metrics manager.
 
         Args:
             max_requests: Maximum number of requests to store in memory
+            score_thresholds: Block threshold per detector score key; detectors
+                without one are left out of the status counts
         """
         self._max_requests = max_requests
+        score_thresholds = score_thresholds or {}
+        self._status_keys = tuple(k for k in SCORE_KEYS if k in score_thresholds)
+        self._status_columns = [SCORE_KEYS.index(k) for k in self._status_keys]
+        self._thresholds = np.array(
+            [score_thresholds[k] for k in self._status_keys], dtype=np.float64
+        )
+
+        # Columnar ring buffers (one row per request, written at
+        # `_head % max_requests`); aggregations run as NumPy reductions.
+        # The deque keeps the full events for `get_recent`.
+        self._head = 0
+        self._scores = np.zeros((max_requests, len(SCORE_KEYS)), dtype=np.float64)
+        self._latencies = np.zeros((max_requests, len(LATENCY_FIELDS)), dtype=np.float64)
+        self._timestamps = np.zeros(max_requests, dtype=np.float64)  # epoch seconds
+        self._blocked = np.zeros(max_requests, dtype=np.bool_)
+        self._risk_levels = np.zeros(max_requests, dtype=np.int8)
+        self._risk_categories = np.zeros(max_requests, dtype=np.int8)
+
         self._requests: deque[RequestEvent] = deque(maxlen=max_requests)
         self._sessions: Dict[str, SessionInfo] = {}
         self._lock = threading.RLock()
@@ -73,9 +129,24 @@ class MetricsManager:
         Args:
             event: RequestEvent to add
         """
+        scores = event.scores
+        latency = event.latency_ms
+        timestamp = datetime.fromisoformat(event.timestamp.replace("Z", "+00:00")).timestamp()
+
         with self._lock:
             self._requests.append(event)
 
+            row = self._head % self._max_requests
+            self._head += 1
+            self._scores[row] = [scores.get(key, 0.0) for key in SCORE_KEYS]
+            self._latencies[row] = [getattr(latency, name) for name in LATENCY_FIELDS]
+            self._timestamps[row] = timestamp
+            self._blocked[row] = event.action == "block"
+            self._risk_levels[row] = _RISK_LEVEL_CODES.get(event.risk_level, len(RISK_LEVELS))
+            self._risk_categories[row] = _RISK_CATEGORY_CODES.get(
+                event.risk_category, len(RISK_CATEGORIES)
+            )
+
             # Update session analytics if session_id is present
             if event.session_id:
                 if event.session_id not in self._sessions:
@@ -92,9 +163,18 @@ class MetricsManager:
                 elif event.risk_level == "suspicious":
                     session.suspicious_count += 1
 
-            logger.debug(
-                f"Added request {event.id}, total requests: {len(self._requests)}"
-            )
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Added request %s, total requests: %s", event.id, len(self._requests)
+                )
+
+    def _size(self) -> int:
+        """Number of stored requests (filled rows of the ring buffers)."""
+        return min(self._head, self._max_requests)
+
+    def _chronological_rows(self) -> np.ndarray:
+        """Ring buffer rows ordered from the oldest to the newest request."""
+        return np.arange(self._head - self._size(), self._head) % self._max_requests
 
     def get_stats(self) -> Dict:
         """
@@ -104,64 +184,39 @@ class MetricsManager:
             Dictionary with KPIs and aggregated stats
         """
         with self._lock:
-            if not self._requests:
+            total = self._size()
+            if not total:
                 return self._empty_stats()
 
-            total = len(self._requests)
-            benign = sum(1 for r in self._requests if r.risk_level == "benign")
-            suspicious = sum(1 for r in self._requests if r.risk_level == "suspicious")
-            malicious = sum(1 for r in self._requests if r.risk_level == "malicious")
-            blocked = sum(1 for r in self._requests if r.action == "block")
+            level_counts = np.bincount(
+                self._risk_levels[:total], minlength=len(RISK_LEVELS) + 1
+            )
+            benign, suspicious, malicious = (int(c) for c in level_counts[: len(RISK_LEVELS)])
+            blocked = int(np.count_nonzero(self._blocked[:total]))
             allowed = total - blocked
 
             # Calculate percentages
-            benign_pct = (benign / total * 100) if total > 0 else 0
-            suspicious_pct = (suspicious / total * 100) if total > 0 else 0
-            malicious_pct = (malicious / total * 100) if total > 0 else 0
+            benign_pct = benign / total * 100
+            suspicious_pct = suspicious / total * 100
+            malicious_pct = malicious / total * 100
 
             # Calculate ratio
             ratio = f"1:{allowed // blocked if blocked > 0 else allowed}"
 
             # Calculate prompts per minute (last 5 minutes)
-            now = datetime.now(timezone.utc)
-            five_min_ago = now - timedelta(minutes=5)
-            recent = [
-                r for r in self._requests if datetime.fromisoformat(r.timestamp.replace("Z", "+00:00")) > five_min_ago
-            ]
-            prompts_per_min = len(recent) / 5 if recent else 0
+            recent_count = int(np.count_nonzero(self._timestamps[:total] > time.time() - 300))
+            prompts_per_min = recent_count / 5
 
             # Calculate average latencies
-            avg_latency = {
-                "preprocessing": sum(
-                    r.latency_ms.get("preprocessing", 0) for r in self._requests
-                )
-                / total,
-                "ml": sum(r.latency_ms.get("ml", 0) for r in self._requests) / total,
-                "policy": sum(r.latency_ms.get("policy", 0) for r in self._requests)
-                / total,
-                "backend": sum(r.latency_ms.get("backend", 0) for r in self._requests)
-                / total,
-                "total": sum(r.latency_ms.get("total", 0) for r in self._requests)
-                / total,
-            }
+            avg_latency = dict(
+                zip(LATENCY_FIELDS, self._latencies[:total].mean(axis=0).tolist(), strict=True)
+            )
 
             # Risk trend (compare last 10% vs previous)
+            risk = _RISK_LEVEL_SCORES[self._risk_levels[self._chronological_rows()]]
             split_point = max(1, total // 10)
-            recent_slice = list(self._requests)[-split_point:]
-            previous_slice = list(self._requests)[:-split_point] if total > split_point else []
-            
-            recent_risk_avg = (
-                sum(self._risk_level_to_score(r.risk_level) for r in recent_slice)
-                / len(recent_slice)
-                if recent_slice
-                else 0
-            )
-            previous_risk_avg = (
-                sum(self._risk_level_to_score(r.risk_level) for r in previous_slice)
-                / len(previous_slice)
-                if previous_slice
-                else 0
-            )
+            recent_risk_avg = float(risk[-split_point:].mean())
+            previous_risk_avg = float(risk[:-split_point].mean()) if total > split_point else 0
             
             risk_trend = "increasing" if recent_risk_avg > previous_risk_avg else "decreasing" if recent_risk_avg < previous_risk_avg else "stable"
 
@@ -180,8 +235,22 @@ class MetricsManager:
                 "risk_trend": risk_trend,
                 "avg_latency_ms": avg_latency,
                 "risk_breakdown": self.get_risk_breakdown(),
+                "detector_status": self._detector_status(),
             }
 
+    def _detector_status(self) -> Dict[str, Dict[str, int]]:
+        """Pass/warn/block counts per detector over the stored requests."""
+        scores = self._scores[: self._size(), self._status_columns]
+        counts = bucket_statuses(scores, self._thresholds)
+        return {
+            key: {
+                "pass": int(counts[0, i]),
+                "warn": int(counts[1, i]),
+                "block": int(counts[2, i]),
+            }
+            for i, key in enumerate(self._status_keys)
+        }
+
     def get_recent(self, limit: int = 50) -> List[Dict]:
         """
         Get the most recent N requests.
@@ -204,22 +273,15 @@ class MetricsManager:
             Dictionary mapping risk categories to counts
         """
         with self._lock:
-            breakdown = {
-                "injection": 0,
-                "pii": 0,
-                "toxicity": 0,
-                "leak": 0,
-                "harmful": 0,
-                "clean": 0,
+            counts = np.bincount(
+                self._risk_categories[: self._size()], minlength=len(RISK_CATEGORIES) + 1
+            )
+            # The last bucket holds unknown categories, which are not reported
+            return {
+                category: int(count)
+                for category, count in zip(RISK_CATEGORIES, counts[: len(RISK_CATEGORIES)], strict=True)
             }
 
-            for req in self._requests:
-                category = req.risk_category
-                if category in breakdown:
-                    breakdown[category] += 1
-
-            return breakdown
-
     def get_session_analytics(self, top_n: int = 5) -> List[Dict]:
         """
         Get analytics for top N sessions with most suspicious/malicious activity.
@@ -260,41 +322,35 @@ class MetricsManager:
         Returns:
             Dictionary with timestamps and category counts
         """
+        n_categories = len(RISK_CATEGORIES)
         with self._lock:
-            now = datetime.now(timezone.utc)
-            cutoff = now - timedelta(minutes=minutes)
-
-            # Group requests by minute
-            minute_buckets = {}
-            for req in self._requests:
-                req_time = datetime.fromisoformat(req.timestamp.replace("Z", "+00:00"))
-                if req_time > cutoff:
-                    minute_key = req_time.strftime("%Y-%m-%d %H:%M")
-                    if minute_key not in minute_buckets:
-                        minute_buckets[minute_key] = {
-                            "injection": 0,
-                            "pii": 0,
-                            "toxicity": 0,
-                            "leak": 0,
-                            "harmful": 0,
-                            "clean": 0,
-                        }
-                    minute_buckets[minute_key][req.risk_category] += 1
-
-            # Convert to arrays sorted by time
-            timestamps = sorted(minute_buckets.keys())
-            return {
-                "timestamps": timestamps,
-                "categories": {
-                    category: [minute_buckets[ts][category] for ts in timestamps]
-                    for category in ["injection", "pii", "toxicity", "leak", "harmful", "clean"]
-                },
-            }
+            size = self._size()
+            timestamps = self._timestamps[:size]
+            categories = self._risk_categories[:size]
+            in_window = (timestamps > time.time() - minutes * 60) & (categories < n_categories)
+            timestamps = timestamps[in_window]
+            categories = categories[in_window].astype(np.int64)
+
+        # Group requests by minute (epoch minutes, UTC): one row per occupied
+        # minute, sorted by time, one column per category
+        minute_ids, bucket_idx = np.unique(
+            (timestamps // 60).astype(np.int64), return_inverse=True
+        )
+        counts = np.bincount(
+            bucket_idx * n_categories + categories,
+            minlength=len(minute_ids) * n_categories,
+        ).reshape(len(minute_ids), n_categories)
 
-    @staticmethod
-    def _risk_level_to_score(risk_level: str) -> float:
-        """Convert risk level to numeric score for trend calculation."""
-        return {"benign": 0, "suspicious": 0.5, "malicious": 1.0}.get(risk_level, 0)
+        return {
+            "timestamps": [
+                time.strftime("%Y-%m-%d %H:%M", time.gmtime(minute * 60))
+                for minute in minute_ids.tolist()
+            ],
+            "categories": {
+                category: counts[:, code].tolist()
+                for code, category in enumerate(RISK_CATEGORIES)
+            },
+        }
 
     @staticmethod
     def _empty_stats() -> Dict:
@@ -327,6 +383,7 @@ class MetricsManager:
                 "harmful": 0,
                 "clean": 0,
             },
+            "detector_status": {},
         }
 
     @staticmethod
@@ -341,11 +398,13 @@ class MetricsManager:
             "risk_category": event.risk_category,
             "scores": event.scores,
             "heuristics": event.heuristics,
-            "policy": event.policy,
+            "policy": _slots_dict(event.policy),
             "action": event.action,
-            "latency_ms": event.latency_ms,
+            "latency_ms": _slots_dict(event.latency_ms),
             "session_id": event.session_id,
-            "preprocessing_info": event.preprocessing_info,
+            "preprocessing_info": _slots_dict(event.preprocessing_info)
+            if event.preprocessing_info
+            else None,
             "detector_config": event.detector_config,
         }
 
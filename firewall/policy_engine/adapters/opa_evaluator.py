@@ -1,11 +1,15 @@
 """OPA-based policy evaluator adapter using HTTP client."""
 
+import hashlib
 import logging
-from typing import Any, Dict
+import threading
+import time
+from typing import Any, ClassVar, Dict, Optional, Tuple
 
 import httpx
-from policy_engine.ports.policy_evaluator_port import IPolicyEvaluator
+
 from core.utils.decorators import log_execution_time
+from policy_engine.ports.policy_evaluator_port import IPolicyEvaluator
 
 logger = logging.getLogger(__name__)
 
@@ -13,10 +17,18 @@ logger = logging.getLogger(__name__)
 class OPAEvaluator(IPolicyEvaluator):
     """OPA-based policy evaluator using Rego via HTTP API."""
 
+    # Policies already pushed to OPA, shared across evaluator instances:
+    # (opa_url, policy_id) -> (policy hash, monotonic time it was last confirmed)
+    _loaded_policies: ClassVar[Dict[Tuple[str, str], Tuple[str, float]]] = {}
+    # Serializes revalidations and uploads, so concurrent requests with an
+    # expired entry push the policy once
+    _loaded_policies_lock: ClassVar[threading.Lock] = threading.Lock()
+
     def __init__(
         self,
         opa_url: str = "http://localhost:8181",
         opa_policy_name: str = "firewall/policy",
+        policy_cache_ttl: float = 300.0,
     ):
         """
         Initialize OPA evaluator.
@@ -24,12 +36,20 @@ class OPAEvaluator(IPolicyEvaluator):
         Args:
             opa_url: URL of OPA server (default: http://localhost:8181)
             opa_policy_name: Policy name/path in OPA (default: firewall/policy)
+            policy_cache_ttl: Seconds a loaded policy is trusted before it is
+                re-validated against the OPA server (default: 300)
         """
         self.opa_url = opa_url.rstrip("/")
         self.opa_policy_name = opa_policy_name
+        self.policy_cache_ttl = policy_cache_ttl
         self.client = httpx.Client(timeout=5.0)
-        self._policy_loaded = False
-        self._current_policy_hash = None
+        self._policy_id = opa_policy_name.replace("/", ".")
+        self._policies_url = f"{self.opa_url}/v1/policies/{self._policy_id}"
+        self._decision_url = f"{self.opa_url}/v1/data/{opa_policy_name}/decision"
+        self._cache_key = (self.opa_url, self._policy_id)
+        # Last policy text seen by this instance and its hash, to skip
+        # rehashing; one tuple so concurrent readers never see a mixed pair
+        self._last_policy: Optional[Tuple[str, str]] = None
 
     def _check_health(self) -> bool:
         """Check if OPA server is healthy."""
@@ -40,37 +60,80 @@ class OPAEvaluator(IPolicyEvaluator):
             logger.error(f"OPA health check failed: {e}")
             return False
 
+    def _policy_hash(self, rego_policy: str) -> str:
+        """Return the hash of the policy, reusing it while the text is unchanged."""
+        last = self._last_policy
+        if last is not None and last[0] is rego_policy:
+            return last[1]
+        policy_hash = hashlib.md5(rego_policy.encode()).hexdigest()
+        self._last_policy = (rego_policy, policy_hash)
+        return policy_hash
+
+    def _remote_policy_matches(self, policy_hash: str) -> bool:
+        """Check whether OPA still holds the policy with the given hash."""
+        try:
+            response = self.client.get(self._policies_url)
+        except httpx.RequestError as e:
+            logger.warning("Could not revalidate policy in OPA: %s", e)
+            return False
+
+        if response.status_code != 200:
+            return False
+
+        raw = response.json().get("result", {}).get("raw", "")
+        return hashlib.md5(raw.encode()).hexdigest() == policy_hash
+
     @log_execution_time()
     def _load_policy(self, rego_policy: str) -> None:
         """
         Load Rego policy into OPA server.
 
+        The policy is pushed only when it changed or OPA no longer holds it.
+        Within the cache TTL no request is made; after it expires the policy
+        stored in OPA is fetched and compared before re-uploading.
+
         Args:
             rego_policy: Rego policy content as string
         """
-        import hashlib
-
-        # Check if policy has changed
-        policy_hash = hashlib.md5(rego_policy.encode()).hexdigest()
-        if self._current_policy_hash == policy_hash and self._policy_loaded:
-            logger.debug("Policy unchanged, skipping reload")
+        policy_hash = self._policy_hash(rego_policy)
+        if self._is_fresh(policy_hash):
             return
 
+        with self._loaded_policies_lock:
+            # Another request may have confirmed or pushed it meanwhile
+            if not self._is_fresh(policy_hash):
+                self._push_policy(rego_policy, policy_hash)
+
+    def _is_fresh(self, policy_hash: str) -> bool:
+        """Check whether the policy was confirmed in OPA within the cache TTL."""
+        cached = self._loaded_policies.get(self._cache_key)
+        return (
+            cached is not None
+            and cached[0] == policy_hash
+            and time.monotonic() - cached[1] < self.policy_cache_ttl
+        )
+
+    def _push_policy(self, rego_policy: str, policy_hash: str) -> None:
+        """Revalidate the policy in OPA and upload it if OPA does not hold it."""
+        now = time.monotonic()
+        cached = self._loaded_policies.get(self._cache_key)
+        if cached is not None and cached[0] == policy_hash:
+            if self._remote_policy_matches(policy_hash):
+                logger.debug("Policy unchanged in OPA, skipping reload")
+                self._loaded_policies[self._cache_key] = (policy_hash, now)
+                return
+
         try:
             # OPA API: PUT /v1/policies/{policy_name}
-            policy_name = self.opa_policy_name.replace("/", ".")
-            url = f"{self.opa_url}/v1/policies/{policy_name}"
-
             response = self.client.put(
-                url,
+                self._policies_url,
                 content=rego_policy,
                 headers={"Content-Type": "text/plain"},
             )
 
             if response.status_code in (200, 201):
-                logger.info(f"Policy '{policy_name}' loaded successfully into OPA")
-                self._policy_loaded = True
-                self._current_policy_hash = policy_hash
+                logger.info(f"Policy '{self._policy_id}' loaded successfully into OPA")
+                self._loaded_policies[self._cache_key] = (policy_hash, now)
             else:
                 error_msg = (
                     f"Failed to load policy: {response.status_code} - {response.text}"
@@ -94,11 +157,8 @@ class OPAEvaluator(IPolicyEvaluator):
         """
         try:
             # OPA API: POST /v1/data/{policy_path}
-            data_path = self.opa_policy_name
-            url = f"{self.opa_url}/v1/data/{data_path}/decision"
-
             response = self.client.post(
-                url,
+                self._decision_url,
                 json={"input": input_data},
             )
 
@@ -159,7 +219,7 @@ class OPAEvaluator(IPolicyEvaluator):
         }
 
         try:
-            # Load policy (only if changed)
+            # Load policy (only if changed or the cache entry expired)
             self._load_policy(rego_policy)
 
             # Evaluate policy
@@ -12,7 +12,7 @@ from policy_engine.ports.tenant_context_port import ITenantContextProvider
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PolicyDecision:
     """Data structure for policy decision."""
 
@@ -82,7 +82,7 @@ class PolicyService:
             "heuristic_flags": ml_signals.heuristic_flags,
             "heuristic_reason": ml_signals.heuristic_reason,
         }
-        logger.info(f"ML signals: {ml_signals_dict}")
+        logger.info("ML signals: %s", ml_signals_dict)
 
         # Evaluate - pass policies to evaluator
         result = self.evaluator.evaluate(
@@ -11,7 +11,7 @@ from preprocessor.ports.vector_store_port import IVectorStore
 from preprocessor.ports.vectorizer_port import IVectorizer
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PreprocessedData:
     """Data structure for preprocessed text."""
 
@@ -0,0 +1,37 @@
+"""
+Quantize the prompt injection classifier to INT8.
+
+Dynamic quantization of the MatMul/Gemm weights of the classifier head
+(float activations, int8 weights). The quantized model is written next to
+the original as `<name>.int8.onnx`, with the same input/output names, and is
+picked up automatically by `CustomONNXPromptInjectionDetector`.
+
+Usage:
+    python scripts/quantize_prompt_injection_model.py [models/SF_model_v1.onnx]
+"""
+
+import sys
+from pathlib import Path
+
+from onnxruntime.quantization import QuantType, quantize_dynamic
+
+
+def quantize_prompt_injection_model(model_path: Path) -> Path:
+    """Quantize `model_path` and return the path of the INT8 model."""
+    output_path = model_path.with_suffix(".int8.onnx")
+
+    print(f"Quantizing model: {model_path}")
+    quantize_dynamic(
+        str(model_path),
+        str(output_path),
+        weight_type=QuantType.QInt8,
+        op_types_to_quantize=["MatMul", "Gemm"],
+    )
+    print(f"Quantized model saved to {output_path}")
+    return output_path
+
+
+if __name__ == "__main__":
+    path = Path(sys.argv[1] if len(sys.argv) > 1 else "models/SF_model_v1.onnx")
+    quantize_prompt_injection_model(path)
+    print("Done!")
@@ -1,7 +1,7 @@
 import asyncio
+import atexit
 import logging
 import os
-import uuid
 from typing import Optional, Any
 
 from fastapi import (
@@ -15,10 +15,17 @@ from fastapi import (
     UploadFile,
     File,
     Form,
+    Query,
 )
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
+from pydantic import TypeAdapter, ValidationError
 from benchmark.dataset_loader import DatasetLoader
-from core.gateway import get_default_gateway
+from core.bootstrap import lifespan
+from core.logging_ctx import install_queue_logging, install_request_id_logging
+from core.gateway import clear_gateway_cache
+from core.gateway.factory_cache import clear_detector_cache, get_factory
 from core.realtime import manager
 from core.metrics import metrics_service
 from core.benchmarks import benchmark_service
@@ -43,6 +50,9 @@ if DEBUG_MODE:
 
 
 logging.basicConfig(level=logging.INFO)
+install_request_id_logging()
+# Log I/O off the request path; flushed at exit
+atexit.register(install_queue_logging().stop)
 logger = logging.getLogger(__name__)
 
 TENANT_ID = os.getenv("TENANT_ID", "default")
@@ -51,9 +61,12 @@ TENANT_ID = os.getenv("TENANT_ID", "default")
 BENCHMARK_DB_PATH = os.getenv("BENCHMARK_DB_PATH", "benchmarks.db")
 
 
-firewall = get_default_gateway()
-
-app = FastAPI(title="SPG Semantic Firewall")
+# orjson for every JSON route (metrics, benchmarks, ...), skipping the stdlib encoder
+app = FastAPI(
+    title="SPG Semantic Firewall",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -62,6 +75,11 @@ app.add_middleware(
 )
 
 
+# Compiled once: validation/serialization of the chat hot route
+_CHAT_REQUEST_ADAPTER = TypeAdapter(ChatRequest)
+_CHAT_RESPONSE_ADAPTER = TypeAdapter(ChatResponse)
+
+
 # Routers by context
 chat_router = APIRouter()
 realtime_router = APIRouter()
@@ -69,18 +87,18 @@ metrics_router = APIRouter()
 benchmarks_router = APIRouter()
 
 
-def generate_request_id() -> str:
-    """
-    Generate a unique request ID.
-
-    Returns:
-        Unique request ID
-    """
-    return str(uuid.uuid4())
-
-
-@chat_router.post("/api/chat", response_model=ChatResponse)
-async def chat_endpoint(payload: ChatRequest, request: Request) -> ChatResponse:
+@chat_router.post(
+    "/api/chat",
+    response_model=ChatResponse,
+    response_class=ORJSONResponse,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": ChatRequest.model_json_schema()}},
+        }
+    },
+)
+async def chat_endpoint(request: Request) -> Response:
     """
     Main endpoint for chat with firewall integrated.
 
@@ -90,19 +108,37 @@ async def chat_endpoint(payload: ChatRequest, request: Request) -> ChatResponse:
     3. Analysis egress (backend response)
     4. Return response or block
 
+    The body is validated and the response serialized with module-level
+    `TypeAdapter`s (compiled once), bypassing FastAPI's per-request body
+    and response_model handling on this hot route.
+
     Args:
-        payload: User message
-        request: Request object
+        request: Request object; its JSON body is a `ChatRequest`
 
     Returns:
         Backend response or block message with metrics from detectors
 
     Raises:
         HTTPException: In case of error
+        RequestValidationError: If the body is not a valid `ChatRequest`
     """
     from core.gateway.chat_service import process_chat_request
 
-    return await process_chat_request(payload, request)
+    try:
+        payload = _CHAT_REQUEST_ADAPTER.validate_json(await request.body())
+    except ValidationError as exc:
+        raise RequestValidationError(exc.errors(include_url=False)) from exc
+
+    # Avoid a cold-model latency spike on requests arriving during warm-up
+    warmup_done = getattr(request.app.state, "warmup_done", None)
+    if warmup_done is not None and not warmup_done.is_set():
+        await warmup_done.wait()
+
+    chat_response = await process_chat_request(payload, request)
+    return Response(
+        content=_CHAT_RESPONSE_ADAPTER.dump_json(chat_response),
+        media_type="application/json",
+    )
 
 
 @realtime_router.get("/health")
@@ -116,6 +152,26 @@ async def health_check() -> dict[str, str]:
     return {"status": "healthy", "service": "semantic-firewall"}
 
 
+@realtime_router.get("/ready")
+async def readiness_check(request: Request) -> JSONResponse:
+    """
+    Readiness endpoint.
+
+    Returns 503 until the ML models warm-up has finished, so load balancers
+    keep the instance out of rotation while models are loading.
+
+    Returns:
+        Dictionary with status and service name
+    """
+    warmup_done = getattr(request.app.state, "warmup_done", None)
+    if warmup_done is None or not warmup_done.is_set():
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"status": "warming_up", "service": "semantic-firewall"},
+        )
+    return JSONResponse(content={"status": "ready", "service": "semantic-firewall"})
+
+
 @realtime_router.websocket("/ws/dashboard")
 async def websocket_dashboard(websocket: WebSocket) -> None:
     """
@@ -128,10 +184,8 @@ async def websocket_dashboard(websocket: WebSocket) -> None:
     Expects:
     - Pong responses to heartbeat pings
     """
+    # Heartbeats are sent by the manager's shared heartbeat task
     await manager.connect(websocket)
-
-    # Start heartbeat task
-    heartbeat_task = asyncio.create_task(manager.heartbeat_sender(websocket))
     
     try:
         while True:
@@ -140,16 +194,15 @@ async def websocket_dashboard(websocket: WebSocket) -> None:
             
             if data.get("type") == "pong":
                 # Client responded to heartbeat
+                manager.mark_alive(websocket)
                 logger.debug("Received pong from dashboard client")
             
     except WebSocketDisconnect:
         logger.info("Dashboard WebSocket disconnected")
         manager.disconnect(websocket)
-        heartbeat_task.cancel()
     except Exception as e:
         logger.error(f"WebSocket error: {e}")
         manager.disconnect(websocket)
-        heartbeat_task.cancel()
 
 
 @metrics_router.get("/api/stats")
@@ -218,9 +271,7 @@ async def get_models_cache_status() -> dict[str, Any]:
         - cache_enabled: Whether caching is enabled
     """
     try:
-        # Create a factory instance to access cache
-        factory = DetectorFactory()
-        cache_stats = factory.get_cache_stats()
+        cache_stats = get_factory().get_cache_stats()
         
         return cache_stats
     except Exception as e:
@@ -240,9 +291,7 @@ async def clear_models_cache() -> dict[str, Any]:
         Number of detectors removed from cache
     """
     try:
-        # Create a factory instance to access cache
-        factory = DetectorFactory()
-        count = factory.clear_cache()
+        count = clear_detector_cache()
         
         return {
             "message": "Cache cleared successfully",
@@ -256,6 +305,25 @@ async def clear_models_cache() -> dict[str, Any]:
         ) from e
 
 
+@metrics_router.post("/api/policies/reload")
+async def reload_policies() -> dict[str, Any]:
+    """
+    Reload the policies.
+
+    Gateways are rebuilt on the next request, loading the current policy
+    files, and every cached analysis decided with the old policies is dropped.
+    """
+    try:
+        clear_gateway_cache()
+        return {"message": "Policies will be reloaded on the next request"}
+    except Exception as e:
+        logger.error(f"Error reloading policies: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error reloading policies"
+        ) from e
+
+
 @metrics_router.get("/api/recent-requests")
 async def get_recent_requests(limit: int = 50) -> dict[str, Any]:
     """
@@ -532,6 +600,7 @@ async def get_benchmark_errors(run_id: str) -> dict[str, Any]:
 async def compare_benchmarks(
     baseline_run_id: str,
     candidate_run_ids: str,
+    max_samples_per_bucket: int = Query(100, ge=1, le=1000),
 ) -> dict[str, Any]:
     """
     Compare a baseline benchmark against one or more candidate benchmarks.
@@ -541,6 +610,9 @@ async def compare_benchmarks(
     - At least one candidate_run_id is required
     - All runs must exist and be completed
     - All runs must share the same dataset_name and dataset_split
+
+    Sample change lists are capped at `max_samples_per_bucket`; use
+    `/api/benchmarks/compare/samples` to page through the full lists.
     """
     try:
         if not baseline_run_id:
@@ -572,6 +644,7 @@ async def compare_benchmarks(
         comparison = await benchmark_service.compare_benchmarks(
             baseline_run_id=baseline_run_id,
             candidate_run_ids=candidate_ids,
+            max_samples_per_bucket=max_samples_per_bucket,
         )
         return comparison
     except HTTPException:
@@ -599,6 +672,41 @@ async def compare_benchmarks(
         ) from e
 
 
+@benchmarks_router.get("/api/benchmarks/compare/samples")
+async def get_comparison_samples(
+    baseline_run_id: str,
+    candidate_run_id: str,
+    bucket: str,
+    limit: int = Query(100, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
+) -> dict[str, Any]:
+    """Page through the samples of one change bucket of a comparison."""
+    try:
+        return await benchmark_service.get_sample_changes(
+            baseline_run_id=baseline_run_id,
+            candidate_run_id=candidate_run_id,
+            bucket=bucket,
+            limit=limit,
+            offset=offset,
+        )
+    except KeyError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e),
+        ) from e
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        ) from e
+    except Exception as e:
+        logger.error(f"Error getting comparison samples: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error getting comparison samples",
+        ) from e
+
+
 @benchmarks_router.post(
     "/api/benchmarks/datasets/upload",
     response_model=DatasetUploadResponse,
@@ -623,8 +731,9 @@ async def upload_custom_dataset(
                 detail=f"Unsupported file type: {content_type}. Use CSV or JSON.",
             )
 
-        file_bytes = await file.read()
-        if not file_bytes:
+        # The upload is spooled to disk by Starlette; work on the stream
+        # instead of reading the whole file into memory.
+        if file.size == 0:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Uploaded file is empty",
@@ -632,18 +741,17 @@ async def upload_custom_dataset(
 
         # Validar estructura y obtener total de samples usando DatasetLoader
         loader = DatasetLoader()
-        samples = loader.load_custom_dataset_from_content(
-            content=file_bytes,
-            file_type=content_type,
-            max_samples=None,
+        total_samples = await asyncio.to_thread(
+            loader.count_file_samples, file.file, content_type
         )
+        await file.seek(0)
 
         dataset_id, created = await benchmark_service.register_custom_dataset(
             name=name,
             description=description,
-            file_content=file_bytes,
+            file_obj=file.file,
             file_type=content_type,
-            total_samples=len(samples),
+            total_samples=total_samples,
         )
 
         return DatasetUploadResponse(
@@ -651,7 +759,7 @@ async def upload_custom_dataset(
             name=name,
             description=description,
             file_type=content_type,
-            total_samples=len(samples),
+            total_samples=total_samples,
             created_at=created,
         )
     except HTTPException:
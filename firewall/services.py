@@ -0,0 +1,232 @@
+"""Service providers for firewall components.
+
+Singletons are cached with `lru_cache(maxsize=1)` so resolving them on the
+request path costs a single dict lookup. Factories are plain functions that
+build a new instance on every call, wired to the cached singletons.
+"""
+
+import asyncio
+import logging
+from functools import lru_cache
+from typing import Any, Callable, Optional, Sequence
+
+from action_orchestrator.adapters.memory_idempotency_store import MemoryIdempotencyStore
+from action_orchestrator.adapters.print_logger import PrintLogger
+
+# Action Orchestrator
+from action_orchestrator.orchestrator_service import OrchestratorService
+from config import FirewallConfig
+from core.request_context import RequestContext
+from fast_ml_filter.adapters.custom_onnx_prompt_injection_detector import CustomONNXPromptInjectionDetector
+from fast_ml_filter.adapters.detoxify_toxicity_detector import DetoxifyToxicityDetector
+
+# Fast ML Filter
+from fast_ml_filter.adapters.presidio_pii_detector import PresidioPIIDetector
+from fast_ml_filter.adapters.regex_heuristic_detector import RegexHeuristicDetector
+from fast_ml_filter.ml_filter_service import MLFilterService
+from policy_engine.adapters.memory_tenant_context import MemoryTenantContext
+from policy_engine.adapters.opa_evaluator import OPAEvaluator
+
+# Policy Engine
+from policy_engine.adapters.rego_policy_loader import RegoPolicyLoader
+from policy_engine.policy_service import PolicyService
+from preprocessor.adapters.basic_feature_extractor import BasicFeatureExtractor
+from preprocessor.adapters.memory_feature_store import MemoryFeatureStore
+from preprocessor.adapters.qdrant_vector_store import QdrantVectorStore
+from preprocessor.adapters.sentence_transformer_vectorizer import SentenceTransformerVectorizer
+
+# Preprocessor
+from preprocessor.adapters.text_normalizer import TextNormalizer
+from preprocessor.preprocessor_service import PreprocessorService
+
+logger = logging.getLogger(__name__)
+
+
+# Configuration
+@lru_cache(maxsize=1)
+def get_config() -> FirewallConfig:
+    return FirewallConfig()
+
+
+# Preprocessor Adapters
+def get_normalizer() -> TextNormalizer:
+    return TextNormalizer()
+
+
+@lru_cache(maxsize=1)
+def get_vectorizer() -> SentenceTransformerVectorizer:
+    return SentenceTransformerVectorizer(model_name=get_config().vectorizer.model)
+
+
+def get_feature_extractor() -> BasicFeatureExtractor:
+    return BasicFeatureExtractor()
+
+
+@lru_cache(maxsize=1)
+def get_vector_store() -> QdrantVectorStore:
+    qdrant = get_config().qdrant
+    return QdrantVectorStore(
+        url=qdrant.url,
+        collection_name=qdrant.collection_name,
+        enabled=qdrant.enabled,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_feature_store() -> MemoryFeatureStore:
+    return MemoryFeatureStore()
+
+
+# Preprocessor Service
+def get_preprocessor_service() -> PreprocessorService:
+    return PreprocessorService(
+        normalizer=get_normalizer(),
+        vectorizer=get_vectorizer(),
+        feature_extractor=get_feature_extractor(),
+        vector_store=get_vector_store(),
+        feature_store=get_feature_store(),
+    )
+
+
+# Fast ML Filter Adapters
+@lru_cache(maxsize=1)
+def get_pii_detector() -> PresidioPIIDetector:
+    return PresidioPIIDetector()
+
+
+@lru_cache(maxsize=1)
+def get_toxicity_detector() -> DetoxifyToxicityDetector:
+    return DetoxifyToxicityDetector(model_name=get_config().ml.detoxify_model_name)
+
+
+@lru_cache(maxsize=1)
+def get_prompt_injection_detector() -> CustomONNXPromptInjectionDetector:
+    ml = get_config().ml
+    return CustomONNXPromptInjectionDetector(
+        model_path=ml.prompt_injection_model,
+        ollama_base_url=ml.ollama_base_url,
+        ollama_model=ml.ollama_model,
+        threshold=ml.prompt_injection_threshold,
+        use_local_embeddings=ml.use_local_embeddings,
+        local_embedding_model=ml.local_embedding_model,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_heuristic_detector() -> RegexHeuristicDetector:
+    return RegexHeuristicDetector(rules_path=get_config().heuristic.rules_path)
+
+
+# Fast ML Filter Service
+def get_ml_filter_service() -> MLFilterService:
+    return MLFilterService(
+        pii_detector=get_pii_detector(),
+        toxicity_detector=get_toxicity_detector(),
+        prompt_injection_detector=get_prompt_injection_detector(),
+        heuristic_detector=get_heuristic_detector(),
+    )
+
+
+# Policy Engine Adapters
+@lru_cache(maxsize=1)
+def get_policy_loader() -> RegoPolicyLoader:
+    return RegoPolicyLoader(policies_path=get_config().policy.policies_path)
+
+
+@lru_cache(maxsize=1)
+def get_tenant_context_provider() -> MemoryTenantContext:
+    return MemoryTenantContext()
+
+
+@lru_cache(maxsize=1)
+def get_policy_evaluator() -> OPAEvaluator:
+    policy = get_config().policy
+    return OPAEvaluator(
+        opa_url=policy.opa_url,
+        opa_policy_name=policy.opa_policy_name,
+        policy_cache_ttl=policy.opa_policy_cache_ttl,
+    )
+
+
+# Policy Engine Service
+def get_policy_service() -> PolicyService:
+    return PolicyService(
+        evaluator=get_policy_evaluator(),
+        loader=get_policy_loader(),
+        tenant_context_provider=get_tenant_context_provider(),
+    )
+
+
+# Action Orchestrator Adapters
+@lru_cache(maxsize=1)
+def get_logger() -> PrintLogger:
+    return PrintLogger()
+
+
+@lru_cache(maxsize=1)
+def get_idempotency_store() -> MemoryIdempotencyStore:
+    return MemoryIdempotencyStore()
+
+
+# Action Orchestrator Service
+def get_orchestrator_service() -> OrchestratorService:
+    return OrchestratorService(
+        logger=get_logger(),
+        alerter=None,  # Can be added later if needed
+        idempotency_store=get_idempotency_store(),
+    )
+
+
+def detect_each(detect: Callable, texts: Sequence[str], **kwargs: Any) -> None:
+    """Run `detect` over every warm-up text."""
+    for text in texts:
+        detect(text, **kwargs)
+
+
+async def warmup(
+    texts: Sequence[str] = ("warmup",),
+    context: Optional[RequestContext] = None,
+) -> None:
+    """
+    Build every singleton and run each detector over the warm-up texts.
+
+    Moves model loading (and ONNX Runtime kernel initialization) from the
+    first request to application startup. Detectors are independent, so
+    they are loaded and run concurrently in worker threads; a failing
+    detector is logged and does not stop the others.
+
+    Args:
+        texts: Warm-up texts; inputs of different lengths and content warm
+            the tokenizer and model paths that a single short text leaves cold
+        context: Optional request context; when given, the prompt injection
+            detector also runs with it to warm its context-formatting path
+    """
+    get_config()
+    get_vector_store()
+    get_feature_store()
+    get_tenant_context_provider()
+    get_logger()
+    get_idempotency_store()
+
+    def warm_prompt_injection() -> None:
+        detector = get_prompt_injection_detector()
+        detect_each(detector.detect, texts, context=None)
+        if context is not None:
+            detect_each(detector.detect, texts, context=context)
+
+    warmups = {
+        "Vectorizer": get_vectorizer,
+        "Policy": lambda: get_policy_loader().load(),
+        "PII detector": lambda: detect_each(get_pii_detector().detect, texts),
+        "Toxicity detector": lambda: detect_each(get_toxicity_detector().detect, texts),
+        "Prompt Injection detector": warm_prompt_injection,
+        "Heuristic detector": lambda: detect_each(get_heuristic_detector().detect, texts),
+    }
+    logger.info("  → Warming up %s...", ", ".join(warmups))
+    results = await asyncio.gather(
+        *(asyncio.to_thread(warm) for warm in warmups.values()),
+        return_exceptions=True,
+    )
+    for name, result in zip(warmups, results, strict=True):
+        if isinstance(result, Exception):
+            logger.warning("    %s warm-up failed: %s", name, result)
@@ -308,11 +308,13 @@ export default function BenchmarkComparison({ baselineRunId, candidateRunIds, da
         const regressions = changes.regressions || {}
         const improvements = changes.improvements || {}
         const summary = changes.summary || {}
+        const counts = changes.counts || {}
 
-        const criticalCount = (regressions.critical || []).length
-        const newFpCount = (regressions.new_false_positives || []).length
-        const newDetectionsCount = (improvements.new_detections || []).length
-        const fixedFpCount = (improvements.fixed_false_positives || []).length
+        // Lists may be truncated by the API; prefer the exact counts
+        const criticalCount = counts.critical ?? (regressions.critical || []).length
+        const newFpCount = counts.new_false_positives ?? (regressions.new_false_positives || []).length
+        const newDetectionsCount = counts.new_detections ?? (improvements.new_detections || []).length
+        const fixedFpCount = counts.fixed_false_positives ?? (improvements.fixed_false_positives || []).length
         const totalRegressions = criticalCount + newFpCount
         const totalImprovements = newDetectionsCount + fixedFpCount
 